@@ -3,8 +3,16 @@ The Lifelong Quiz - YouTube Live Broadcaster
 Pipes pygame frames + system audio to FFmpeg -> RTMPS -> YouTube Live.
 
 The game loop captures frames into a queue (non-blocking).
-A writer thread drains the queue at exactly the target FPS,
-feeding FFmpeg at real-time speed so anullsrc audio stays in sync.
+A writer thread paces FFmpeg at exactly the target FPS, so anullsrc audio
+stays in sync and the rawvideo input never starves: on every tick it writes
+the next captured frame, repeats the last one if the game is late (a hitch,
+a loading spike), and drops the oldest waiting frames if the game is ahead.
+
+Frames are captured into a small ring of preallocated buffers, copied
+straight from the display surface's pixels in their native layout (BGRX on
+the usual 32-bit display), and FFmpeg is told that layout (-pix_fmt bgr0),
+so the game thread does one memcpy per frame and never repacks pixels. The
+writer hands each buffer to the pipe as a memoryview.
 """
 
 import subprocess
@@ -13,9 +21,20 @@ import queue
 import time
 import os
 import sys
+from collections import deque
 
+import numpy as np
 import pygame
 
+from quiz.config import STREAM_FRAME_BUFFERS, STREAM_PACING_DEPTH
+
+# 32-bit surface (R, G, B) shifts -> FFmpeg pixel format of the bytes in memory
+# (little-endian); the fourth byte is alpha if the surface has it, else padding
+_NATIVE_FORMATS = {
+    (16, 8, 0): ("bgra", "bgr0"),
+    (0, 8, 16): ("rgba", "rgb0"),
+}
+
 
 def _find_ffmpeg(configured_path: str) -> str:
     """Locate the FFmpeg binary. Checks configured path, scripts/, and system PATH."""
@@ -68,6 +87,64 @@ def _find_audio_device(ffmpeg_path: str) -> str | None:
     return None
 
 
+class FrameRing:
+    """
+    Preallocated frame buffers, cycled between the game thread (capture) and
+    the writer thread (write, then release). Capturing never allocates.
+    """
+
+    def __init__(self, width: int, height: int, surface: pygame.Surface | None = None,
+                 count: int = STREAM_FRAME_BUFFERS):
+        self.width = width
+        self.height = height
+        self.pix_fmt = "rgb24"  # fallback: pygame.image.tobytes(surface, "RGB")
+        if surface is not None and surface.get_size() == (width, height) \
+                and surface.get_bytesize() == 4 and sys.byteorder == "little":
+            formats = _NATIVE_FORMATS.get(tuple(surface.get_shifts()[:3]))
+            if formats is not None:
+                self.pix_fmt = formats[0] if surface.get_masks()[3] else formats[1]
+        row_bytes = width * (3 if self.pix_fmt == "rgb24" else 4)
+        self._buffers = [np.empty((height, row_bytes), dtype=np.uint8) for _ in range(count)]
+        self._free: queue.SimpleQueue = queue.SimpleQueue()
+        for slot in range(count):
+            self._free.put(slot)
+
+    @property
+    def frame_bytes(self) -> int:
+        return self._buffers[0].nbytes
+
+    def acquire(self) -> int | None:
+        """Take a free buffer; returns its slot, or None if all are in use."""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return None
+
+    def fill(self, slot: int, surface: pygame.Surface):
+        """Copy the surface into the buffer at slot."""
+        dst = self._buffers[slot]
+        if self.pix_fmt == "rgb24":
+            dst.reshape(-1)[:] = np.frombuffer(pygame.image.tobytes(surface, "RGB"), dtype=np.uint8)
+            return
+        # get_view locks the surface until the view (and the array over it) goes away
+        pixels = np.frombuffer(surface.get_view("0"), dtype=np.uint8)
+        rows = pixels.reshape(self.height, surface.get_pitch())
+        np.copyto(dst, rows[:, :dst.shape[1]])  # drops any row padding
+
+    def capture(self, surface: pygame.Surface) -> int | None:
+        """Copy the surface into a free buffer; returns its slot, or None if all are in use."""
+        slot = self.acquire()
+        if slot is not None:
+            self.fill(slot, surface)
+        return slot
+
+    def view(self, slot: int) -> memoryview:
+        return memoryview(self._buffers[slot].reshape(-1))
+
+    def release(self, slot: int):
+        self._free.put(slot)
+
+
 class YouTubeBroadcaster:
     """Streams the pygame display to YouTube Live via FFmpeg."""
 
@@ -84,7 +161,13 @@ class YouTubeBroadcaster:
         self._error_logged = False
         self._game_fps = 60
         self._skip_ratio = max(1, self._game_fps // self._fps)
-        self._frame_queue = queue.Queue(maxsize=8)
+        self._frames: FrameRing | None = None
+        # Captured FrameRing slots waiting for the writer, oldest first
+        self._pending: deque[int] = deque()
+        self._pending_lock = threading.Lock()
+        self._frames_sent = 0        # frames written to FFmpeg (exactly fps per second)
+        self._frames_duplicated = 0  # ticks that repeated the last frame (game was late)
+        self._frames_dropped = 0     # captured frames never written (game was ahead)
         self._stderr_lines = []  # collect stderr for diagnostics
         self._force_cpu = False  # set True after GPU encoding fails
 
@@ -118,15 +201,21 @@ class YouTubeBroadcaster:
 
         bufsize_val = int(self._bitrate.replace("k", "")) * 2
 
+        # Capture in the display's own pixel layout (kept across GPU->CPU restarts)
+        if self._frames is None:
+            self._frames = FrameRing(self._width, self._height, pygame.display.get_surface())
+            print(f"[Broadcast] Capturing frames as {self._frames.pix_fmt} "
+                  f"({STREAM_FRAME_BUFFERS} x {self._frames.frame_bytes / 1e6:.1f} MB buffers)")
+
         cmd = [
             self._ffmpeg_path,
             "-hide_banner",
             "-loglevel", "error",
             "-y",
 
-            # Video input: raw RGB from stdin
+            # Video input: raw frames from stdin, in the display's pixel layout
             "-f", "rawvideo",
-            "-pix_fmt", "rgb24",
+            "-pix_fmt", self._frames.pix_fmt,
             "-s", f"{self._width}x{self._height}",
             "-r", str(self._fps),
             "-thread_queue_size", "1024",
@@ -174,7 +263,7 @@ class YouTubeBroadcaster:
                 stdin=subprocess.PIPE,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
-                bufsize=self._width * self._height * 3 * 4,  # ~24MB buffer (4 raw frames)
+                bufsize=0,  # unbuffered: frames go from the ring to the pipe without another copy
                 startupinfo=startupinfo,
             )
             self._active = True
@@ -196,80 +285,107 @@ class YouTubeBroadcaster:
             return False
 
     def send_frame(self, surface: pygame.Surface, frame_count: int):
-        """Capture a frame into the queue (non-blocking). Drops frames if behind."""
+        """Capture a frame into the queue (non-blocking). Drops the oldest waiting frame if behind."""
         if not self._active or self._proc is None:
             return
 
         if frame_count % self._skip_ratio != 0:
             return
 
-        try:
-            raw = pygame.image.tobytes(surface, "RGB")
-            self._frame_queue.put_nowait(raw)
-        except queue.Full:
-            pass  # Drop frame - writer thread is behind
+        slot = self._frames.acquire()
+        if slot is None:
+            # Every buffer is waiting or being written: the newest frame wins
+            with self._pending_lock:
+                if not self._pending:
+                    return
+                slot = self._pending.popleft()
+                self._frames_dropped += 1
+        self._frames.fill(slot, surface)
+        with self._pending_lock:
+            self._pending.append(slot)
 
     def _writer_loop(self):
-        """Drain frame queue and write to FFmpeg stdin at a steady real-time rate."""
+        """Write one frame to FFmpeg stdin per tick, at exactly the target FPS."""
         frame_interval = 1.0 / self._fps
-        next_write = time.perf_counter()
+        next_tick = time.perf_counter()
+        last = None  # slot written on the previous tick, kept for repeats
 
-        while self._active:
-            proc = self._proc
-            if proc is None:
-                break
-
-            # Check if FFmpeg is still alive
-            if proc.poll() is not None:
-                code = proc.returncode
-                if not self._error_logged:
-                    print(f"[Broadcast] FFmpeg exited (code {code})")
-                    for line in self._stderr_lines:
-                        print(f"[Broadcast]   {line}")
-                    self._error_logged = True
-                self._active = False
-                # Auto-retry with CPU encoding if GPU failed
-                if not self._force_cpu and code != 0:
-                    print("[Broadcast] GPU encoding failed, retrying with CPU (libx264)...")
-                    self._force_cpu = True
-                    self._proc = None
-                    self.start()
-                    return
-                break
-
-            # Get next frame from queue
-            try:
-                raw = self._frame_queue.get(timeout=1.0)
-            except queue.Empty:
-                continue
-
-            # Rate limit: sleep until it's time for the next frame
-            now = time.perf_counter()
-            sleep_time = next_write - now
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            next_write = time.perf_counter() + frame_interval
-
-            # Write to FFmpeg pipe
-            try:
-                if self._active and self._proc and self._proc.stdin and not self._proc.stdin.closed:
-                    self._proc.stdin.write(raw)
-            except (BrokenPipeError, OSError, ValueError):
-                if not self._error_logged:
-                    print("[Broadcast] Stream pipe broken, stopping")
-                    self._error_logged = True
-                self._active = False
-                break
+        try:
+            while self._active:
+                proc = self._proc
+                if proc is None:
+                    break
+
+                # Check if FFmpeg is still alive
+                if proc.poll() is not None:
+                    code = proc.returncode
+                    if not self._error_logged:
+                        print(f"[Broadcast] FFmpeg exited (code {code})")
+                        for line in self._stderr_lines:
+                            print(f"[Broadcast]   {line}")
+                        self._error_logged = True
+                    self._active = False
+                    # Auto-retry with CPU encoding if GPU failed
+                    if not self._force_cpu and code != 0:
+                        print("[Broadcast] GPU encoding failed, retrying with CPU (libx264)...")
+                        self._force_cpu = True
+                        self._proc = None
+                        self.start()
+                        return
+                    break
+
+                # Sleep until the tick (absolute schedule, so rounding never drifts the rate)
+                sleep_time = next_tick - time.perf_counter()
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                next_tick += frame_interval
+                if time.perf_counter() - next_tick > 1.0:
+                    next_tick = time.perf_counter()  # pipe stalled for a second; don't burst to catch up
+
+                # Next frame: keep at most STREAM_PACING_DEPTH waiting, dropping the oldest
+                with self._pending_lock:
+                    while len(self._pending) > STREAM_PACING_DEPTH:
+                        self._frames.release(self._pending.popleft())
+                        self._frames_dropped += 1
+                    slot = self._pending.popleft() if self._pending else None
+                if slot is not None:
+                    if last is not None:
+                        self._frames.release(last)
+                    last = slot
+                elif last is not None:
+                    self._frames_duplicated += 1  # game is late: repeat the last frame
+                else:
+                    continue  # nothing captured yet
+
+                # Write to FFmpeg pipe
+                try:
+                    if self._active and self._proc and self._proc.stdin and not self._proc.stdin.closed:
+                        self._write_frame(self._proc.stdin, self._frames.view(last))
+                        self._frames_sent += 1
+                except (BrokenPipeError, OSError, ValueError):
+                    if not self._error_logged:
+                        print("[Broadcast] Stream pipe broken, stopping")
+                        self._error_logged = True
+                    self._active = False
+                    break
+        finally:
+            if last is not None:
+                self._frames.release(last)
+
+    @staticmethod
+    def _write_frame(pipe, frame: memoryview):
+        """Write a whole frame to the unbuffered pipe (a raw write may take only part of it)."""
+        while frame:
+            written = pipe.write(frame)
+            frame = frame[written:]
 
     def stop(self):
         """Gracefully stop streaming."""
         self._active = False
-        # Drain the queue so writer thread can exit
-        while not self._frame_queue.empty():
-            try:
-                self._frame_queue.get_nowait()
-            except queue.Empty:
-                break
+        # Hand the waiting buffers back (the writer releases the one it holds on exit)
+        with self._pending_lock:
+            while self._pending:
+                self._frames.release(self._pending.popleft())
         # Give writer thread a moment to notice _active=False
         time.sleep(0.1)
         if self._proc:
@@ -309,3 +425,25 @@ class YouTubeBroadcaster:
     @property
     def is_active(self) -> bool:
         return self._active
+
+    @property
+    def frames_sent(self) -> int:
+        return self._frames_sent
+
+    @property
+    def frames_duplicated(self) -> int:
+        return self._frames_duplicated
+
+    @property
+    def frames_dropped(self) -> int:
+        return self._frames_dropped
+
+    def stats(self) -> dict:
+        """Pacing counters since construction (they survive restarts)."""
+        return {
+            "active": self._active,
+            "fps": self._fps,
+            "sent": self._frames_sent,
+            "duplicated": self._frames_duplicated,
+            "dropped": self._frames_dropped,
+        }
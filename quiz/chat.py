@@ -1,208 +1,375 @@
 """
 The Lifelong Quiz - Chat Manager
-YouTube live chat reading via pytchat with fake chat fallback.
-Supports dynamic reconnection when a new stream is detected.
+Chat ingestion from a pluggable source (YouTube, fake bots, TCP, replay;
+see quiz/chat_sources.py). Supports dynamic reconnection when a new stream
+is detected.
+
+Chat is read by a ChatIngestor running in its own process (CHAT_INGEST_PROCESS),
+so pytchat's HTTP polling, JSON parsing and normalization never compete with
+rendering for the GIL. The ingestor writes normalized messages into a shared-
+memory ChatRing that the game drains once per frame, and owns all connect,
+reconnect and backoff logic; the game only sends it "connect"/"stop" commands.
+
+Before the ring, messages pass a short per-user window (CHAT_COLLAPSE_WINDOW):
+a viewer spamming "1" fifty times reaches the game as one "1", and a viewer
+going 1, 2, 3 as their latest answer. Their commands and other chatter collapse
+the same way, separately. Chatter (anything QuizLogic ignores) is shed first
+when the ring fills up, so a raid can't crowd out answers, and the game sees
+at most CHAT_RING_CAPACITY messages however loud chat gets.
 """
 
-import threading
+import logging
+import multiprocessing
 import queue
+import threading
 import time
-import random
 import re
 
-from quiz.models import ChatMessage
+from quiz.config import (
+    CHAT_INGEST_PROCESS, CHAT_RING_CAPACITY, CHAT_RECORD,
+    CHAT_COLLAPSE_WINDOW, CHAT_COLLAPSE_MAX_PENDING, CHAT_CHATTER_HIGH_WATER,
+)
+from quiz.chat_recorder import ChatRecorder
+from quiz.chat_ring import ChatRing
+from quiz.chat_sources import ChatSource, FakeSource, YouTubeSource
+from quiz.models import ChatMessage, CHAT_COMMANDS, parse_answer
+from quiz import log as quiz_log
 
+log = logging.getLogger("quiz.chat")
+msg_log = logging.getLogger("quiz.chat.messages")
 
-# Fake bot usernames (used for offline testing only)
-FAKE_USERNAMES = [
-    "QuizMaster", "BrainiacBob", "TriviaQueen", "Lucky7",
-    "NerdAlert", "BookWorm42", "HistoryBuff", "ScienceGuy",
-    "MovieFan", "GeoGuesser", "SportsFan99", "MusicLover",
-    "GamerzUnite", "PixelPirate", "CosmicCat", "ThinkTank",
-]
 
 # Strip these from chat messages before checking for answers
 _PUNCTUATION_RE = re.compile(r'[^\w\s]')
 
+# "spawn" everywhere: forking a process that already runs pygame, SQLite and
+# writer threads is unsafe, and it matches what Windows does anyway
+_MP = multiprocessing.get_context("spawn")
 
-class ChatManager:
-    def __init__(self, video_id: str, message_queue: queue.Queue,
-                 offline: bool = False):
+# What a message means to QuizLogic; each viewer keeps one of each per collapse window
+_ANSWER = "answer"
+_COMMAND = "command"
+_CHATTER = "chatter"
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip punctuation, for matching answers and commands."""
+    return _PUNCTUATION_RE.sub('', text).strip().lower()
+
+
+class ChatIngestor:
+    """
+    Runs a ChatSource and writes its normalized messages into a ChatRing.
+    Lives in the ingest process (or a thread, with CHAT_INGEST_PROCESS off).
+    """
+
+    def __init__(self, ring: ChatRing, control, video_id: str,
+                 recorder: ChatRecorder | None = None):
+        self._ring = ring
+        self._recorder = recorder
+        self._control = control
         self._video_id = video_id
-        self._queue = message_queue
-        self._offline = offline
-        self._running = False
+        self._running = True
         self._connected = False
-        self._thread = None
-        self._use_fake = offline or not video_id
-        self._reconnect_event = threading.Event()
-
-        # Diagnostics
-        self._message_count = 0
+        self._source: ChatSource | None = None
+        self._switch_event = threading.Event()
         self._status_text = "Initializing..."
-        self._last_status_log = 0.0
+        # Collapse window: (username, kind) -> latest (normalized, timestamp, source_ts)
+        self._pending: dict[tuple[str, str], tuple[str, float, float]] = {}
+        self._window_start = 0.0
+        self._collapsed = 0
+
+    # ------------------------------------------
+    # SOURCE API
+    # ------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def video_id(self) -> str:
+        return self._video_id
+
+    @property
+    def message_count(self) -> int:
+        return self._ring.received + len(self._pending) + self._collapsed
+
+    @property
+    def status_text(self) -> str:
+        return self._status_text
+
+    @property
+    def switch_requested(self) -> bool:
+        """True once the game asked to switch streams (or stop) since clear_switch()."""
+        return self._switch_event.is_set()
+
+    def clear_switch(self):
+        self._switch_event.clear()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Flush, then sleep up to timeout seconds; returns True early if a
+        switch/stop arrives. Sources going idle call this, so nothing sits in
+        the collapse window while chat is quiet.
+        """
+        self.flush()
+        return self._switch_event.wait(timeout)
+
+    def set_status(self, text: str | None = None, connected: bool | None = None):
+        if connected is not None:
+            self._connected = connected
+        if text is not None:
+            self._status_text = text
+        self._ring.set_status(self._status_text, self._connected)
+
+    def record_switch(self, gap: float):
+        """A stream switchover finished; gap is how long chat went without a live session."""
+        self.flush()
+        self._ring.record_switch(gap)
+
+    def count_duplicates(self, count: int):
+        self._ring.add_duplicates(count)
+
+    def emit(self, username: str, text: str, timestamp: float | None = None,
+             source_ts: float = 0.0):
+        """
+        Normalize one raw chat line and queue it for the game. source_ts is the
+        platform's send time, if the source knows it. Messages wait in the
+        per-user window until flush_due() or wait() sends them on.
+        """
+        text = text.strip()
+        if not text:
+            return
+        normalized = normalize(text)
+        ts = time.time() if timestamp is None else timestamp
+        if self._recorder is not None:
+            self._recorder.record(username, text, normalized, ts)
+        # Sampled (LOG_SAMPLING); %-args so formatting happens on the log thread
+        msg_log.info("[Chat] %s: %s -> normalized: '%s'", username, text, normalized)
+
+        if parse_answer(normalized) is not None:
+            kind = _ANSWER
+        elif normalized in CHAT_COMMANDS:
+            kind = _COMMAND
+        else:
+            kind = _CHATTER
+        key = (username, kind)
+        pending = self._pending
+        if key in pending:
+            # Re-insert so the dict stays ordered by each entry's latest message
+            del pending[key]
+            self._collapsed += 1
+        elif not pending:
+            self._window_start = time.monotonic()
+        pending[key] = (normalized, ts, source_ts)
+        self.flush_due()
+
+    def flush_due(self):
+        """Flush if the collapse window has passed (or too many viewers are pending)."""
+        if self._pending and (time.monotonic() - self._window_start >= CHAT_COLLAPSE_WINDOW
+                              or len(self._pending) >= CHAT_COLLAPSE_MAX_PENDING):
+            self.flush()
+
+    def flush(self):
+        """
+        Push the window's messages into the ring. Chatter is shed once the ring
+        is past CHAT_CHATTER_HIGH_WATER; answers and commands are dropped only
+        when it is full, unless the source asks for backpressure (TCP, replay):
+        then we wait for the game to drain.
+        """
+        pending = self._pending
+        if pending:
+            self._pending = {}
+            ring = self._ring
+            high_water = int(ring.capacity * CHAT_CHATTER_HIGH_WATER)
+            backpressure = self._source is not None and self._source.backpressure
+            shed = 0
+            for (username, kind), (normalized, ts, source_ts) in pending.items():
+                if kind is _CHATTER and ring.pending() >= high_water:
+                    shed += 1
+                elif backpressure:
+                    while not ring.push(username, normalized, ts, source_ts, count_drop=False):
+                        if not self._running:
+                            break
+                        time.sleep(0.002)
+                else:
+                    ring.push(username, normalized, ts, source_ts)
+            ring.add_counts(self._collapsed, shed)
+        elif self._collapsed:
+            self._ring.add_counts(self._collapsed, 0)
+        self._collapsed = 0
+
+    # ------------------------------------------
+    # LIFECYCLE
+    # ------------------------------------------
+    def run(self, source: ChatSource):
+        self._source = source
+        threading.Thread(target=self._control_loop, daemon=True).start()
+        source.run(self)
+        self.flush()
+        self.set_status("Stopped", connected=False)
+
+    def _control_loop(self):
+        """Apply commands from the game; stop if the game process goes away."""
+        parent = multiprocessing.parent_process()
+        while self._running:
+            try:
+                command, arg = self._control.get(timeout=1.0)
+            except queue.Empty:
+                if parent is not None and not parent.is_alive():
+                    command, arg = "stop", None
+                else:
+                    continue
+            if command == "connect":
+                if not self._source.follows_streams:
+                    log.info(f"[Chat] Ignoring stream {arg} ({self._source.describe()} is active)")
+                    continue
+                log.info(f"[Chat] Switching to video {arg}")
+                self._video_id = arg
+            elif command == "stop":
+                self._running = False
+            self._switch_event.set()  # Wake up whichever loop is waiting
+
+
+def _ingest_main(ring_name: str, capacity: int, control, log_queue, log_level: int,
+                 video_id: str, source: ChatSource, record: bool):
+    """Entry point of the ingest process (or thread)."""
+    if multiprocessing.parent_process() is not None:
+        quiz_log.setup_child_logging(log_queue, log_level)
+    ring = ChatRing.attach(ring_name, capacity)
+    recorder = None
+    if record:
+        recorder = ChatRecorder()
+        recorder.start()
+        log.info(f"[Chat] Recording chat to {recorder.directory} ({recorder.compression})")
+    try:
+        ChatIngestor(ring, control, video_id, recorder).run(source)
+    except Exception as e:
+        log.error(f"[Chat] Ingestor crashed: {e}")
+    finally:
+        if recorder is not None:
+            recorder.stop()
+        ring.close()
+
+
+class ChatManager:
+    """Game-side handle on the chat ingestor: start/stop it, switch streams, drain messages."""
+
+    def __init__(self, video_id: str, offline: bool = False,
+                 use_process: bool = CHAT_INGEST_PROCESS, source: ChatSource | None = None,
+                 record: bool = CHAT_RECORD):
+        self._video_id = video_id
+        self._record = record
+        self._offline = offline
+        self._use_process = use_process
+        if source is None:
+            source = FakeSource() if offline else YouTubeSource()
+        self._source = source
+        self._ring: ChatRing | None = None
+        self._control = None
+        self._worker = None
 
     def start(self):
-        self._running = True
-        if self._use_fake:
-            if self._offline:
-                self._status_text = "Offline mode (fake bots)"
-                print("[Chat] Offline mode - starting fake chat bots")
-                self._thread = threading.Thread(
-                    target=self._fake_chat_thread, daemon=True
-                )
-            else:
-                self._status_text = "Waiting for stream..."
-                print("[Chat] No video ID yet, waiting for live stream connection...")
-                self._thread = threading.Thread(
-                    target=self._waiting_thread, daemon=True
-                )
+        self._ring = ChatRing.create(CHAT_RING_CAPACITY)
+        log.info(f"[Chat] Chat source: {self._source.describe()}")
+        args_tail = (logging.getLogger("quiz").getEffectiveLevel(), self._video_id,
+                     self._source, self._record)
+        if self._use_process:
+            self._control = _MP.Queue()
+            self._worker = _MP.Process(
+                target=_ingest_main, name="chat-ingest", daemon=True,
+                args=(self._ring.name, CHAT_RING_CAPACITY, self._control,
+                      quiz_log.process_log_queue()) + args_tail,
+            )
         else:
-            self._status_text = f"Connecting to {self._video_id}..."
-            self._thread = threading.Thread(
-                target=self._real_chat_thread, daemon=True
+            self._control = queue.Queue()
+            self._worker = threading.Thread(
+                target=_ingest_main, name="chat-ingest", daemon=True,
+                args=(self._ring.name, CHAT_RING_CAPACITY, self._control, None) + args_tail,
             )
-        self._thread.start()
+        self._worker.start()
 
     def connect_to(self, video_id: str):
-        """Switch to a new video ID (called by StreamWatcher when a stream is found)."""
-        if not video_id:
+        """
+        Switch to a new video ID (called by StreamWatcher when a stream is found).
+        The ingestor opens the new chat before closing the old one; see
+        YouTubeSource for the overlap and switch_count/last_switch_gap for how it went.
+        """
+        if not video_id or self._control is None:
             return
-        print(f"[Chat] Switching to video {video_id}")
         self._video_id = video_id
-        self._use_fake = False
-        self._status_text = f"Connecting to {video_id}..."
-        self._reconnect_event.set()
-
-    def _waiting_thread(self):
-        """Silently wait for a real stream connection (no fake bots)."""
-        while self._running:
-            if self._reconnect_event.wait(timeout=2.0):
-                self._reconnect_event.clear()
-                if self._video_id:
-                    print("[Chat] Stream found! Connecting to live chat...")
-                    self._status_text = f"Connecting to {self._video_id}..."
-                    self._real_chat_thread()
-                    return
-
-    def _real_chat_thread(self):
-        try:
-            import pytchat
-        except ImportError:
-            self._status_text = "ERROR: pytchat not installed"
-            print("[Chat] pytchat not installed!")
-            print("[Chat] Install it: pip install pytchat")
-            if self._offline:
-                self._use_fake = True
-                self._fake_chat_thread()
-            return
-
-        consecutive_failures = 0
-        while self._running:
-            self._reconnect_event.clear()
-            try:
-                vid = self._video_id
-                print(f"[Chat] Connecting to video {vid}...")
-                self._status_text = f"Connecting to {vid}..."
-                chat = pytchat.create(video_id=vid, interruptable=False)
-                self._connected = True
-                self._status_text = f"LIVE - reading chat ({vid})"
-                consecutive_failures = 0
-                print(f"[Chat] Connected to YouTube live chat! (video: {vid})")
-
-                while chat.is_alive() and self._running:
-                    if self._reconnect_event.is_set():
-                        print("[Chat] Reconnect requested, switching stream...")
-                        break
-
-                    items = chat.get().sync_items()
-                    for c in items:
-                        text = c.message.strip()
-                        if not text:
-                            continue
-                        # Normalize the message: lowercase, strip punctuation for matching
-                        normalized = _PUNCTUATION_RE.sub('', text).strip().lower()
-                        msg = ChatMessage(
-                            username=c.author.name,
-                            message=normalized,
-                            timestamp=time.time(),
-                        )
-                        self._queue.put(msg)
-                        self._message_count += 1
-                        print(f"[Chat] {msg.username}: {text} -> normalized: '{normalized}'")
-
-                    # Periodic status log (every 30s)
-                    now = time.time()
-                    if now - self._last_status_log > 30:
-                        self._last_status_log = now
-                        self._status_text = f"LIVE ({self._message_count} msgs)"
-                        print(f"[Chat] Status: connected, {self._message_count} messages received total")
-
-                    time.sleep(0.1)
-
-                self._connected = False
-                if self._reconnect_event.is_set():
-                    continue  # Skip backoff, reconnect immediately
-                # Stream not broadcasting yet or ended — short retry
-                self._status_text = f"Waiting for stream {vid} to go live..."
-                print(f"[Chat] Stream {vid} not active yet, retrying in 10s...")
-                self._reconnect_event.wait(timeout=10)
-
-            except Exception as e:
-                self._connected = False
-                if self._reconnect_event.is_set():
-                    continue  # New stream available, reconnect immediately
-                consecutive_failures += 1
-                wait_time = min(60, 10 * consecutive_failures)
-                self._status_text = f"Error #{consecutive_failures}, retry in {wait_time}s"
-                print(
-                    f"[Chat] Error (attempt {consecutive_failures}): {e}. "
-                    f"Retrying in {wait_time}s"
-                )
-                # Wait but wake up early if reconnect is requested
-                self._reconnect_event.wait(timeout=wait_time)
-
-    def _fake_chat_thread(self):
-        self._connected = True
-        self._status_text = "Offline (fake bots)"
-        print("[Chat] Fake chat running (offline testing mode)")
+        self._control.put(("connect", video_id))
 
-        while self._running:
-            # If reconnect requested, switch to real chat
-            if self._reconnect_event.is_set():
-                self._connected = False
-                print("[Chat] Stream found! Switching from fake chat to live...")
-                self._real_chat_thread()
-                return
-
-            time.sleep(random.uniform(0.3, 1.5))
-            user = random.choice(FAKE_USERNAMES)
-            roll = random.random()
-            if roll < 0.03:
-                msg_text = "reset"
-            else:
-                msg_text = str(random.randint(1, 4))
-
-            self._queue.put(ChatMessage(user, msg_text, time.time()))
-            self._message_count += 1
+    def drain(self, max_items: int) -> list[ChatMessage]:
+        """Messages received since the last call (at most max_items, oldest first)."""
+        if self._ring is None:
+            return []
+        return self._ring.drain(max_items)
 
     def stop(self):
-        self._running = False
-        self._reconnect_event.set()  # Wake up any waiting threads
-        print(f"[Chat] Stopped ({self._message_count} messages total)")
+        if self._worker is None:
+            return
+        self._control.put(("stop", None))
+        self._worker.join(timeout=5)
+        if self._use_process and self._worker.is_alive():
+            log.warning("[Chat] Ingest process did not stop, terminating it")
+            self._worker.terminate()
+            self._worker.join(timeout=1)
+        self._worker = None
+        ring = self._ring
+        log.info(f"[Chat] Stopped ({ring.received} messages total, {ring.message_count} delivered, "
+                 f"{ring.collapsed} collapsed, {ring.shed} chatter shed"
+                 f"{f', {ring.dropped} dropped (ring full)' if ring.dropped else ''})")
+        self._ring.close()
+        self._ring = None
 
     @property
     def is_connected(self) -> bool:
-        return self._connected
+        return self._ring is not None and self._ring.connected
 
     @property
     def is_fake(self) -> bool:
-        return self._use_fake and self._offline
+        return isinstance(self._source, FakeSource) and self._offline
+
+    @property
+    def source(self) -> ChatSource:
+        return self._source
 
     @property
     def message_count(self) -> int:
-        return self._message_count
+        """Messages received from the source (including collapsed, shed and dropped ones)."""
+        return self._ring.received if self._ring is not None else 0
+
+    @property
+    def delivered_count(self) -> int:
+        return self._ring.message_count if self._ring is not None else 0
+
+    @property
+    def collapsed_count(self) -> int:
+        return self._ring.collapsed if self._ring is not None else 0
+
+    @property
+    def shed_count(self) -> int:
+        return self._ring.shed if self._ring is not None else 0
+
+    @property
+    def dropped_count(self) -> int:
+        return self._ring.dropped if self._ring is not None else 0
+
+    @property
+    def switch_count(self) -> int:
+        return self._ring.switches if self._ring is not None else 0
+
+    @property
+    def last_switch_gap(self) -> float:
+        """Seconds without chat during the last stream switch (0 = seamless)."""
+        return self._ring.last_switch_gap if self._ring is not None else 0.0
+
+    @property
+    def duplicate_count(self) -> int:
+        """Messages delivered twice (overlapping sessions, reconnects) and skipped."""
+        return self._ring.duplicates if self._ring is not None else 0
 
     @property
     def status_text(self) -> str:
-        return self._status_text
+        return self._ring.status if self._ring is not None else "Initializing..."
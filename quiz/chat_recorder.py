@@ -0,0 +1,193 @@
+"""
+The Lifelong Quiz - Chat Recorder
+Captures live chat to compressed, append-only, size-rotated JSONL files.
+
+One line per message: {"ts": arrival time, "user": ..., "raw": text as sent,
+"norm": normalized text}. Files are written with zstd when the zstandard
+package is installed and gzip otherwise, and are never reopened: each start
+and each rotation (CHAT_RECORD_MAX_BYTES of compressed output) begins a new
+file named chat-YYYYmmdd-HHMMSS-N.jsonl.zst|.gz.
+
+Recording costs the chat reader one SimpleQueue.put per message; a writer
+thread batches, serializes and compresses. ReplaySource and
+scripts/replay_logic.py read these files (or a whole directory of them) back.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from quiz.config import (
+    CHAT_RECORD_DIR, CHAT_RECORD_MAX_BYTES, CHAT_RECORD_COMPRESSION, CHAT_RECORD_FLUSH_INTERVAL,
+)
+
+log = logging.getLogger("quiz.chat")
+
+_STOP = object()
+
+
+def open_chat_log(path: str):
+    """Open a recorded chat file (.jsonl, .jsonl.gz or .jsonl.zst) for reading as text."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed; pip install zstandard to read it")
+        raw = open(path, "rb")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True),
+                                encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def chat_log_files(path: str) -> list[str]:
+    """A recorded file, or every recording in a directory in capture order."""
+    if not os.path.isdir(path):
+        return [path]
+    names = sorted(n for n in os.listdir(path) if n.startswith("chat-") and ".jsonl" in n)
+    return [os.path.join(path, n) for n in names]
+
+
+def read_chat_log(path: str):
+    """Yield recorded messages (dicts) from a file or a directory of rotated files."""
+    for file_path in chat_log_files(path):
+        with open_chat_log(file_path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class ChatRecorder:
+    def __init__(self, directory: str = CHAT_RECORD_DIR, max_bytes: int = CHAT_RECORD_MAX_BYTES,
+                 compression: str = CHAT_RECORD_COMPRESSION, session: str | None = None):
+        if compression == "zstd" and zstandard is None:
+            log.warning("[Chat] zstandard not installed, recording chat with gzip")
+            compression = "gzip"
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = None
+        self._file_index = 0
+        self._failed = False
+        self._session = session or time.strftime("%Y%m%d-%H%M%S")
+
+        # Counters (written by the writer thread)
+        self.recorded = 0
+        self.files = 0
+        self.bytes_written = 0
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._writer_loop, name="chat-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, username: str, raw: str, normalized: str, timestamp: float):
+        """Called by the chat reader for every message. Only enqueues."""
+        if not self._failed:
+            self._queue.put((timestamp, username, raw, normalized))
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=10)
+        self._thread = None
+        log.info(f"[Chat] Recorded {self.recorded} messages to {self.files} file(s) "
+                 f"({self.bytes_written / 1e6:.1f} MB) in {self.directory}")
+
+    # ------------------------------------------
+    # WRITER THREAD
+    # ------------------------------------------
+    def _open(self):
+        self._file_index += 1
+        ext = "zst" if self.compression == "zstd" else "gz"
+        path = os.path.join(self.directory, f"chat-{self._session}-{self._file_index:03d}.jsonl.{ext}")
+        raw = open(path, "xb")  # append-only: never reuse an existing file
+        try:
+            if self.compression == "zstd":
+                writer = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+            else:
+                writer = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+        except Exception:
+            raw.close()
+            raise
+        self.files += 1
+        return raw, writer
+
+    def _flush(self, writer):
+        if self.compression == "zstd":
+            writer.flush(zstandard.FLUSH_BLOCK)
+        else:
+            writer.flush()  # Z_SYNC_FLUSH: everything so far is decodable after a crash
+
+    def _close(self, raw, writer):
+        writer.close()
+        self.bytes_written += raw.tell()
+        raw.close()
+
+    def _writer_loop(self):
+        raw = writer = None  # None while no file is open (before the first, between rotations)
+        last_flush = time.monotonic()
+        stopping = False
+        try:
+            raw, writer = self._open()
+            while not stopping:
+                try:
+                    item = self._queue.get(timeout=CHAT_RECORD_FLUSH_INTERVAL)
+                except queue.Empty:
+                    item = None
+                batch = []
+                while item is not None:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= 10_000:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+
+                if batch:
+                    writer.write("".join(
+                        json.dumps({"ts": ts, "user": user, "raw": text, "norm": norm},
+                                   ensure_ascii=False) + "\n"
+                        for ts, user, text, norm in batch
+                    ).encode("utf-8"))
+                    self.recorded += len(batch)
+
+                now = time.monotonic()
+                if now - last_flush >= CHAT_RECORD_FLUSH_INTERVAL:
+                    self._flush(writer)
+                    last_flush = now
+                    if raw.tell() >= self.max_bytes:
+                        old_raw, old_writer = raw, writer
+                        raw = writer = None  # the finally must not close these twice
+                        self._close(old_raw, old_writer)
+                        raw, writer = self._open()
+        except Exception as e:
+            self._failed = True
+            log.error(f"[Chat] Recorder error, recording stopped: {e}")
+            # Nothing will write these; don't hold them in the reader's memory
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+        finally:
+            if raw is not None:
+                try:
+                    self._close(raw, writer)
+                except Exception as e:
+                    log.error(f"[Chat] Could not close recording: {e}")
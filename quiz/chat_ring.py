@@ -0,0 +1,183 @@
+"""
+The Lifelong Quiz - Chat Ring Buffer
+Single-producer/single-consumer ring of chat records in shared memory.
+
+The chat ingestor process writes (timestamp, source_ts, username, message) records and
+the game loop drains them once per frame, with no locks, pickling or pipe
+round-trips in between. Layout of the shared block:
+
+    header  : u64 write_idx, u64 read_idx, u64 dropped, u64 message_count,
+              u64 connected, u64 status_seq, u64 collapsed, u64 shed,
+              u64 switches, u64 switch_gap_us, u64 duplicates, S192 status text
+    slots   : capacity x (f8 timestamp, f8 source_ts, S56 username, S184 message)
+
+Indices only ever grow; slot = idx & (capacity - 1). The producer fills a
+slot before publishing write_idx and the consumer reads slots before
+publishing read_idx, so each side only writes its own index. This relies on
+aligned 8-byte stores being atomic and seen in program order, as on x86-64
+(the streaming host); there are no explicit barriers. When the ring is full
+the producer drops the record and counts it instead of blocking the reader
+of the YouTube API. The ingestor also publishes how many messages it
+collapsed (per-user pre-aggregation) and shed (chatter under pressure), so
+message_count + dropped + collapsed + shed is everything chat delivered,
+and stream switchovers (count, last gap) plus duplicates skipped across them.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from quiz.models import ChatMessage
+
+_HEADER = np.dtype([
+    ("write_idx", "<u8"), ("read_idx", "<u8"), ("dropped", "<u8"),
+    ("message_count", "<u8"), ("connected", "<u8"), ("status_seq", "<u8"),
+    ("collapsed", "<u8"), ("shed", "<u8"),
+    ("switches", "<u8"), ("switch_gap_us", "<u8"), ("duplicates", "<u8"), ("status", "S192"),
+])
+_SLOT = np.dtype([("ts", "<f8"), ("src", "<f8"), ("user", "S56"), ("msg", "S184")])
+
+
+class ChatRing:
+    """One side of the ring. Create with create(); attach from the other process by name."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._header = np.ndarray((), dtype=_HEADER, buffer=shm.buf)
+        self._slots = np.ndarray((capacity,), dtype=_SLOT, buffer=shm.buf, offset=_HEADER.itemsize)
+
+    @classmethod
+    def create(cls, capacity: int) -> "ChatRing":
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"ring capacity must be a power of two, got {capacity}")
+        size = _HEADER.itemsize + capacity * _SLOT.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shm.buf[:_HEADER.itemsize] = bytes(_HEADER.itemsize)
+        return cls(shm, capacity, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "ChatRing":
+        return cls(shared_memory.SharedMemory(name=name), capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self):
+        # Drop our numpy views first, or SharedMemory.close() can't release the buffer
+        self._header = None
+        self._slots = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    # ------------------------------------------
+    # PRODUCER (ingestor)
+    # ------------------------------------------
+    def push(self, username: str, message: str, timestamp: float, source_ts: float = 0.0,
+             count_drop: bool = True) -> bool:
+        """Append one record; returns False (and counts a drop) if the ring is full."""
+        header = self._header
+        w = int(header["write_idx"])
+        if w - int(header["read_idx"]) >= self.capacity:
+            if count_drop:
+                header["dropped"] += 1
+            return False
+        # Over-long names/messages are cut at the slot size; the reader
+        # ignores a multi-byte character split by the cut
+        self._slots[w & self._mask] = (
+            timestamp, source_ts, username.encode("utf-8")[:56], message.encode("utf-8")[:184],
+        )
+        header["write_idx"] = w + 1
+        header["message_count"] += 1
+        return True
+
+    def add_counts(self, collapsed: int, shed: int):
+        header = self._header
+        header["collapsed"] += collapsed
+        header["shed"] += shed
+
+    def record_switch(self, gap: float):
+        header = self._header
+        header["switch_gap_us"] = int(gap * 1e6)
+        header["switches"] += 1
+
+    def add_duplicates(self, count: int):
+        self._header["duplicates"] += count
+
+    def set_status(self, text: str, connected: bool):
+        header = self._header
+        header["status"] = text.encode("utf-8")[:192]
+        header["connected"] = int(connected)
+        header["status_seq"] += 1
+
+    # ------------------------------------------
+    # CONSUMER (game loop)
+    # ------------------------------------------
+    def drain(self, max_items: int) -> list[ChatMessage]:
+        """Pop up to max_items records, oldest first."""
+        header = self._header
+        r = int(header["read_idx"])
+        n = min(int(header["write_idx"]) - r, max_items)
+        if n <= 0:
+            return []
+        start = r & self._mask
+        end = start + n
+        if end <= self.capacity:
+            rows = self._slots[start:end].tolist()
+        else:
+            rows = self._slots[start:].tolist() + self._slots[:end - self.capacity].tolist()
+        header["read_idx"] = r + n
+        return [
+            ChatMessage(user.decode("utf-8", "ignore"), msg.decode("utf-8", "ignore"), ts, src)
+            for ts, src, user, msg in rows
+        ]
+
+    def pending(self) -> int:
+        return int(self._header["write_idx"]) - int(self._header["read_idx"])
+
+    @property
+    def dropped(self) -> int:
+        return int(self._header["dropped"])
+
+    @property
+    def collapsed(self) -> int:
+        return int(self._header["collapsed"])
+
+    @property
+    def shed(self) -> int:
+        return int(self._header["shed"])
+
+    @property
+    def received(self) -> int:
+        """Every message the source produced, whether or not it reached the ring."""
+        header = self._header
+        return int(header["message_count"] + header["dropped"] + header["collapsed"] + header["shed"])
+
+    @property
+    def switches(self) -> int:
+        return int(self._header["switches"])
+
+    @property
+    def last_switch_gap(self) -> float:
+        """Seconds without chat during the last stream switchover (0 if the sessions overlapped)."""
+        return int(self._header["switch_gap_us"]) / 1e6
+
+    @property
+    def duplicates(self) -> int:
+        return int(self._header["duplicates"])
+
+    @property
+    def message_count(self) -> int:
+        return int(self._header["message_count"])
+
+    @property
+    def connected(self) -> bool:
+        return bool(self._header["connected"])
+
+    @property
+    def status(self) -> str:
+        return self._header["status"].item().decode("utf-8", "ignore")
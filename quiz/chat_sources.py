@@ -0,0 +1,482 @@
+"""
+The Lifelong Quiz - Chat Sources
+Where chat messages come from: YouTube (pytchat), fake bots, a local TCP
+line server, or a recorded JSONL file replayed in real time.
+
+A source runs inside the chat ingestor (see quiz/chat.py) and calls
+ingestor.emit(username, text) for every raw chat line until ingestor.running
+goes False, and ingestor.wait() (or flush()) whenever it goes idle so the
+per-user collapse window is sent on. Sources must be picklable, since they are handed to the ingest
+process as-is; open sockets and files in run(), not in __init__.
+
+The TCP source speaks a small IRC-like line protocol so load tools (or
+netcat) can blast messages at the game:
+
+    NICK alice                      set the sender for this connection
+    PRIVMSG #quiz :2                message from the connection's nick
+    :bob!bob@host PRIVMSG #quiz :3  message with an explicit sender
+    PING token                      answered with PONG token
+    bob: 4                          plain "user: message" also works
+"""
+
+import logging
+import queue
+import random
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+from quiz.config import (
+    CHAT_TCP_HOST, CHAT_TCP_PORT, CHAT_REPLAY_SPEED, CHAT_SWITCH_MAX_OVERLAP, CHAT_DEDUPE_IDS,
+)
+from quiz.chat_recorder import read_chat_log
+
+log = logging.getLogger("quiz.chat")
+
+# Fake bot usernames (used for offline testing only)
+FAKE_USERNAMES = [
+    "QuizMaster", "BrainiacBob", "TriviaQueen", "Lucky7",
+    "NerdAlert", "BookWorm42", "HistoryBuff", "ScienceGuy",
+    "MovieFan", "GeoGuesser", "SportsFan99", "MusicLover",
+    "GamerzUnite", "PixelPirate", "CosmicCat", "ThinkTank",
+]
+
+SOURCE_KINDS = ("youtube", "fake", "tcp", "replay")
+
+
+class ChatSource:
+    """Base class; subclasses implement run(ingestor)."""
+
+    # Whether connect_to() (a stream found by the StreamWatcher) applies; others ignore it
+    follows_streams = False
+    # Wait for the game to drain a full ring instead of dropping (local test sources only)
+    backpressure = False
+
+    def describe(self) -> str:
+        return type(self).__name__
+
+    def run(self, ingestor):
+        raise NotImplementedError
+
+
+# ------------------------------------------
+# YOUTUBE
+# ------------------------------------------
+class _ChatSession:
+    """
+    One pytchat session, polled on its own thread. Items go to a queue shared
+    by every open session, so two can be merged during a stream switchover.
+    """
+
+    def __init__(self, pytchat, video_id: str, out: queue.SimpleQueue):
+        self.video_id = video_id
+        self.error: Exception | None = None
+        self.connected_at = 0.0   # time.time() once pytchat.create succeeded
+        self.first_item_at = 0.0  # time.time() the first message arrived
+        self.ended_at = 0.0       # time.time() the session stopped delivering
+        self._pytchat = pytchat
+        self._out = out
+        self._chat = None
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"pytchat-{video_id}", daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return not self.ended_at
+
+    def close(self):
+        self._closed.set()
+        if self._chat is not None:
+            self._chat.terminate()
+
+    def _run(self):
+        try:
+            # A fresh processor per session: pytchat's default one is a shared
+            # instance that keeps pacing state from the previous stream
+            chat = self._pytchat.create(video_id=self.video_id, interruptable=False,
+                                        processor=self._pytchat.DefaultProcessor())
+            self._chat = chat
+            self.connected_at = time.time()
+            while chat.is_alive() and not self._closed.is_set():
+                for c in chat.get().sync_items():
+                    if self._closed.is_set():
+                        break
+                    if not self.first_item_at:
+                        self.first_item_at = time.time()
+                    # c.timestamp: YouTube's send time in ms
+                    self._out.put((self, c.id, c.author.name, c.message, c.timestamp / 1000.0))
+            if not self._closed.is_set():
+                chat.raise_for_status()
+        except Exception as e:
+            self.error = e
+        finally:
+            if self._chat is not None:
+                self._chat.terminate()
+            self.ended_at = time.time()
+
+
+class YouTubeSource(ChatSource):
+    """
+    pytchat polling with reconnect/backoff. Waits for a stream if no video ID
+    is known yet.
+
+    Stream switches are make-before-break: the new video's session opens next
+    to the current one and both are merged (deduplicated by message id) until
+    the new one delivers its first message, or has been connected for
+    CHAT_SWITCH_MAX_OVERLAP seconds, or the old one ends. Only then is the old
+    session closed. The time chat went without a live session across the
+    switch is the switchover gap (ideally 0), reported to the ring.
+    """
+
+    follows_streams = True
+
+    def __init__(self, offline_fallback: bool = False):
+        self.offline_fallback = offline_fallback
+        self._last_status_log = 0.0
+
+    def describe(self) -> str:
+        return "YouTube live chat"
+
+    def run(self, ingestor):
+        if not ingestor.video_id:
+            ingestor.set_status("Waiting for stream...")
+            log.info("[Chat] No video ID yet, waiting for live stream connection...")
+            while ingestor.running and not ingestor.video_id:
+                ingestor.wait(2.0)
+            if not ingestor.running:
+                return
+            log.info("[Chat] Stream found! Connecting to live chat...")
+        ingestor.set_status(f"Connecting to {ingestor.video_id}...")
+        self._read_chat(ingestor)
+
+    def _read_chat(self, ingestor):
+        try:
+            import pytchat
+        except ImportError:
+            ingestor.set_status("ERROR: pytchat not installed")
+            log.error("[Chat] pytchat not installed!")
+            log.error("[Chat] Install it: pip install pytchat")
+            if self.offline_fallback:
+                FakeSource().run(ingestor)
+            return
+
+        items: queue.SimpleQueue = queue.SimpleQueue()
+        active: _ChatSession | None = None    # the session we trust
+        standby: _ChatSession | None = None   # the next stream, opened alongside
+        switch_requested_at = 0.0
+        live_shown = False
+        consecutive_failures = 0
+        retry_at = 0.0
+        # Recently seen message ids: overlapping sessions (and reconnects, which
+        # fetch a few seconds of history) deliver some messages twice
+        seen_ids: set[str] = set()
+        seen_order: deque[str] = deque()
+
+        try:
+            while ingestor.running:
+                now = time.time()
+                if ingestor.switch_requested:
+                    ingestor.clear_switch()
+                    retry_at = 0.0  # a new stream is worth trying right away
+                    switch_requested_at = now
+                target = ingestor.video_id
+
+                # Open a session for the target stream, next to the current one if there is one
+                wanted = active is None or active.video_id != target
+                if wanted and now >= retry_at and (standby is None or standby.video_id != target):
+                    if standby is not None:
+                        standby.close()
+                        standby = None
+                    log.info(f"[Chat] Connecting to video {target}...")
+                    session = _ChatSession(pytchat, target, items)
+                    if active is None:
+                        active = session
+                        live_shown = False
+                        ingestor.set_status(f"Connecting to {target}...")
+                    else:
+                        standby = session
+                        ingestor.set_status(f"Switching to {target}...")
+
+                # Merge whatever the sessions delivered
+                try:
+                    batch = [items.get(timeout=0.1)]
+                except queue.Empty:
+                    batch = []
+                    ingestor.flush()  # quiet: don't hold the collapse window open
+                while batch and len(batch) < 2000:
+                    try:
+                        batch.append(items.get_nowait())
+                    except queue.Empty:
+                        break
+                duplicates = 0
+                for session, msg_id, author, text, source_ts in batch:
+                    if msg_id:
+                        if msg_id in seen_ids:
+                            duplicates += 1
+                            continue
+                        seen_ids.add(msg_id)
+                        seen_order.append(msg_id)
+                        if len(seen_order) > CHAT_DEDUPE_IDS:
+                            seen_ids.discard(seen_order.popleft())
+                    ingestor.emit(author, text, source_ts=source_ts)
+                if duplicates:
+                    ingestor.count_duplicates(duplicates)
+
+                now = time.time()
+                if active is not None and active.connected_at and not live_shown:
+                    live_shown = True
+                    consecutive_failures = 0
+                    ingestor.set_status(f"LIVE - reading chat ({active.video_id})", connected=True)
+                    log.info(f"[Chat] Connected to YouTube live chat! (video: {active.video_id})")
+
+                # Hand over once the new session is delivering (or the old one is gone)
+                if standby is not None:
+                    if not standby.alive:
+                        consecutive_failures += 1
+                        wait_time = min(60, 10 * consecutive_failures)
+                        log.warning(f"[Chat] Could not open {standby.video_id} ({standby.error}), "
+                                    f"staying on {active.video_id}, retrying in {wait_time}s")
+                        standby = None
+                        retry_at = now + wait_time
+                        if active.alive:
+                            ingestor.set_status(f"LIVE - reading chat ({active.video_id})")
+                    elif standby.first_item_at or (standby.connected_at and (
+                            not active.alive or now - standby.connected_at >= CHAT_SWITCH_MAX_OVERLAP)):
+                        old = active
+                        old.close()
+                        active, standby = standby, None
+                        live_shown = True
+                        consecutive_failures = 0
+                        # Chat was dark from when the old session stopped (or the
+                        # switch was asked for, if later) until the new one's first message
+                        went_dark = max(old.ended_at or now, switch_requested_at)
+                        resumed = active.first_item_at or now
+                        gap = max(0.0, resumed - went_dark)
+                        ingestor.record_switch(gap)
+                        ingestor.set_status(f"LIVE - reading chat ({active.video_id})", connected=True)
+                        log.info(f"[Chat] Switched from {old.video_id} to {active.video_id} "
+                                 f"(gap {gap * 1000:.0f}ms)")
+
+                # The active session ended: stream over, not live yet, or an error
+                if active is not None and not active.alive and standby is None:
+                    ingestor.set_status(connected=False)
+                    if active.error is not None:
+                        consecutive_failures += 1
+                        wait_time = min(60, 10 * consecutive_failures)
+                        ingestor.set_status(f"Error #{consecutive_failures}, retry in {wait_time}s")
+                        log.warning(f"[Chat] Error (attempt {consecutive_failures}): {active.error}. "
+                                    f"Retrying in {wait_time}s")
+                    else:
+                        wait_time = 10
+                        ingestor.set_status(f"Waiting for stream {active.video_id} to go live...")
+                        log.info(f"[Chat] Stream {active.video_id} not active yet, retrying in 10s...")
+                    active = None
+                    retry_at = now + wait_time
+
+                # Periodic status log (every 30s)
+                if live_shown and active is not None and now - self._last_status_log > 30:
+                    self._last_status_log = now
+                    count = ingestor.message_count
+                    ingestor.set_status(f"LIVE ({count} msgs)")
+                    log.info(f"[Chat] Status: connected, {count} messages received total")
+        finally:
+            for session in (active, standby):
+                if session is not None:
+                    session.close()
+            ingestor.set_status(connected=False)
+
+
+# ------------------------------------------
+# FAKE BOTS
+# ------------------------------------------
+class FakeSource(ChatSource):
+    """Random answers from a handful of fake viewers; hands over to YouTube once a stream is found."""
+
+    follows_streams = True
+
+    def describe(self) -> str:
+        return "Offline (fake bots)"
+
+    def run(self, ingestor):
+        ingestor.set_status("Offline (fake bots)", connected=True)
+        log.info("[Chat] Fake chat running (offline testing mode)")
+
+        while ingestor.running:
+            # If a stream was found, switch to real chat
+            if ingestor.switch_requested and ingestor.video_id:
+                ingestor.set_status("Switching to live chat...", connected=False)
+                log.info("[Chat] Stream found! Switching from fake chat to live...")
+                YouTubeSource().run(ingestor)
+                return
+
+            if ingestor.wait(random.uniform(0.3, 1.5)):
+                continue
+            user = random.choice(FAKE_USERNAMES)
+            roll = random.random()
+            if roll < 0.03:
+                msg_text = "reset"
+            else:
+                msg_text = str(random.randint(1, 4))
+            ingestor.emit(user, msg_text)
+
+
+# ------------------------------------------
+# LOCAL TCP LINE SERVER
+# ------------------------------------------
+def parse_line(line: str, nick: str) -> tuple[str | None, str | None, str | None]:
+    """
+    Parse one protocol line. Returns (username, text, reply): username/text
+    for a chat message, reply for a line to send back (PING), and the new
+    nick in username with text None for NICK.
+    """
+    if line.startswith(":"):
+        prefix, _, line = line[1:].partition(" ")
+        nick = prefix.split("!", 1)[0]
+    command, _, rest = line.partition(" ")
+    upper = command.upper()
+    if upper == "PRIVMSG":
+        _, _, text = rest.partition(" :")
+        return nick, text, None
+    if upper == "NICK":
+        return rest.strip() or nick, None, None
+    if upper == "PING":
+        return None, None, f"PONG {rest}"
+    user, sep, text = line.partition(": ")
+    if sep and user and " " not in user:
+        return user, text, None
+    return None, None, None
+
+
+class TcpLineSource(ChatSource):
+    """Accepts any number of TCP clients and reads IRC-like chat lines from them."""
+
+    backpressure = True
+
+    def __init__(self, host: str = CHAT_TCP_HOST, port: int = CHAT_TCP_PORT):
+        self.host = host
+        self.port = port
+
+    def describe(self) -> str:
+        return f"TCP chat on {self.host}:{self.port}"
+
+    def run(self, ingestor):
+        server = socket.create_server((self.host, self.port), reuse_port=False)
+        server.setblocking(False)
+        sel = selectors.DefaultSelector()
+        sel.register(server, selectors.EVENT_READ, None)
+        clients = 0
+        ingestor.set_status(f"TCP chat on {self.host}:{self.port} (0 clients)", connected=True)
+        log.info(f"[Chat] Listening for chat lines on {self.host}:{self.port}")
+        try:
+            while ingestor.running:
+                events = sel.select(timeout=0.2)
+                if not events:
+                    ingestor.flush()  # quiet: don't hold the collapse window open
+                for key, _ in events:
+                    if key.data is None:
+                        conn, addr = server.accept()
+                        conn.setblocking(False)
+                        # per-connection state: [pending bytes, nick]
+                        sel.register(conn, selectors.EVENT_READ, [b"", f"{addr[0]}:{addr[1]}"])
+                        clients += 1
+                        ingestor.set_status(f"TCP chat on {self.host}:{self.port} ({clients} clients)")
+                        continue
+                    conn, state = key.fileobj, key.data
+                    try:
+                        chunk = conn.recv(65536)
+                    except ConnectionError:
+                        chunk = b""
+                    if not chunk:
+                        sel.unregister(conn)
+                        conn.close()
+                        clients -= 1
+                        ingestor.set_status(f"TCP chat on {self.host}:{self.port} ({clients} clients)")
+                        continue
+                    *lines, state[0] = (state[0] + chunk).split(b"\n")
+                    for raw in lines:
+                        line = raw.decode("utf-8", "replace").rstrip("\r")
+                        user, text, reply = parse_line(line, state[1])
+                        if reply is not None:
+                            conn.sendall(reply.encode("utf-8") + b"\r\n")
+                        elif text is not None:
+                            ingestor.emit(user, text)
+                        elif user is not None:
+                            state[1] = user
+        finally:
+            for key in list(sel.get_map().values()):
+                key.fileobj.close()
+            sel.close()
+
+
+# ------------------------------------------
+# JSONL REPLAY
+# ------------------------------------------
+class ReplaySource(ChatSource):
+    """
+    Replays recorded chat with its original inter-arrival times, sped up by
+    `speed` (1x-100x). Reads ChatRecorder output (a .jsonl/.gz/.zst file or a
+    directory of them): JSON lines with an arrival timestamp "ts", a username
+    "user" and the raw text "raw" (or "message").
+    """
+
+    backpressure = True
+
+    def __init__(self, path: str, speed: float = CHAT_REPLAY_SPEED, loop: bool = False):
+        if not 1.0 <= speed <= 100.0:
+            raise ValueError(f"replay speed must be between 1x and 100x, got {speed}")
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+
+    def describe(self) -> str:
+        return f"Replay {self.path} at {self.speed:g}x"
+
+    def run(self, ingestor):
+        ingestor.set_status(f"Replaying at {self.speed:g}x", connected=True)
+        log.info(f"[Chat] Replaying {self.path} at {self.speed:g}x")
+        while ingestor.running:
+            replayed = self._play_once(ingestor)
+            log.info(f"[Chat] Replay finished ({replayed} messages)")
+            if not self.loop:
+                break
+        ingestor.set_status(f"Replay finished ({ingestor.message_count} msgs)", connected=False)
+        # Keep the ingestor alive (and the status visible) until the game stops it
+        while ingestor.running:
+            ingestor.wait(1.0)
+
+    def _play_once(self, ingestor) -> int:
+        first_ts = None
+        start = time.perf_counter()
+        replayed = 0
+        for record in read_chat_log(self.path):
+            if not ingestor.running:
+                break
+            if first_ts is None:
+                first_ts = record["ts"]
+            delay = start + (record["ts"] - first_ts) / self.speed - time.perf_counter()
+            # Sleep only when ahead by a meaningful amount; bursts are emitted back to back
+            if delay > 0.002:
+                ingestor.wait(delay)
+            ingestor.emit(record["user"], record.get("raw", record.get("message", "")))
+            replayed += 1
+        return replayed
+
+
+def make_chat_source(kind: str, offline: bool = False, host: str = CHAT_TCP_HOST,
+                     port: int = CHAT_TCP_PORT, replay_path: str = "",
+                     speed: float = CHAT_REPLAY_SPEED, loop: bool = False) -> ChatSource:
+    """Build a source from CLI-style options."""
+    if kind == "youtube":
+        return YouTubeSource(offline_fallback=offline)
+    if kind == "fake":
+        return FakeSource()
+    if kind == "tcp":
+        return TcpLineSource(host, port)
+    if kind == "replay":
+        if not replay_path:
+            raise ValueError("the replay chat source needs a JSONL file")
+        return ReplaySource(replay_path, speed, loop)
+    raise ValueError(f"unknown chat source {kind!r} (expected one of {', '.join(SOURCE_KINDS)})")
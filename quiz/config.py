@@ -62,6 +62,7 @@ SPEED_BONUS_TIER1_MULT = 2.0
 SPEED_BONUS_TIER2_MULT = 1.5
 STREAK_BONUS_PER = 0.1  # +10% per consecutive correct
 MAX_STREAK_MULT = 3.0
+BATCH_RESOLVE_THRESHOLD = 256  # answers per round above which scoring runs vectorized
 
 # ==========================================
 # RANKS
@@ -91,7 +92,10 @@ OTDB_BASE_URL = "https://opentdb.com/api.php"
 OTDB_TOKEN_URL = "https://opentdb.com/api_token.php"
 OTDB_BATCH_SIZE = 50  # max supported by OTDB API
 OTDB_MIN_CACHE = 10   # prefetch aggressively for variety
-OTDB_REQUEST_COOLDOWN = 6.0
+OTDB_REQUEST_COOLDOWN = 6.0  # seconds per request token (OTDB allows one request per 5s per IP)
+OTDB_RATE_BURST = 1   # requests that may go out back-to-back after an idle period
+OTDB_MAX_RETRIES = 3  # retries (with jittered backoff) after rate-limit or network errors
+OTDB_TIMEOUT = 10     # seconds per HTTP request
 OTDB_SEEN_EXPIRY = 14400  # 4 hours before a seen question can reappear
 NUM_ANSWER_OPTIONS = 4
 
@@ -141,8 +145,46 @@ CHANNEL_IDS = [
     "UCmDgp2YS176ot2n7nFpLRzA",  # Chat vs Bedrock
 ]
 
-# How often to retry finding a livestream if none is active (seconds)
+# How often to look for a (new) livestream, in seconds. The watcher backs off
+# from STREAM_POLL_INTERVAL to STREAM_POLL_MAX_INTERVAL while nothing changes,
+# and polls every STREAM_POLL_TIGHT for STREAM_RESTART_WINDOW after the chat
+# loses its stream (for longer than STREAM_LIVENESS_GRACE) and around the
+# times the show restarts (STREAM_RESTART_TIMES, plus restarts it has seen)
 STREAM_POLL_INTERVAL = 20
+STREAM_POLL_MAX_INTERVAL = 300
+STREAM_POLL_TIGHT = 5
+STREAM_LIVENESS_GRACE = 15
+STREAM_RESTART_WINDOW = 600
+STREAM_RESTART_TIMES: list[str] = []  # local "HH:MM", e.g. ["04:00"]
+# A channel with no live stream is skipped for this long (doubling per miss)
+STREAM_NEGATIVE_TTL = 60
+# Channel pages are probed in parallel; the first live stream found wins
+STREAM_PROBE_WORKERS = 4
+STREAM_PROBE_TIMEOUT = 15  # seconds per channel page request
+
+# Most chat messages handled per frame; a bigger burst spills into the next frames
+CHAT_BATCH_MAX = 5000
+
+# Read chat in a separate process (off the render loop's GIL); False runs it as a thread
+CHAT_INGEST_PROCESS = True
+# Shared-memory ring between the chat process and the game (power of two, 256 bytes/slot)
+CHAT_RING_CAPACITY = 16384
+# Stream switches keep the old chat session open until the new one delivers
+# (or has been connected this long without a message, e.g. a quiet new stream)
+CHAT_SWITCH_MAX_OVERLAP = 20.0
+CHAT_DEDUPE_IDS = 4096  # recent message ids remembered to skip repeats across sessions
+# Per-user pre-aggregation in the chat process: within each window a viewer's
+# answers collapse to the latest one (likewise their commands and other chatter)
+CHAT_COLLAPSE_WINDOW = 0.1      # seconds; the most it adds to chat latency
+CHAT_COLLAPSE_MAX_PENDING = 20000  # flush early once this many viewers are pending
+# Shed chatter (not an answer or command) once the ring is this full; answers
+# and commands are only dropped when it is completely full
+CHAT_CHATTER_HIGH_WATER = 0.5
+
+# Local chat sources for load testing (python -m quiz.game --chat-source tcp|replay)
+CHAT_TCP_HOST = "127.0.0.1"
+CHAT_TCP_PORT = 6667
+CHAT_REPLAY_SPEED = 1.0  # 1x-100x the recorded inter-arrival times
 
 # ==========================================
 # FILLER BOTS
@@ -163,6 +205,37 @@ _ROOT = _Path(__file__).resolve().parent.parent
 
 DB_PATH = str(_ROOT / "data" / "quiz_data.db")
 DB_SAVE_INTERVAL = 10  # seconds
+DB_CACHE_SIZE = 50000  # players kept in memory; least recently active are evicted once flushed
+QUESTION_BANK_PATH = str(_ROOT / "data" / "question_bank.db")
+
+# ==========================================
+# LOGGING
+# ==========================================
+LOG_LEVEL = "INFO"
+LOG_FILE = str(_ROOT / "data" / "quiz.log")  # rotating; set to "" to log to console only
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+LOG_QUEUE_SIZE = 10000  # records waiting for the writer thread; extra records are dropped
+# Per-category thinning of noisy loggers
+LOG_SAMPLING = {"quiz.chat.messages": 100}  # logger -> keep 1 in N records
+LOG_RATE_LIMITS = {"quiz.game.answers": 5.0, "quiz.db.flush": 1.0, "quiz.otdb": 1.0}  # logger -> max records/s
+
+# ==========================================
+# CHAT RECORDING (production capture for offline replay)
+# ==========================================
+CHAT_RECORD = False  # or: python -m quiz.game --record-chat
+CHAT_RECORD_DIR = str(_ROOT / "data" / "chat_logs")
+CHAT_RECORD_MAX_BYTES = 64 * 1024 * 1024  # compressed size before rotating to a new file
+CHAT_RECORD_COMPRESSION = "zstd"  # "zstd" (needs the zstandard package) or "gzip"
+CHAT_RECORD_FLUSH_INTERVAL = 5.0  # seconds of chat at most lost if the game crashes
+
+# ==========================================
+# METRICS
+# ==========================================
+LATENCY_WINDOW = 60  # seconds of chat latency the rolling percentiles cover
+METRICS_PATH = str(_ROOT / "data" / "metrics.json")
+METRICS_DUMP_INTERVAL = 60  # seconds between metrics dumps (also written on shutdown)
+SHOW_LATENCY_OVERLAY = False  # toggle in game with F6
 
 # ==========================================
 # ASSETS
@@ -239,3 +312,6 @@ YOUTUBE_STREAM_KEY = "d4t6-3q2b-0hem-5hms-3y37"             # Your YouTube strea
 STREAM_FPS = 30                     # Stream output framerate (30fps is ideal for quiz content)
 STREAM_BITRATE = "6000k"            # Video bitrate for 1080p30
 FFMPEG_PATH = "ffmpeg"              # Path to ffmpeg binary (auto-downloaded to scripts/)
+STREAM_FRAME_BUFFERS = 4            # Preallocated captured frames waiting for FFmpeg (8 MB each at 1080p)
+STREAM_PACING_DEPTH = 2             # Captured frames allowed to wait for the writer; older ones are dropped
+                                    # (STREAM_FRAME_BUFFERS needs this + 2: one being written, one capturing)
@@ -3,67 +3,81 @@ The Lifelong Quiz - Main Game Controller
 Ties together chat, logic, database, sounds, and UI into the game loop.
 """
 
+import logging
+import threading
+
 import pygame
-import queue
 import time
 import sys
 
 from quiz.config import (
     SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WINDOW_TITLE,
-    DB_SAVE_INTERVAL,
+    DB_SAVE_INTERVAL, CHAT_BATCH_MAX, CHAT_RECORD,
+    METRICS_PATH, METRICS_DUMP_INTERVAL, SHOW_LATENCY_OVERLAY,
     VIDEO_ID, CHANNEL_IDS,
     STREAM_ENABLED, YOUTUBE_STREAM_KEY, STREAM_FPS, STREAM_BITRATE, FFMPEG_PATH,
 )
 from quiz.models import GameState
 from quiz.db import QuizDatabase
+from quiz.question_bank import QuestionBank
+from quiz.otdb import OTDBClient
 from quiz.chat import ChatManager
+from quiz.chat_sources import ChatSource
 from quiz.logic import QuizLogic
 from quiz.ui import UIManager
 from quiz.sounds import SoundManager
-from quiz.stream import resolve_video_id, StreamWatcher
+from quiz.stream import StreamWatcher
 from quiz.broadcaster import YouTubeBroadcaster
+from quiz.metrics import ChatLatency, RollingHistogram, write_metrics
+
+metrics_log = logging.getLogger("quiz.metrics")
 
 
 class MainGameController:
-    def __init__(self, video_id: str = "", offline: bool = False):
+    def __init__(self, video_id: str = "", offline: bool = False,
+                 chat_source: ChatSource | None = None, record_chat: bool = CHAT_RECORD):
         pygame.init()
         pygame.display.set_caption(WINDOW_TITLE)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.clock = pygame.time.Clock()
         self.running = True
 
-        # Resolve video ID: explicit arg > config VIDEO_ID > auto-detect from channels
-        effective_id = video_id or VIDEO_ID
-        if offline:
-            resolved = ""
-        else:
-            resolved = resolve_video_id(
-                video_id=effective_id,
-                channel_ids=CHANNEL_IDS,
-            )
+        # Local sources (TCP, replay) don't need a YouTube stream at all
+        if chat_source is not None and not chat_source.follows_streams:
+            offline = True
+
+        # Resolve video ID: explicit arg > config VIDEO_ID > auto-detect from channels.
+        # Auto-detection runs on the StreamWatcher thread, so the window opens at
+        # once; the chat ingestor waits for the stream and connects when it's found.
+        resolved = "" if offline else video_id or VIDEO_ID
+        if resolved:
+            print(f"[Stream] Using provided video ID: {resolved}")
 
         # Subsystems
-        self.msg_queue = queue.Queue()
         self.db = QuizDatabase()
-        self.logic = QuizLogic(self.db)
-        self.chat = ChatManager(resolved, self.msg_queue, offline=offline)
+        self.bank = QuestionBank()
+        self.otdb = OTDBClient()
+        self.logic = QuizLogic(self.db, self.bank, self.otdb)
+        self.chat = ChatManager(resolved, offline=offline, source=chat_source, record=record_chat)
         self.ui = UIManager(self.screen)
         self.sounds = SoundManager()
 
-        # Background stream watcher (polls for stream if none found yet)
+        # Background stream watcher: finds the stream, and the next one when it ends
         self._stream_watcher = StreamWatcher(
             on_stream_found=self._on_stream_found,
             channel_ids=CHANNEL_IDS,
+            video_id=resolved,
+            is_live=lambda: self.chat.is_connected,
         )
-        # Only start watcher if we didn't already find a stream
-        if not resolved and not offline:
+        if not offline:
             self._stream_watcher.start()
+        if not resolved and not offline:
             print("[Game] ============================================")
             print("[Game] Chat not connected yet!")
             print("[Game] Options to fix:")
             print("[Game]   1. Pass video ID: python -m quiz.game VIDEO_ID")
             print("[Game]   2. Set VIDEO_ID in quiz/config.py")
-            print("[Game]   3. Wait for auto-detect (polls every 20s)")
+            print("[Game]   3. Wait for auto-detect (searching now)")
             print("[Game] ============================================")
 
         # YouTube Live broadcaster (started in run() so frames are available immediately)
@@ -79,6 +93,14 @@ class MainGameController:
         self._frame_count = 0
         self._shutdown_done = False
 
+        # Chat-to-score latency per stage, frame work time, debug overlay (F6)
+        self.latency = ChatLatency()
+        self._frame_times = RollingHistogram()
+        self._show_overlay = SHOW_LATENCY_OVERLAY
+        self._overlay_lines: list[str] = []
+        self._overlay_updated = 0.0
+        self._last_metrics_dump = time.time()
+
         # Track tick sounds to avoid flooding
         self._last_tick_time = 0
         self._prev_logic_state = None
@@ -102,6 +124,7 @@ class MainGameController:
 
         while self.running:
             dt = self.clock.tick(FPS) / 1000.0
+            frame_start = time.perf_counter()
 
             self._handle_events()
             self._process_chat()
@@ -112,6 +135,8 @@ class MainGameController:
             self._render()
             self._broadcast_frame()
             self._periodic_save()
+            self._frame_times.add_one(time.perf_counter() - frame_start, time.time())
+            self._periodic_metrics_dump()
 
         self.shutdown()
 
@@ -135,11 +160,16 @@ class MainGameController:
                 elif event.key == pygame.K_F5:
                     self.logic.reset_bot_scores()
                     print("[Game] Bot scores reset (F5)")
+                elif event.key == pygame.K_F6:
+                    self._show_overlay = not self._show_overlay
+                    self._overlay_updated = 0.0
 
     def _process_chat(self):
-        while not self.msg_queue.empty():
-            msg = self.msg_queue.get()
-            self.logic.process_message(msg.username, msg.message)
+        drained_at = time.time()
+        batch = self.chat.drain(CHAT_BATCH_MAX)
+        if batch:
+            self.logic.process_messages(batch)
+            self.latency.observe(batch, drained_at, time.time())
 
     def _play_sounds(self):
         """Play all queued sounds from logic with appropriate rate limiting."""
@@ -185,10 +215,85 @@ class MainGameController:
             "mini_event": self.logic.mini_event,
             "events": self.logic.get_recent_events(),
             "competition_alert": self.logic.competition_alert,
+            "debug_lines": self._debug_lines() if self._show_overlay else None,
         }
 
         self.ui.draw(state, data)
 
+    def _metrics(self) -> dict:
+        now = time.time()
+        return {
+            "time": now,
+            "uptime": self.logic.uptime,
+            "chat_latency_ms": self.latency.snapshot(now),
+            "frame_ms": self._frame_times.summary(now),
+            "chat": {
+                "received": self.chat.message_count,
+                "delivered": self.chat.delivered_count,
+                "collapsed": self.chat.collapsed_count,
+                "shed": self.chat.shed_count,
+                "dropped": self.chat.dropped_count,
+                "duplicates": self.chat.duplicate_count,
+                "switches": self.chat.switch_count,
+                "last_switch_gap_ms": self.chat.last_switch_gap * 1000.0,
+                "status": self.chat.status_text,
+            },
+            "stream": self._stream_watcher.stats(),
+            "broadcast": self.broadcaster.stats(),
+            "db": self.db.flush_stats,
+        }
+
+    def _debug_lines(self) -> list[str]:
+        # Percentiles change slowly; recompute a few times a second, not every frame
+        now = time.time()
+        if now - self._overlay_updated >= 0.25:
+            self._overlay_updated = now
+            snap = self.latency.snapshot(now)
+            frame = self._frame_times.summary(now)
+            self._overlay_lines = ["chat latency (last 60s)"] + ChatLatency.format(snap)
+            if frame["count"]:
+                self._overlay_lines.append(
+                    f"frame    p50 {frame['p50']:7.1f}ms  p99 {frame['p99']:7.1f}ms  "
+                    f"max {frame['max']:7.1f}ms"
+                )
+            self._overlay_lines.append(
+                f"chat     {self.chat.message_count} received, {self.chat.collapsed_count} collapsed, "
+                f"{self.chat.shed_count} shed, {self.chat.dropped_count} dropped"
+            )
+            flush = self.db.flush_stats
+            self._overlay_lines.append(
+                f"db       {flush['flushes']} flushes, last {flush['last_rows']} rows in "
+                f"{flush['last_ms']:.1f}ms, max {flush['max_ms']:.1f}ms, {flush['pending']} pending"
+            )
+            if self.broadcaster.frames_sent:
+                self._overlay_lines.append(
+                    f"stream   {self.broadcaster.frames_sent} frames, "
+                    f"{self.broadcaster.frames_duplicated} repeated, {self.broadcaster.frames_dropped} dropped"
+                )
+            if self.chat.switch_count:
+                self._overlay_lines.append(
+                    f"switch   {self.chat.switch_count}x, last gap {self.chat.last_switch_gap * 1000:.0f}ms"
+                )
+        return self._overlay_lines
+
+    def _periodic_metrics_dump(self):
+        now = time.time()
+        if now - self._last_metrics_dump < METRICS_DUMP_INTERVAL:
+            return
+        self._last_metrics_dump = now
+        metrics = self._metrics()
+        for line in ChatLatency.format(metrics["chat_latency_ms"]):
+            metrics_log.info(f"[Metrics] {line}")
+        # File I/O off the render loop; the dump is a snapshot, so nothing to wait for
+        threading.Thread(target=self._write_metrics, args=(metrics,), daemon=True).start()
+
+    @staticmethod
+    def _write_metrics(metrics: dict):
+        try:
+            write_metrics(METRICS_PATH, metrics)
+        except OSError as e:
+            metrics_log.error(f"[Metrics] Could not write {METRICS_PATH}: {e}")
+
     def _broadcast_frame(self):
         self._frame_count += 1
         self.broadcaster.send_frame(self.screen, self._frame_count)
@@ -226,8 +331,11 @@ class MainGameController:
         self.sounds.stop_music()
         self.broadcaster.stop()
         self._stream_watcher.stop()
+        self._write_metrics(self._metrics())
         self.chat.stop()
+        self.otdb.stop()
         self.db.save_all()
         self.db.close()
+        self.bank.close()
         pygame.quit()
         print("[Game] Goodbye!")
@@ -1,18 +1,209 @@
 """
 The Lifelong Quiz - Database Layer
-SQLite persistence with in-memory write-back cache.
+SQLite persistence with a bounded in-memory write-back cache.
+
+Only recently active players live in memory (an LRU "hot set"); everyone
+else stays in SQLite and is loaded on demand by primary-key lookup. Dirty
+players are snapshotted into plain row tuples and handed to a PlayerWriter
+thread that owns its own connection and commits each flush as a single
+transaction. A player is only evicted once its last snapshot is committed.
+
+Leaderboard, rank and player counts come from a ScoreIndex over all players,
+which is built from a (username, score) scan on a background thread so
+startup does not depend on the lifetime player count. The same scan fills
+the set of known usernames, so looking up a viewer who has never played
+does not touch SQLite.
 """
 
+import logging
 import sqlite3
 import threading
+import queue
 import time
 import os
+from collections import OrderedDict
+
+from quiz.config import DB_PATH, DB_CACHE_SIZE
+from quiz.models import Player, PlayerSnapshot, PlayerStore
+from quiz.ranking import ScoreIndex
 
-from quiz.config import DB_PATH
-from quiz.models import Player
+log = logging.getLogger("quiz.db")
+flush_log = logging.getLogger("quiz.db.flush")
 
 BOT_PREFIX = "[Bot] "
 
+_UPSERT_SQL = """
+    INSERT OR REPLACE INTO players
+    (username, score, streak, best_streak, rank,
+     games_played, correct_answers, wrong_answers,
+     wrong_streak, participation_streak, last_participated, streak_shield,
+     last_seen)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_RESET_ALL_SQL = """
+    UPDATE players SET score = 0, streak = 0, best_streak = 0, rank = 'Bronze',
+        games_played = 0, correct_answers = 0, wrong_answers = 0,
+        wrong_streak = 0, participation_streak = 0, last_participated = 0,
+        streak_shield = 0
+"""
+
+_SET_META_SQL = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+
+def _player_fields(row: sqlite3.Row) -> dict:
+    """PlayerStore.add() keyword arguments for a `players` row."""
+    keys = row.keys()
+    return dict(
+        username=row["username"],
+        score=row["score"],
+        streak=row["streak"],
+        best_streak=row["best_streak"],
+        rank=row["rank"],
+        games_played=row["games_played"],
+        correct_answers=row["correct_answers"],
+        wrong_answers=row["wrong_answers"],
+        wrong_streak=row["wrong_streak"] if "wrong_streak" in keys else 0,
+        participation_streak=row["participation_streak"] if "participation_streak" in keys else 0,
+        last_participated=row["last_participated"] if "last_participated" in keys else 0,
+        streak_shield=bool(row["streak_shield"]) if "streak_shield" in keys else False,
+        last_seen=row["last_seen"],
+    )
+
+
+class PlayerWriter:
+    """
+    Write-behind thread for the players table.
+    Owns a dedicated SQLite connection; the game thread only enqueues
+    row snapshots, deletes and bulk statements, which are applied in order,
+    one transaction per flush.
+
+    Every submission gets a sequence number; committed_seq tells the cache
+    which submissions are durable (and therefore which players may be evicted).
+    A flush that fails is rolled back and retried, ahead of anything newer,
+    so committed_seq never passes a submission that was not written.
+    """
+
+    def __init__(self, db_path: str):
+        self._db_path = db_path
+        self._queue = queue.Queue()
+        self._thread = None
+        self._submitted_seq = 0
+        self.committed_seq = 0
+
+        # Flush stats (written by the writer thread, read by anyone)
+        self.flush_count = 0
+        self.total_rows = 0
+        self.last_flush_rows = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _submit(self, kind: str, payload) -> int:
+        self._submitted_seq += 1
+        self._queue.put((self._submitted_seq, kind, payload))
+        return self._submitted_seq
+
+    def submit_rows(self, rows: list[tuple]) -> int:
+        return self._submit("upsert", rows)
+
+    def submit_delete(self, usernames: list[str]) -> int:
+        return self._submit("delete", list(usernames))
+
+    def submit_sql(self, sql: str, params: tuple = ()) -> int:
+        """Queue a bulk statement (e.g. an UPDATE over cold rows)."""
+        return self._submit("sql", (sql, params))
+
+    @property
+    def pending(self) -> int:
+        """Submissions not yet committed (queued, in flight or awaiting retry)."""
+        return self._submitted_seq - self.committed_seq
+
+    def _run(self):
+        conn = sqlite3.connect(self._db_path)
+        failed = []  # ops of a rolled-back flush, retried before newer ones
+        backoff = 0.0
+        try:
+            while True:
+                try:
+                    ops = [self._queue.get(timeout=backoff or None)]
+                except queue.Empty:
+                    ops = []  # retry time for the failed flush
+                # Coalesce everything that piled up while we were busy
+                while True:
+                    try:
+                        ops.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(op is None for op in ops)
+                batch = failed + [op for op in ops if op is not None]
+                if self._apply(conn, batch):
+                    failed, backoff = [], 0.0
+                elif stop:
+                    log.error(f"[DB] Giving up on {len(batch)} unsaved writes at shutdown")
+                else:
+                    failed, backoff = batch, min(max(backoff * 2, 1.0), 30.0)
+                    continue
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, ops: list) -> bool:
+        """Write ops in one transaction; False (nothing written) if it failed."""
+        if not ops:
+            return True
+        start = time.perf_counter()
+        rows_written = 0
+        try:
+            with conn:  # one transaction for the whole flush
+                for _, kind, payload in ops:
+                    if kind == "upsert":
+                        conn.executemany(_UPSERT_SQL, payload)
+                        rows_written += len(payload)
+                    elif kind == "delete":
+                        placeholders = ",".join("?" * len(payload))
+                        conn.execute(
+                            f"DELETE FROM players WHERE username IN ({placeholders})",
+                            payload,
+                        )
+                        log.info(f"[DB] Removed {len(payload)} bot players from database")
+                    elif kind == "sql":
+                        conn.execute(*payload)
+        except Exception as e:
+            log.error(f"[DB] Save error (will retry {len(ops)} writes): {e}")
+            return False
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.committed_seq = ops[-1][0]
+        self.flush_count += 1
+        self.total_rows += rows_written
+        self.last_flush_rows = rows_written
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        if rows_written:
+            flush_log.info(f"[DB] Saved {rows_written} players in {elapsed_ms:.1f}ms")
+        return True
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until everything submitted so far is committed; False if it wasn't within timeout."""
+        target = self._submitted_seq
+        deadline = time.monotonic() + timeout
+        while self.committed_seq < target:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
 
 class QuizDatabase:
     def __init__(self, db_path=DB_PATH):
@@ -32,15 +223,38 @@ class QuizDatabase:
             self._create_tables()
         except sqlite3.DatabaseError:
             backup = db_path + ".bak"
-            print(f"[DB] Database corrupted, backing up to {backup}")
+            log.warning(f"[DB] Database corrupted, backing up to {backup}")
             if os.path.exists(db_path):
                 os.rename(db_path, backup)
             self._conn = sqlite3.connect(db_path, check_same_thread=False)
             self._conn.row_factory = sqlite3.Row
             self._create_tables()
 
-        self._players: dict[str, Player] = {}
-        self._load_all()
+        # Hot set: rows live in a struct-of-arrays store; username -> Player view, LRU first
+        self._store = PlayerStore()
+        self._store.score_listener = self._on_score_change
+        self._store.participation_epoch = self._load_participation_epoch()
+        self._players: OrderedDict[str, Player] = OrderedDict()
+        self._capacity = DB_CACHE_SIZE
+        # username -> writer seq of its last upsert/delete (pending durability)
+        self._flush_seq: dict[str, int] = {}
+        # (writer seq, fn(store, row)) bulk updates still in flight; applied to rows loaded meanwhile
+        self._bulk_ops: list[tuple[int, object]] = []
+        self._created: set[str] = set()  # players first seen this session (no row at startup)
+
+        # Score index over all players, built in the background
+        self._score_index: ScoreIndex | None = None
+        self._index_overlay: dict[str, int | None] = {}  # changes made while loading
+        self._index_load_result = None
+        self._index_reset_pending = False
+        self._usernames: set[str] | None = None  # every player on disk or in memory, once indexed
+        # Running player counts (valid once the index is installed)
+        self._player_total = 0
+        self._real_player_total = 0
+
+        self._writer = PlayerWriter(db_path)
+        self._writer.start()
+        threading.Thread(target=self._index_loader, daemon=True).start()
 
     def _create_tables(self):
         self._conn.execute("""
@@ -62,125 +276,376 @@ class QuizDatabase:
             ("wrong_streak", "INTEGER DEFAULT 0"),
             ("participation_streak", "INTEGER DEFAULT 0"),
             ("streak_shield", "INTEGER DEFAULT 0"),
+            ("last_participated", "INTEGER DEFAULT 0"),
         ]:
             try:
                 self._conn.execute(f"ALTER TABLE players ADD COLUMN {col} {typedef}")
+                if col == "last_participated":
+                    # Streaks saved before epochs existed belong to epoch 1
+                    self._conn.execute(
+                        "UPDATE players SET last_participated = 1 WHERE participation_streak > 0"
+                    )
                 self._conn.commit()
             except sqlite3.OperationalError:
                 pass  # Column already exists
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key   TEXT PRIMARY KEY,
+                value INTEGER
+            )
+        """)
+        # WAL lets the writer thread commit without blocking readers
+        self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_players_score
             ON players(score DESC)
         """)
         self._conn.commit()
 
-    def _load_all(self):
-        cursor = self._conn.execute("SELECT * FROM players")
-        for row in cursor:
-            p = Player(
-                username=row["username"],
-                score=row["score"],
-                streak=row["streak"],
-                best_streak=row["best_streak"],
-                rank=row["rank"],
-                games_played=row["games_played"],
-                correct_answers=row["correct_answers"],
-                wrong_answers=row["wrong_answers"],
-                wrong_streak=row["wrong_streak"] if "wrong_streak" in row.keys() else 0,
-                participation_streak=row["participation_streak"] if "participation_streak" in row.keys() else 0,
-                streak_shield=bool(row["streak_shield"]) if "streak_shield" in row.keys() else False,
-                last_seen=row["last_seen"],
-            )
-            self._players[p.username] = p
-        print(f"[DB] Loaded {len(self._players)} players from database")
+    # ------------------------------------------
+    # SCORE INDEX
+    # ------------------------------------------
+    def _index_loader(self):
+        """Background: scan (username, score) for every player and build the index."""
+        start = time.perf_counter()
+        try:
+            conn = sqlite3.connect(self._db_path)
+            try:
+                scores = dict(conn.execute("SELECT username, score FROM players"))
+            finally:
+                conn.close()
+            index = ScoreIndex(scores.items())
+            real = sum(1 for u in scores if not u.startswith(BOT_PREFIX))
+        except Exception as e:
+            log.error(f"[DB] Index load error: {e}")
+            scores, index, real = {}, ScoreIndex(), 0
+        self._index_load_result = (scores, index, real)
+        log.info(f"[DB] Indexed {len(index)} players in {time.perf_counter() - start:.2f}s")
+
+    def _poll_index(self) -> bool:
+        """Install the background-built index once ready (game thread). Returns True if ready."""
+        if self._score_index is not None:
+            return True
+        result = self._index_load_result
+        if result is None:
+            return False
+        scores, index, real = result
+        if self._index_reset_pending:
+            scores = dict.fromkeys(scores, 0)
+            index = ScoreIndex(scores.items())
+            self._index_reset_pending = False
+        self._score_index = index
+        self._usernames = set(scores)
+        self._player_total = len(index)
+        self._real_player_total = real
+        self._index_load_result = None
+        # Replay changes that happened after (or raced with) the scan
+        overlay = self._index_overlay
+        self._index_overlay = {}
+        for username, score in overlay.items():
+            self._index_set(username, scores.get(username), score)
+        return True
+
+    def _index_set(self, username: str, old_score: int | None, new_score: int | None):
+        """Record a score change (None = absent) in the index or the pending overlay."""
+        if not self._poll_index():
+            self._index_overlay[username] = new_score
+            return
+        if old_score is not None:
+            self._score_index.remove(username, old_score)
+        if new_score is not None:
+            self._score_index.add(username, new_score)
+        if (old_score is None) != (new_score is None):
+            if old_score is None:
+                self._usernames.add(username)
+            else:
+                self._usernames.discard(username)
+            delta = 1 if old_score is None else -1
+            self._player_total += delta
+            if not username.startswith(BOT_PREFIX):
+                self._real_player_total += delta
+
+    def _on_score_change(self, player: Player, old_score: int):
+        self._index_set(player.username, old_score, player.score)
+
+    # ------------------------------------------
+    # HOT SET
+    # ------------------------------------------
+    def _pending_delete(self, username: str) -> bool:
+        """True if a not-yet-committed delete hides this (cold) username's row."""
+        return self._flush_seq.get(username, 0) > self._writer.committed_seq
+
+    def _may_exist(self, username: str) -> bool:
+        """False if this (cold) username certainly has no row, so a SELECT can be skipped."""
+        if self._pending_delete(username):
+            return False
+        return not self._poll_index() or username in self._usernames
+
+    def _load_player(self, username: str) -> Player | None:
+        if not self._may_exist(username):
+            return None
+        # Read before the SELECT: a bulk update committing in between must still be applied
+        committed = self._writer.committed_seq
+        row = self._conn.execute(
+            "SELECT * FROM players WHERE username = ?", (username,),
+        ).fetchone()
+        if row is None:
+            return None
+        p = self._store.add(**_player_fields(row))
+        self._bulk_ops = [(seq, fn) for seq, fn in self._bulk_ops if seq > committed]
+        for _, fn in self._bulk_ops:
+            fn(self._store, p.row)  # row predates a queued bulk update
+        self._players[username] = p
+        return p
+
+    def _evict_cold(self):
+        """Drop least recently used players whose latest state is committed."""
+        excess = len(self._players) - self._capacity
+        if excess <= 0:
+            return
+        committed = self._writer.committed_seq
+        victims = []
+        for username in self._players:
+            if len(victims) >= excess:
+                break
+            if username in self._dirty or self._flush_seq.get(username, 0) > committed:
+                continue
+            victims.append(username)
+        for username in victims:
+            del self._players[username]
+            self._store.remove(username)
+            self._flush_seq.pop(username, None)
+
+    def get_player(self, username: str) -> Player | None:
+        """Return an existing player (loading it if cold), or None."""
+        p = self._players.get(username)
+        if p is not None:
+            self._players.move_to_end(username)
+            return p
+        return self._load_player(username)
+
+    def has_player(self, username: str) -> bool:
+        if username in self._players:
+            return True
+        if not self._may_exist(username):
+            return False
+        if self._usernames is not None:
+            return True
+        return self._conn.execute(
+            "SELECT 1 FROM players WHERE username = ?", (username,),
+        ).fetchone() is not None
 
     def get_or_create_player(self, username: str) -> Player:
-        if username not in self._players:
-            self._players[username] = Player(username=username)
-            self._dirty.add(username)
-        return self._players[username]
+        p = self.get_player(username)
+        if p is None:
+            p = self._create_player(username)
+        return p
+
+    def _create_player(self, username: str) -> Player:
+        p = self._store.add(username)
+        self._players[username] = p
+        self._index_set(username, None, p.score)
+        self._dirty.add(username)
+        self._created.add(username)
+        return p
+
+    def is_new_player(self, username: str) -> bool:
+        """True if the player was created this session (had no row when the game started)."""
+        return username in self._created
+
+    def get_or_create_players(self, usernames: list[str]) -> list[Player]:
+        """Players for many usernames at once: cold ones are loaded in bulk (one query per 500), missing ones created."""
+        cold = [u for u in usernames if u not in self._players]
+        if cold:
+            self._load_players(cold)
+        players = []
+        for username in usernames:
+            p = self._players.get(username)
+            if p is None:
+                p = self._create_player(username)
+            else:
+                self._players.move_to_end(username)
+            players.append(p)
+        return players
+
+    def get_or_create_rows(self, usernames: list[str]) -> list[int]:
+        """Store rows for many players at once; cold ones are loaded in bulk."""
+        return [p.row for p in self.get_or_create_players(usernames)]
+
+    def _load_players(self, usernames: list[str]):
+        committed = self._writer.committed_seq
+        names = [u for u in usernames if self._may_exist(u)]
+        self._bulk_ops = [(seq, fn) for seq, fn in self._bulk_ops if seq > committed]
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self._conn.execute(
+                f"SELECT * FROM players WHERE username IN ({placeholders})", chunk,
+            ).fetchall():
+                p = self._store.add(**_player_fields(row))
+                for _, fn in self._bulk_ops:
+                    fn(self._store, p.row)
+                self._players[p.username] = p
+
+    @property
+    def store(self) -> PlayerStore:
+        """Column store of the hot set (for batch scoring; rows are stable until save_all)."""
+        return self._store
+
+    def scores_changed(self, usernames: list[str], old_scores: list[int], new_scores: list[int]):
+        """Bulk counterpart of the per-player score listener, for column writes."""
+        if not self._poll_index():
+            for username, score in zip(usernames, new_scores):
+                self._index_overlay[username] = score
+            return
+        self._score_index.update_many(zip(usernames, old_scores, new_scores))
 
     def mark_dirty(self, username: str):
         self._dirty.add(username)
 
-    def get_top_players(self, n: int = 10) -> list[Player]:
-        sorted_players = sorted(
-            self._players.values(),
-            key=lambda p: p.score,
-            reverse=True,
-        )
-        return sorted_players[:n]
+    def mark_dirty_many(self, usernames):
+        self._dirty.update(usernames)
+
+    # ------------------------------------------
+    # QUERIES
+    # ------------------------------------------
+    def get_top_players(self, n: int = 10) -> list[PlayerSnapshot]:
+        if self._poll_index():
+            top = [self.get_player(u) for u, _ in self._score_index.top(n)]
+            return [p.snapshot() for p in top if p is not None]
+        # Index still warming up: flushed order from SQLite, patched with live changes
+        names = {
+            row[0] for row in self._conn.execute(
+                "SELECT username FROM players ORDER BY score DESC LIMIT ?", (n,),
+            )
+        }
+        names.update(u for u, s in self._index_overlay.items() if s is not None)
+        players = [p for p in map(self.get_player, names) if p is not None]
+        players.sort(key=lambda p: (-p.score, p.username))
+        return [p.snapshot() for p in players[:n]]
+
+    def get_player_rank(self, username: str) -> tuple[int, int]:
+        """Returns (1-based leaderboard position, total players); position 0 if unknown."""
+        if not self._poll_index():
+            return 0, len(self._players)
+        p = self._players.get(username)
+        if p is None:
+            return 0, self._player_total
+        return self._score_index.rank(username, p.score), self._player_total
 
     def get_player_count(self, exclude_bots: bool = False) -> int:
+        """O(1): served from running counters maintained on create/remove."""
+        if not self._poll_index():
+            return len(self._players)  # warming up: hot set only
         if exclude_bots:
-            return sum(1 for u in self._players if not u.startswith(BOT_PREFIX))
-        return len(self._players)
+            return self._real_player_total
+        return self._player_total
 
+    # ------------------------------------------
+    # MUTATIONS
+    # ------------------------------------------
     def remove_players(self, usernames: list[str]):
         """Remove specific players from cache and database (used to clean up bot data)."""
         removed = []
         for name in usernames:
-            if name in self._players:
+            p = self.get_player(name)
+            if p is not None:
                 del self._players[name]
+                self._index_set(name, p.score, None)
+                self._store.remove(name)
+                self._created.discard(name)
                 removed.append(name)
         self._dirty -= set(usernames)
         if removed:
-            placeholders = ",".join("?" * len(removed))
-            self._conn.execute(
-                f"DELETE FROM players WHERE username IN ({placeholders})",
-                removed,
-            )
-            self._conn.commit()
-            print(f"[DB] Removed {len(removed)} bot players from database")
+            seq = self._writer.submit_delete(removed)
+            for name in removed:
+                self._flush_seq[name] = seq
 
     def reset_player(self, username: str):
-        if username in self._players:
-            self._players[username].reset()
+        player = self.get_player(username)
+        if player is not None:
+            player.reset()
             self._dirty.add(username)
 
+    # ------------------------------------------
+    # PARTICIPATION EPOCHS
+    # ------------------------------------------
+    def _load_participation_epoch(self) -> int:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'participation_epoch'"
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        # First start with epochs: continue from the newest stamp on disk
+        return self._conn.execute(
+            "SELECT COALESCE(MAX(last_participated), 0) FROM players"
+        ).fetchone()[0]
+
+    def advance_participation_epoch(self) -> int:
+        """
+        Start counting a new round. Streaks not extended in the new epoch
+        lapse lazily (see PlayerStore), so this is O(1) regardless of players.
+        """
+        epoch = self._store.participation_epoch + 1
+        self._store.participation_epoch = epoch
+        self._writer.submit_sql(_SET_META_SQL, ("participation_epoch", epoch))
+        return epoch
+
     def reset_all_players(self):
-        """Reset scores/stats for all players."""
-        count = 0
-        for player in self._players.values():
-            player.reset()
-            self._dirty.add(player.username)
-            count += 1
-        print(f"[DB] Reset all {count} players")
+        """Reset scores/stats for all players (hot set in memory, cold rows in SQLite)."""
+        for username, player in self._players.items():
+            self._store.reset_row(player.row)  # no per-player index updates; rebuilt below
+            self._dirty.add(username)
+        seq = self._writer.submit_sql(_RESET_ALL_SQL)
+        self._bulk_ops.append((seq, PlayerStore.reset_row))
+        if self._poll_index():
+            index = self._score_index
+            self._score_index = ScoreIndex((u, 0) for u, _ in index.top(len(index)))
+            count = len(self._score_index)
+        else:
+            # The background scan may predate the reset: zero it on install
+            self._index_reset_pending = True
+            self._index_overlay = {
+                u: None if s is None else 0 for u, s in self._index_overlay.items()
+            }
+            self._index_overlay.update(dict.fromkeys(self._players, 0))
+            count = len(self._players)
+        log.info(f"[DB] Reset all {count} players")
         return count
 
+    # ------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------
     def save_all(self):
+        """Snapshot dirty players and queue them for the writer thread (no disk I/O here)."""
         if not self._dirty:
+            self._evict_cold()
             return
         with self._lock:
             to_save = list(self._dirty)
             self._dirty.clear()
-        try:
-            data = []
-            for uname in to_save:
-                p = self._players.get(uname)
-                if p:
-                    data.append((
-                        p.username, p.score, p.streak, p.best_streak,
-                        p.rank, p.games_played, p.correct_answers,
-                        p.wrong_answers, p.wrong_streak,
-                        p.participation_streak, int(p.streak_shield),
-                        p.last_seen,
-                    ))
-            if data:
-                self._conn.executemany("""
-                    INSERT OR REPLACE INTO players
-                    (username, score, streak, best_streak, rank,
-                     games_played, correct_answers, wrong_answers,
-                     wrong_streak, participation_streak, streak_shield,
-                     last_seen)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, data)
-                self._conn.commit()
-                print(f"[DB] Saved {len(data)} players")
-        except Exception as e:
-            print(f"[DB] Save error: {e}")
+        saved = [u for u in to_save if u in self._players]
+        if saved:
+            data = self._store.snapshot_rows([self._players[u].row for u in saved])
+            seq = self._writer.submit_rows(data)
+            for uname in saved:
+                self._flush_seq[uname] = seq
+        self._evict_cold()
+
+    @property
+    def flush_stats(self) -> dict:
+        w = self._writer
+        return {
+            "flushes": w.flush_count,
+            "total_rows": w.total_rows,
+            "last_rows": w.last_flush_rows,
+            "last_ms": w.last_flush_ms,
+            "max_ms": w.max_flush_ms,
+            "pending": w.pending,
+        }
 
     def close(self):
         self.save_all()
+        self._writer.close()
         self._conn.close()
-        print("[DB] Database closed")
+        log.info("[DB] Database closed")
@@ -6,6 +6,11 @@ Usage:
     python -m quiz.game --offline        # Offline mode with fake chat bots
     python -m quiz.game VIDEO_ID         # Connects to a specific YouTube livestream
 
+    # Local chat sources for repeatable load tests (no YouTube needed):
+    python -m quiz.game --chat-source tcp --chat-port 6667
+    python -m quiz.game --chat-source replay --replay data/chat_logs --replay-speed 20
+    python -m quiz.game VIDEO_ID --record-chat   # capture live chat for later replay
+
 The script will:
 1. Use an explicit VIDEO_ID argument if provided
 2. Otherwise use VIDEO_ID from quiz/config.py if set
@@ -20,31 +25,66 @@ Controls:
     Host: ESC to quit, F1 to skip current phase, F2 to toggle streaming
 """
 
-import sys
+import argparse
+
+from quiz.config import CHAT_TCP_HOST, CHAT_TCP_PORT, CHAT_REPLAY_SPEED, CHAT_RECORD
+from quiz.chat_sources import SOURCE_KINDS, make_chat_source
 from quiz.controller import MainGameController
+from quiz.log import setup_logging, shutdown_logging
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(prog="python -m quiz.game", description="The Lifelong Quiz")
+    parser.add_argument("video_id", nargs="?", default="", help="YouTube livestream video ID")
+    parser.add_argument("--offline", action="store_true", help="fake chat bots + filler bots")
+    parser.add_argument("--chat-source", choices=SOURCE_KINDS, default=None,
+                        help="where chat comes from (default: youtube, or fake with --offline)")
+    parser.add_argument("--chat-host", default=CHAT_TCP_HOST, help="tcp source: address to listen on")
+    parser.add_argument("--chat-port", type=int, default=CHAT_TCP_PORT, help="tcp source: port to listen on")
+    parser.add_argument("--replay", default="", help="replay source: recorded chat JSONL file")
+    parser.add_argument("--replay-speed", type=float, default=CHAT_REPLAY_SPEED,
+                        help="replay source: playback speed, 1-100x")
+    parser.add_argument("--replay-loop", action="store_true", help="replay source: start over at the end")
+    parser.add_argument("--record-chat", action="store_true", default=CHAT_RECORD,
+                        help="record all chat to compressed JSONL in CHAT_RECORD_DIR")
+    args = parser.parse_args()
+    if args.chat_source == "replay" and not args.replay:
+        parser.error("--chat-source replay needs --replay FILE")
+    if not 1.0 <= args.replay_speed <= 100.0:
+        parser.error("--replay-speed must be between 1 and 100")
+    return args
 
 
 def main():
-    video_id = ""
-    offline = "--offline" in sys.argv
-    if offline:
-        sys.argv.remove("--offline")
+    args = _parse_args()
+    setup_logging()
+    video_id = args.video_id
+    offline = args.offline
+
+    chat_source = None
+    if args.chat_source:
+        chat_source = make_chat_source(
+            args.chat_source, offline=offline, host=args.chat_host, port=args.chat_port,
+            replay_path=args.replay, speed=args.replay_speed, loop=args.replay_loop,
+        )
+        print(f"[Quiz] Chat source: {chat_source.describe()}")
 
-    if len(sys.argv) > 1:
-        video_id = sys.argv[1]
+    if video_id:
         print(f"[Quiz] Using provided video ID: {video_id}")
     elif offline:
         print("[Quiz] Offline mode - fake chat bots + filler bots active")
-    else:
+    elif chat_source is None or chat_source.follows_streams:
         print("[Quiz] No video ID argument - will auto-detect from configured channels")
 
-    controller = MainGameController(video_id, offline=offline)
+    controller = MainGameController(video_id, offline=offline, chat_source=chat_source,
+                                    record_chat=args.record_chat)
     try:
         controller.run()
     except KeyboardInterrupt:
         pass
     finally:
         controller.shutdown()
+        shutdown_logging()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+"""
+The Lifelong Quiz - Logging
+Non-blocking log setup for the game.
+
+Every "quiz.*" logger feeds one bounded queue; a QueueListener thread does
+the actual console and rotating-file writes, so the chat thread and the
+render loop only ever enqueue a record (and drop it if the queue is full,
+rather than block on a slow console). Noisy categories are thinned at the
+source: SampleFilter keeps 1 in N records, RateLimitFilter caps records per
+second and notes how many were suppressed.
+
+Child processes (the chat ingestor) log through a multiprocessing queue
+that a second listener in the game process drains into the same handlers.
+"""
+
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+from quiz.config import (
+    LOG_LEVEL, LOG_FILE, LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS, LOG_QUEUE_SIZE,
+    LOG_SAMPLING, LOG_RATE_LIMITS,
+)
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: "_DroppingQueueHandler | None" = None
+_process_queue = None
+_process_listener: logging.handlers.QueueListener | None = None
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves this process, so skip the base class's eager
+        # format: %-style args are rendered on the listener thread instead
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SampleFilter(logging.Filter):
+    """Keep 1 in every `every` records (the first one included)."""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._count = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        keep = self._count % self.every == 0
+        self._count += 1
+        return keep
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket: at most `per_second` records per second, bursts of one second's worth."""
+
+    def __init__(self, per_second: float):
+        super().__init__()
+        self.per_second = per_second
+        self._tokens = per_second
+        self._stamp = time.monotonic()
+        self._suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.per_second, self._tokens + (now - self._stamp) * self.per_second)
+        self._stamp = now
+        if self._tokens < 1:
+            self._suppressed += 1
+            return False
+        self._tokens -= 1
+        if self._suppressed:
+            record.msg = f"{record.getMessage()} (+{self._suppressed} suppressed)"
+            record.args = None
+            self._suppressed = 0
+        return True
+
+
+def setup_logging(level: str = LOG_LEVEL, log_file: str | None = LOG_FILE,
+                  console: bool = True):
+    """Route "quiz.*" loggers through the background queue. Safe to call twice."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    handlers = []
+    if console:
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(stream)
+    if log_file:
+        log_dir = os.path.dirname(log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        rotating = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS,
+            encoding="utf-8",
+        )
+        rotating.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)-7s %(threadName)s %(message)s",
+        ))
+        handlers.append(rotating)
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _queue_handler = _DroppingQueueHandler(log_queue)
+    root = logging.getLogger("quiz")
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    root.propagate = False
+
+    _install_filters()
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _install_filters():
+    for name in set(LOG_SAMPLING) | set(LOG_RATE_LIMITS):
+        logger = logging.getLogger(name)
+        for f in list(logger.filters):
+            if isinstance(f, (SampleFilter, RateLimitFilter)):
+                logger.removeFilter(f)
+    for name, every in LOG_SAMPLING.items():
+        logging.getLogger(name).addFilter(SampleFilter(every))
+    for name, per_second in LOG_RATE_LIMITS.items():
+        logging.getLogger(name).addFilter(RateLimitFilter(per_second))
+
+
+def process_log_queue():
+    """
+    Queue for a child process's log records (pass it to setup_child_logging
+    in the child). None if logging isn't set up; the child then logs to stdout.
+    """
+    global _process_queue, _process_listener
+    if _listener is None:
+        return None
+    if _process_queue is None:
+        _process_queue = multiprocessing.get_context("spawn").Queue()
+        _process_listener = logging.handlers.QueueListener(
+            _process_queue, *_listener.handlers, respect_handler_level=True,
+        )
+        _process_listener.start()
+    return _process_queue
+
+
+def setup_child_logging(log_queue, level: str = LOG_LEVEL):
+    """Configure "quiz.*" logging inside a child process. Sampling happens here, before pickling."""
+    global _listener, _queue_handler
+    root = logging.getLogger("quiz")
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if log_queue is None:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+    else:
+        handler = logging.handlers.QueueHandler(log_queue)
+    root.addHandler(handler)
+    root.setLevel(level)
+    root.propagate = False
+    _install_filters()
+    # Nothing to stop in the child; the game process owns the writer threads
+    _listener = None
+    _queue_handler = None
+
+
+def shutdown_logging():
+    """Flush everything still queued and stop the background writer(s)."""
+    global _listener, _queue_handler, _process_queue, _process_listener
+    if _process_listener is not None:
+        _process_listener.stop()
+        _process_queue.close()
+        _process_listener = None
+        _process_queue = None
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger("quiz").removeHandler(_queue_handler)
+    if _queue_handler.dropped:
+        print(f"[Log] Dropped {_queue_handler.dropped} log records (queue full)")
+    _listener = None
+    _queue_handler = None
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
@@ -3,15 +3,11 @@ The Lifelong Quiz - Game Logic
 State machine, question fetching, scoring, theme voting, addictive mechanics.
 """
 
+import logging
 import time
-import html
 import random
-import threading
 
-try:
-    import requests
-except ImportError:
-    requests = None
+import numpy as np
 
 from quiz.config import (
     QUESTION_DISPLAY_TIME, REVEAL_DISPLAY_TIME, LEADERBOARD_DISPLAY_TIME,
@@ -19,8 +15,7 @@ from quiz.config import (
     BASE_POINTS, SPEED_BONUS_TIER1_THRESHOLD, SPEED_BONUS_TIER2_THRESHOLD,
     SPEED_BONUS_TIER1_MULT, SPEED_BONUS_TIER2_MULT,
     STREAK_BONUS_PER, MAX_STREAK_MULT,
-    OTDB_BASE_URL, OTDB_TOKEN_URL, OTDB_BATCH_SIZE,
-    OTDB_MIN_CACHE, OTDB_REQUEST_COOLDOWN, OTDB_SEEN_EXPIRY,
+    OTDB_MIN_CACHE,
     VOTABLE_CATEGORIES,
     DOUBLE_POINTS_CHANCE, DOUBLE_POINTS_MULT,
     COMEBACK_BONUS, COMEBACK_STREAK_THRESHOLD,
@@ -32,12 +27,18 @@ from quiz.config import (
     LIGHTNING_ROUND_CHANCE, JACKPOT_CHANCE, FIRST_BLOOD_CHANCE,
     LIGHTNING_TIME, LIGHTNING_MULT, JACKPOT_BONUS, FIRST_BLOOD_BONUS,
     PARTICIPATION_MILESTONES, PARTICIPATION_BONUS, STREAK_SHIELD_THRESHOLD,
-    COMMAND_COOLDOWN,
+    COMMAND_COOLDOWN, RANK_THRESHOLDS, BATCH_RESOLVE_THRESHOLD,
 )
 from quiz.models import (
-    GameState, Player, Question, RoundResult, ThemeVoteState, GameEvent,
+    GameState, Player, PlayerSnapshot, Question, RoundResult, ThemeVoteState, GameEvent,
+    ChatMessage, RANK_NAMES, CHAT_COMMANDS, parse_answer,
 )
 from quiz.db import QuizDatabase
+from quiz.question_bank import QuestionBank
+from quiz.otdb import OTDBClient
+
+log = logging.getLogger("quiz.game")
+answer_log = logging.getLogger("quiz.game.answers")
 
 
 # Hardcoded fallback questions if API is unavailable (80+ across many categories)
@@ -152,6 +153,7 @@ del _q  # clean up helper from module namespace
 
 
 BOT_PREFIX = "[Bot] "
+_RANK_FLOORS = np.array([threshold for threshold, _ in RANK_THRESHOLDS], dtype=np.int64)
 BOT_PROFILES = [
     "[Bot] Rookie",
     "[Bot] Scholar",
@@ -161,7 +163,8 @@ BOT_PROFILES = [
 
 
 class QuizLogic:
-    def __init__(self, db: QuizDatabase):
+    def __init__(self, db: QuizDatabase, bank: QuestionBank | None = None,
+                 otdb: OTDBClient | None = None):
         self.db = db
         self.state = GameState.WAITING
         self.state_timer = 0.0
@@ -172,18 +175,19 @@ class QuizLogic:
         self._prev_state = GameState.WAITING
         self._prev_state_end_time = 0.0
 
-        # Questions
-        self._question_cache: list[Question] = []
-        self._session_token = ""
-        self._last_fetch_time = 0.0
-        self._fetch_in_progress = False
+        # Questions (banked on disk; _bank_available = unseen in current category)
+        self._bank = bank if bank is not None else QuestionBank()
+        self._bank_available = 0
+        self._otdb = otdb if otdb is not None else OTDBClient()
         self._current_category_id = None
         self._fallback_idx = 0
-        self._seen_questions: dict[str, float] = {}  # question_text -> timestamp
 
         # Current round
         self.current_question: Question | None = None
         self.current_answers: dict[str, tuple[int, float]] = {}
+        # Running per-round counters (kept in sync by _set_answer/_drop_answer)
+        self._real_answer_count = 0
+        self._bot_answers: list[str] = []  # bots that answered this round (at most len(BOT_PROFILES))
         self.question_start_time = 0.0
 
         # Results
@@ -195,7 +199,7 @@ class QuizLogic:
         self.vote_state: ThemeVoteState | None = None
 
         # Leaderboard cache & position change tracking
-        self._leaderboard: list[Player] = []
+        self._leaderboard: list[PlayerSnapshot] = []
         self._prev_positions: dict[str, int] = {}  # username -> 1-indexed position
         self.leaderboard_changes: list[dict] = []   # [{username, old_pos, new_pos}]
 
@@ -206,18 +210,19 @@ class QuizLogic:
         self.sound_queue: list[str] = []  # sound names to play this frame
         self.competition_alert = ""  # close race message
         self.new_players_this_round: list[str] = []
-        self._known_players: set[str] = set(db._players.keys())
         self._command_cooldowns: dict[str, float] = {}  # username -> last command time
+        self._welcomed: set[str] = set()  # new players already greeted this session
         self._participants_this_round: set[str] = set()  # tracks who answered this round
 
         # Filler bots
         self._scheduled_bots: list[tuple[str, int, float]] = []  # (name, choice, answer_time)
-        self._last_round_real_players: set[str] = set()  # who played last round
+        self._last_round_real_count = 0  # real players who answered last round
         self._active_bot_names: list[str] = []  # bots currently in play (random subset)
         self._bots_active = False
 
-        # Kick off token fetch + pre-fill cache
-        self._fetch_session_token()
+        # Kick off token fetch + top up the bank
+        self._bank_available = self._bank.available(self._current_category_id)
+        self._otdb.start()
         self._ensure_cache()
 
     # ------------------------------------------
@@ -233,136 +238,57 @@ class QuizLogic:
         alive = [e for e in self.event_feed if now - e.timestamp < CHAT_FEED_DURATION]
         return alive[-CHAT_FEED_MAX:]
 
-    # ------------------------------------------
-    # SESSION TOKEN
-    # ------------------------------------------
-    def _fetch_session_token(self):
-        if not requests:
-            return
-        try:
-            resp = requests.get(
-                OTDB_TOKEN_URL, params={"command": "request"}, timeout=10,
-            )
-            data = resp.json()
-            if data.get("response_code") == 0:
-                self._session_token = data["token"]
-                print("[OTDB] Got session token")
-        except Exception as e:
-            print(f"[OTDB] Token fetch error: {e}")
-
-    def _reset_session_token(self):
-        if not requests or not self._session_token:
-            return
-        try:
-            resp = requests.get(
-                OTDB_TOKEN_URL,
-                params={"command": "reset", "token": self._session_token},
-                timeout=10,
-            )
-            if resp.json().get("response_code") == 0:
-                print("[OTDB] Session token reset")
-        except Exception as e:
-            print(f"[OTDB] Token reset error: {e}")
-
     # ------------------------------------------
     # QUESTION FETCHING
     # ------------------------------------------
     def _ensure_cache(self):
-        if len(self._question_cache) >= OTDB_MIN_CACHE:
-            return
-        if self._fetch_in_progress:
+        """Ask the OTDB client for questions; it dedupes, prioritizes and paces requests."""
+        if self._bank_available < OTDB_MIN_CACHE:
+            self._otdb.request(self._current_category_id, self._on_questions, urgent=True)
+
+    def _prefetch(self, category_ids: list[int]):
+        """Speculatively warm the bank for theme-vote options (served after urgent fetches)."""
+        for cid in category_ids:
+            if self._otdb.request(cid, self._on_questions, urgent=False):
+                log.info(f"[OTDB] Prefetching {VOTABLE_CATEGORIES.get(cid, cid)} for the vote")
+
+    def _on_questions(self, category_id, questions: list[Question]):
+        """OTDB client callback (scheduler thread)."""
+        if not questions:
             return
-        if time.time() - self._last_fetch_time < OTDB_REQUEST_COOLDOWN:
-            return
-        self._fetch_in_progress = True
-        threading.Thread(target=self._fetch_worker, daemon=True).start()
-
-    def _fetch_worker(self):
-        cat_at_fetch = self._current_category_id
-        try:
-            questions = self._fetch_questions(cat_at_fetch)
-            if questions:
-                # Only add if category hasn't changed while we were fetching
-                if self._current_category_id == cat_at_fetch:
-                    # Filter out recently seen questions
-                    self._purge_seen()
-                    fresh = [q for q in questions if self._hash_question(q) not in self._seen_questions]
-                    if len(fresh) < len(questions):
-                        print(f"[OTDB] Filtered {len(questions) - len(fresh)} duplicate(s)")
-                    self._question_cache.extend(fresh)
-                    random.shuffle(self._question_cache)
-                    print(f"[OTDB] Cached {len(fresh)} questions (total: {len(self._question_cache)}, seen: {len(self._seen_questions)})")
-                else:
-                    print(f"[OTDB] Discarded {len(questions)} questions (category changed during fetch)")
-        except Exception as e:
-            print(f"[OTDB] Fetch error: {e}")
-        finally:
-            self._last_fetch_time = time.time()
-            self._fetch_in_progress = False
-
-    def _fetch_questions(self, category_id=None) -> list[Question]:
-        if not requests:
-            return []
-        params = {"amount": OTDB_BATCH_SIZE, "type": "multiple"}
-        if category_id:
-            params["category"] = category_id
-        if self._session_token:
-            params["token"] = self._session_token
-
-        resp = requests.get(OTDB_BASE_URL, params=params, timeout=10)
-        data = resp.json()
-
-        if data.get("response_code") == 4:
-            self._reset_session_token()
-            if self._session_token:
-                params["token"] = self._session_token
-            resp = requests.get(OTDB_BASE_URL, params=params, timeout=10)
-            data = resp.json()
-
-        if data.get("response_code") != 0:
-            return []
-
-        questions = []
-        for item in data["results"]:
-            text = html.unescape(item["question"])
-            correct = html.unescape(item["correct_answer"])
-            incorrect = [html.unescape(a) for a in item["incorrect_answers"]]
-            options = incorrect + [correct]
-            random.shuffle(options)
-            correct_index = options.index(correct)
-            questions.append(Question(
-                text=text, correct_answer=correct, options=options,
-                correct_index=correct_index,
-                category=html.unescape(item["category"]),
-                difficulty=item["difficulty"],
-            ))
-        return questions
+        # Banked under the fetched category even if the vote moved on meanwhile
+        added = self._bank.add(questions, category_id)
+        if added < len(questions):
+            log.info(f"[OTDB] Skipped {len(questions) - added} already banked question(s)")
+        self._bank_available = self._bank.available(self._current_category_id)
+        log.info(f"[OTDB] Banked {added} questions (available: {self._bank_available})")
 
     @staticmethod
     def _hash_question(q: Question) -> str:
         return q.text
 
-    def _purge_seen(self):
-        now = time.time()
-        self._seen_questions = {
-            h: t for h, t in self._seen_questions.items()
-            if now - t < OTDB_SEEN_EXPIRY
-        }
-
     def _pop_question(self) -> Question:
-        if self._question_cache:
-            q = self._question_cache.pop(0)
-            self._seen_questions[self._hash_question(q)] = time.time()
+        cid = self._current_category_id
+        q = self._bank.take(cid)
+        if q is not None:
+            # Recounted on fetch and category change; no COUNT per question
+            self._bank_available = max(0, self._bank_available - 1)
             return q
-        # Fallback: pick a random unseen question from the pool
-        self._purge_seen()
+        self._bank_available = 0
+        if cid is not None:
+            q = self._bank.take(None)  # any category, still unseen
+        if q is None:
+            q = self._bank.take(cid, allow_seen=True)  # oldest repeat
+        if q is not None:
+            return q
+        # Fallback (empty bank, e.g. first ever start offline): random unseen question from the pool
         unseen = [q for q in FALLBACK_QUESTIONS
-                  if self._hash_question(q) not in self._seen_questions]
+                  if not self._bank.is_seen(self._hash_question(q))]
         if not unseen:
             # All seen recently — allow any and clear seen fallbacks
             unseen = list(FALLBACK_QUESTIONS)
         q = random.choice(unseen)
-        self._seen_questions[self._hash_question(q)] = time.time()
+        self._bank.mark_seen(self._hash_question(q))
         options = list(q.options)
         random.shuffle(options)
         correct_index = options.index(q.correct_answer)
@@ -447,18 +373,16 @@ class QuizLogic:
         # Track participation streaks from previous round
         self._update_participation_streaks()
 
-        # Snapshot real players from previous round (before clearing answers)
-        self._last_round_real_players = {
-            u for u in self.current_answers if not u.startswith(BOT_PREFIX)
-        }
+        # Snapshot real player count from previous round (before clearing answers)
+        self._last_round_real_count = self._real_answer_count
 
         self._ensure_cache()
         self.current_question = self._pop_question()
-        self.current_answers = {}
+        self._clear_answers()
         self._participants_this_round = set()
         self.question_start_time = time.time()
         cat_name = VOTABLE_CATEGORIES.get(self._current_category_id, "Any")
-        print(f"[Game] Question: category={self.current_question.category} (requested={cat_name}, cache={len(self._question_cache)})")
+        log.info(f"[Game] Question: category={self.current_question.category} (requested={cat_name}, banked={self._bank_available})")
         self.new_players_this_round = []
         self.sound_queue.append("new_question")
 
@@ -576,42 +500,45 @@ class QuizLogic:
         options = {i: (cid, name) for i, (cid, name) in enumerate(chosen, 1)}
         self.vote_state = ThemeVoteState(options=options)
 
+        # Warm the bank for every option during the vote window, so whichever
+        # wins is served instantly (losers' questions stay banked for later votes)
+        stock = {cid: self._bank.available(cid) for cid, _ in chosen}
+        self._prefetch(sorted(
+            (cid for cid, n in stock.items() if n < OTDB_MIN_CACHE), key=stock.get,
+        ))
+
     # ------------------------------------------
     # PARTICIPATION STREAKS
     # ------------------------------------------
     def _update_participation_streaks(self):
-        """Update participation streaks at the start of a new round (for previous round)."""
+        """
+        Update participation streaks at the start of a new round (for previous round).
+        Only participants are touched; everyone else's streak lapses lazily
+        because it was not stamped with the new epoch.
+        """
         if not self.current_answers:
             return
-        all_players = set(self.db._players.keys())
-        participated = {
-            u for u in self.current_answers if not u.startswith(BOT_PREFIX)
-        }
-        for username in participated:
-            player = self.db._players.get(username)
+        self.db.advance_participation_epoch()
+        for username in self.current_answers:
+            if username.startswith(BOT_PREFIX):
+                continue
+            player = self.db.get_player(username)
             if not player:
                 continue
-            player.participation_streak += 1
+            streak = player.record_participation()
             # Award streak shield when threshold reached
             if player.streak >= STREAK_SHIELD_THRESHOLD and not player.streak_shield:
                 player.streak_shield = True
             # Participation milestones
-            if player.participation_streak in PARTICIPATION_MILESTONES:
-                player.score += PARTICIPATION_BONUS
+            if streak in PARTICIPATION_MILESTONES:
+                player.add_score(PARTICIPATION_BONUS)
                 self._push_event(
-                    f"{username} played {player.participation_streak} rounds! +{PARTICIPATION_BONUS} pts",
+                    f"{username} played {streak} rounds! +{PARTICIPATION_BONUS} pts",
                     COLOR_AMBER, "PLAY",
                 )
                 self.sound_queue.append("streak")
             self.db.mark_dirty(username)
 
-        # Reset participation streak for players who didn't participate
-        for username in all_players - participated:
-            player = self.db._players.get(username)
-            if player and player.participation_streak > 0 and not username.startswith(BOT_PREFIX):
-                player.participation_streak = 0
-                self.db.mark_dirty(username)
-
     # ------------------------------------------
     # QUESTION RESOLUTION & SCORING
     # ------------------------------------------
@@ -623,6 +550,54 @@ class QuizLogic:
             )
 
         correct_idx = self.current_question.correct_index
+        if len(self.current_answers) >= BATCH_RESOLVE_THRESHOLD:
+            correct_players, wrong_players = self._score_answers_batch(correct_idx)
+        else:
+            correct_players, wrong_players = self._score_answers(correct_idx)
+
+        # Find fastest
+        fastest_player = ""
+        fastest_time = 0.0
+        if correct_players:
+            fastest = min(correct_players, key=lambda x: x[2])
+            fastest_player = fastest[0]
+            fastest_time = fastest[2]
+
+        # Mini event: First Blood bonus
+        if self.mini_event == "first_blood" and correct_players:
+            fb_name = fastest_player
+            fb_player = self.db.get_or_create_player(fb_name)
+            fb_player.add_score(FIRST_BLOOD_BONUS)
+            self.db.mark_dirty(fb_name)
+            self._push_event(
+                f"{fb_name} FIRST BLOOD! +{FIRST_BLOOD_BONUS} bonus ({fastest_time:.1f}s)",
+                (255, 80, 80), "1ST",
+            )
+            self.sound_queue.append("rank_up")
+
+        # Mini event: Jackpot - random correct player wins bonus
+        if self.mini_event == "jackpot" and correct_players:
+            jp_name, _, _ = random.choice(correct_players)
+            jp_player = self.db.get_or_create_player(jp_name)
+            jp_player.add_score(JACKPOT_BONUS)
+            self.db.mark_dirty(jp_name)
+            self._push_event(
+                f"{jp_name} wins the JACKPOT! +{JACKPOT_BONUS} pts!",
+                (180, 100, 255), "JP",
+            )
+            self.sound_queue.append("rank_up")
+
+        return RoundResult(
+            question=self.current_question,
+            correct_players=correct_players,
+            wrong_players=wrong_players,
+            total_answers=len(self.current_answers),
+            fastest_player=fastest_player,
+            fastest_time=fastest_time,
+        )
+
+    def _score_answers(self, correct_idx: int) -> tuple[list, list]:
+        """Score this round's answers one player at a time."""
         correct_players = []
         wrong_players = []
 
@@ -660,9 +635,9 @@ class QuizLogic:
 
                 correct_players.append((username, pts, answer_time))
             else:
-                player.record_wrong()
+                shield_used = player.record_wrong()
                 # Streak shield notification
-                if getattr(player, '_shield_used', False):
+                if shield_used:
                     self._push_event(
                         f"{username} SHIELD! Streak saved (x{player.streak})",
                         (100, 180, 255), "SHD",
@@ -672,46 +647,109 @@ class QuizLogic:
 
             self.db.mark_dirty(username)
 
-        # Find fastest
-        fastest_player = ""
-        fastest_time = 0.0
-        if correct_players:
-            fastest = min(correct_players, key=lambda x: x[2])
-            fastest_player = fastest[0]
-            fastest_time = fastest[2]
-
-        # Mini event: First Blood bonus
-        if self.mini_event == "first_blood" and correct_players:
-            fb_name = fastest_player
-            fb_player = self.db.get_or_create_player(fb_name)
-            fb_player.score += FIRST_BLOOD_BONUS
-            self.db.mark_dirty(fb_name)
-            self._push_event(
-                f"{fb_name} FIRST BLOOD! +{FIRST_BLOOD_BONUS} bonus ({fastest_time:.1f}s)",
-                (255, 80, 80), "1ST",
-            )
-            self.sound_queue.append("rank_up")
+        return correct_players, wrong_players
+
+    def _score_answers_batch(self, correct_idx: int) -> tuple[list, list]:
+        """
+        Score this round's answers with column operations on the player store.
+        Produces exactly what _score_answers would; per-player Python work only
+        runs for players who trigger an event (comeback, achievement, shield).
+        """
+        usernames = list(self.current_answers)
+        n = len(usernames)
+        answers = self.current_answers.values()
+        choices = np.fromiter((c for c, _ in answers), dtype=np.int64, count=n)
+        stamps = np.fromiter((t for _, t in answers), dtype=np.float64, count=n)
+
+        rows = np.asarray(self.db.get_or_create_rows(usernames), dtype=np.intp)
+        store = self.db.store
+        old_score = store.score[rows]
+        old_streak = store.streak[rows].astype(np.int64)
+        old_rank = store.rank[rows]
+        wrong_streak = store.wrong_streak[rows].astype(np.int64)
+        shield = store.streak_shield[rows]
+        correct = choices == correct_idx
+        wrong = ~correct
+
+        # Points (same float operations, in the same order, as _calculate_points)
+        answer_time = stamps - self.question_start_time
+        time_fraction = np.clip(answer_time / QUESTION_DISPLAY_TIME, 0, 1)
+        speed_mult = np.where(
+            time_fraction <= SPEED_BONUS_TIER1_THRESHOLD, SPEED_BONUS_TIER1_MULT,
+            np.where(time_fraction <= SPEED_BONUS_TIER2_THRESHOLD, SPEED_BONUS_TIER2_MULT, 1.0),
+        )
+        streak_mult = np.minimum(MAX_STREAK_MULT, 1.0 + old_streak * STREAK_BONUS_PER)
+        pts = np.maximum(1, (BASE_POINTS * speed_mult * streak_mult).astype(np.int64))
+        if self.mini_event == "lightning":
+            pts = (pts * LIGHTNING_MULT).astype(np.int64)
+        if self.is_double_points:
+            pts = (pts * DOUBLE_POINTS_MULT).astype(np.int64)
+        comeback = correct & (wrong_streak >= COMEBACK_STREAK_THRESHOLD)
+        pts = np.where(comeback, pts + COMEBACK_BONUS, pts)
+
+        # record_correct / record_wrong, column-wise
+        shield_used = wrong & shield & (old_streak > 0)
+        new_streak = np.where(correct, old_streak + 1,
+                              np.where(shield_used, old_streak // 2, 0))
+        new_score = np.where(correct, old_score + pts, old_score)
+        new_rank = np.where(
+            correct,
+            np.maximum(np.searchsorted(_RANK_FLOORS, new_score, side="right") - 1, 0),
+            old_rank,
+        )
+        store.score[rows] = new_score
+        store.streak[rows] = new_streak
+        store.best_streak[rows] = np.maximum(store.best_streak[rows], np.where(correct, new_streak, 0))
+        store.wrong_streak[rows] = np.where(correct, 0, wrong_streak + 1)
+        store.streak_shield[rows] = shield & ~shield_used
+        store.correct_answers[rows] += correct
+        store.wrong_answers[rows] += wrong
+        store.games_played[rows] += 1
+        store.rank[rows] = new_rank
+        store.last_seen[rows] = time.time()
+
+        changed = np.flatnonzero(correct)
+        self.db.scores_changed(
+            [usernames[i] for i in changed],
+            old_score[changed].tolist(), new_score[changed].tolist(),
+        )
+        self.db.mark_dirty_many(usernames)
+
+        # Per-player events, in answer order
+        flagged = shield_used | comeback | (correct & (
+            (store.correct_answers[rows] == 1)
+            | np.isin(new_streak, STREAK_MILESTONES)
+            | (answer_time < 2.0)
+            | (new_rank != old_rank)
+            | (store.games_played[rows] == 100)
+        ))
+        for i in np.flatnonzero(flagged).tolist():
+            username = usernames[i]
+            player = self.db.get_player(username)
+            if correct[i]:
+                if comeback[i]:
+                    self._push_event(
+                        f"{username} COMEBACK! +{COMEBACK_BONUS} bonus",
+                        COLOR_CORRECT, "BACK",
+                    )
+                    self.sound_queue.append("streak")
+                self._check_achievements(
+                    player, float(answer_time[i]), int(old_streak[i]), RANK_NAMES[old_rank[i]],
+                )
+            else:
+                self._push_event(
+                    f"{username} SHIELD! Streak saved (x{player.streak})",
+                    (100, 180, 255), "SHD",
+                )
+                self.sound_queue.append("streak")
 
-        # Mini event: Jackpot - random correct player wins bonus
-        if self.mini_event == "jackpot" and correct_players:
-            jp_name, _, _ = random.choice(correct_players)
-            jp_player = self.db.get_or_create_player(jp_name)
-            jp_player.score += JACKPOT_BONUS
-            self.db.mark_dirty(jp_name)
-            self._push_event(
-                f"{jp_name} wins the JACKPOT! +{JACKPOT_BONUS} pts!",
-                (180, 100, 255), "JP",
+        correct_players = [
+            (usernames[i], p, t) for i, p, t in zip(
+                changed.tolist(), pts[changed].tolist(), answer_time[changed].tolist(),
             )
-            self.sound_queue.append("rank_up")
-
-        return RoundResult(
-            question=self.current_question,
-            correct_players=correct_players,
-            wrong_players=wrong_players,
-            total_answers=len(self.current_answers),
-            fastest_player=fastest_player,
-            fastest_time=fastest_time,
-        )
+        ]
+        wrong_players = [(usernames[i], choices[i].item()) for i in np.flatnonzero(wrong).tolist()]
+        return correct_players, wrong_players
 
     def _calculate_points(self, answer_timestamp: float, current_streak: int) -> int:
         elapsed = answer_timestamp - self.question_start_time
@@ -802,23 +840,23 @@ class QuizLogic:
         self.db.remove_players(BOT_PROFILES)
         # Also remove from current round answers
         for bot_name in BOT_PROFILES:
-            self.current_answers.pop(bot_name, None)
+            self._drop_answer(bot_name)
         self._push_event("Bots cleared!", COLOR_CORRECT, "ADM")
-        print("[Game] Admin: all bots cleared")
+        log.info("[Game] Admin: all bots cleared")
 
     def reset_all_scores(self):
         """Reset scores for all players."""
         count = self.db.reset_all_players()
         self._push_event(f"All {count} players reset!", COLOR_AMBER, "ADM")
-        print(f"[Game] Admin: reset all {count} player scores")
+        log.info(f"[Game] Admin: reset all {count} player scores")
 
     def reset_bot_scores(self):
         """Reset bot scores to 0 but keep them playing."""
         count = 0
         for bot_name in BOT_PROFILES:
-            player = self.db._players.get(bot_name)
+            player = self.db.get_player(bot_name)
             if player:
-                player.score = 0
+                player.set_score(0)
                 player.streak = 0
                 player.best_streak = 0
                 player.games_played = 0
@@ -828,26 +866,44 @@ class QuizLogic:
                 self.db.mark_dirty(bot_name)
                 count += 1
         self._push_event(f"{count} bot scores reset!", COLOR_AMBER, "ADM")
-        print(f"[Game] Admin: reset {count} bot scores")
+        log.info(f"[Game] Admin: reset {count} bot scores")
 
     # ------------------------------------------
     # FILLER BOTS
     # ------------------------------------------
     def _count_real_players(self) -> int:
         """Count active real players: those who played last round."""
-        return len(self._last_round_real_players)
+        return self._last_round_real_count
 
     def _count_real_in_round(self) -> int:
         """Count real players who have answered in the current round."""
-        return sum(
-            1 for u in self.current_answers if not u.startswith(BOT_PREFIX)
-        )
+        return self._real_answer_count
 
     def _count_bots_in_round(self) -> int:
         """Count bots who have answered in the current round."""
-        return sum(
-            1 for u in self.current_answers if u.startswith(BOT_PREFIX)
-        )
+        return len(self._bot_answers)
+
+    def _set_answer(self, username: str, choice: int, timestamp: float):
+        """Record or replace an answer, keeping the per-round counters in sync."""
+        if username not in self.current_answers:
+            if username.startswith(BOT_PREFIX):
+                self._bot_answers.append(username)
+            else:
+                self._real_answer_count += 1
+        self.current_answers[username] = (choice, timestamp)
+
+    def _drop_answer(self, username: str):
+        if self.current_answers.pop(username, None) is None:
+            return
+        if username.startswith(BOT_PREFIX):
+            self._bot_answers.remove(username)
+        else:
+            self._real_answer_count -= 1
+
+    def _clear_answers(self):
+        self.current_answers = {}
+        self._real_answer_count = 0
+        self._bot_answers = []
 
     def _schedule_bots(self):
         """Schedule filler bot answers for this round."""
@@ -867,7 +923,7 @@ class QuizLogic:
                 self._push_event(
                     "Enough players! Bots retired.", COLOR_CORRECT, "BYE",
                 )
-                print(f"[Game] Bots retired ({real_count} real players)")
+                log.info(f"[Game] Bots retired ({real_count} real players)")
             return
 
         # Randomly select which bots to use this round
@@ -902,8 +958,8 @@ class QuizLogic:
             answer_time = self.question_start_time + speed_frac * q_time
             self._scheduled_bots.append((bot_name, choice, answer_time))
 
-        print(f"[Game] Bots: scheduled {bots_needed} bots "
-              f"(real_count={real_count}, bots={[b.replace(BOT_PREFIX,'') for b in active_bots]})")
+        log.info(f"[Game] Bots: scheduled {bots_needed} bots "
+                 f"(real_count={real_count}, bots={[b.replace(BOT_PREFIX,'') for b in active_bots]})")
 
     def _remove_excess_bots(self):
         """Remove bots mid-round when real players join. Called after a real player answers."""
@@ -911,13 +967,13 @@ class QuizLogic:
 
         # If real players alone fill the lobby, remove ALL bots
         if real_in_round >= MIN_PLAYERS:
-            bots_to_remove = [u for u in self.current_answers if u.startswith(BOT_PREFIX)]
+            bots_to_remove = list(self._bot_answers)
             for bot_name in bots_to_remove:
-                del self.current_answers[bot_name]
+                self._drop_answer(bot_name)
             self._scheduled_bots = []
             if bots_to_remove:
-                print(f"[Game] Removed {len(bots_to_remove)} bot(s) "
-                      f"(real players: {real_in_round})")
+                log.info(f"[Game] Removed {len(bots_to_remove)} bot(s) "
+                         f"(real players: {real_in_round})")
             if self._bots_active:
                 self._bots_active = False
                 self._active_bot_names = []
@@ -928,7 +984,7 @@ class QuizLogic:
             return
 
         # Otherwise, trim bots so total = MIN_PLAYERS
-        bots_in_round = [u for u in self.current_answers if u.startswith(BOT_PREFIX)]
+        bots_in_round = list(self._bot_answers)
         total = real_in_round + len(bots_in_round)
         excess = total - MIN_PLAYERS
 
@@ -937,16 +993,15 @@ class QuizLogic:
             random.shuffle(bots_in_round)
             to_remove = bots_in_round[:excess]
             for bot_name in to_remove:
-                del self.current_answers[bot_name]
+                self._drop_answer(bot_name)
             # Also cancel any scheduled bots that are now excess
-            scheduled_names = {b[0] for b in self._scheduled_bots}
-            active_bot_answers = {u for u in self.current_answers if u.startswith(BOT_PREFIX)}
+            active_bot_answers = set(self._bot_answers)
             self._scheduled_bots = [
                 (name, choice, t) for name, choice, t in self._scheduled_bots
                 if name in active_bot_answers or (real_in_round + len(active_bot_answers) < MIN_PLAYERS)
             ]
-            print(f"[Game] Trimmed {len(to_remove)} bot(s) "
-                  f"(real: {real_in_round}, bots remaining: {len(bots_in_round) - len(to_remove)})")
+            log.info(f"[Game] Trimmed {len(to_remove)} bot(s) "
+                     f"(real: {real_in_round}, bots remaining: {len(bots_in_round) - len(to_remove)})")
 
     def _process_bot_answers(self):
         """Process scheduled bot answers, dynamically adjusting for real player count."""
@@ -960,16 +1015,16 @@ class QuizLogic:
             if now >= answer_time:
                 # Dynamic cap: skip if we already have enough total players
                 if real_in_round + bots_in_round >= MIN_PLAYERS:
-                    print(f"[Game] {bot_name} skipped (lobby full: "
-                          f"{real_in_round} real + {bots_in_round} bots)")
+                    log.info(f"[Game] {bot_name} skipped (lobby full: "
+                             f"{real_in_round} real + {bots_in_round} bots)")
                     continue
 
                 if bot_name not in self.current_answers:
-                    self.current_answers[bot_name] = (choice, now)
+                    self._set_answer(bot_name, choice, now)
                     self.db.get_or_create_player(bot_name)
                     self.sound_queue.append("answer_lock")
                     bots_in_round += 1
-                    print(f"[Game] {bot_name} locked in answer {choice + 1}")
+                    log.debug(f"[Game] {bot_name} locked in answer {choice + 1}")
             else:
                 remaining.append((bot_name, choice, answer_time))
         self._scheduled_bots = remaining
@@ -978,6 +1033,8 @@ class QuizLogic:
     # VOTE RESOLUTION
     # ------------------------------------------
     def _resolve_vote(self):
+        # Remaining speculative fetches would only serve losing options now
+        self._otdb.cancel_speculative()
         if not self.vote_state or not self.vote_state.votes:
             cid = random.choice(list(VOTABLE_CATEGORIES.keys()))
             self._set_category(cid)
@@ -992,16 +1049,14 @@ class QuizLogic:
         self._push_event(
             f"Next category: {name}!", COLOR_TEXT_GOLD, "VOTE",
         )
-        print(f"[Vote] Winner: {name} ({max_votes} votes)")
+        log.info(f"[Vote] Winner: {name} ({max_votes} votes)")
 
     def _set_category(self, category_id):
-        """Change category and flush stale questions from the cache."""
+        """Change category; questions already banked for it are served right away."""
         if category_id != self._current_category_id:
-            old_count = len(self._question_cache)
-            self._question_cache.clear()
-            if old_count > 0:
-                cat_name = VOTABLE_CATEGORIES.get(category_id, category_id)
-                print(f"[OTDB] Category changed to {cat_name}, flushed {old_count} cached questions")
+            self._bank_available = self._bank.available(category_id)
+            cat_name = VOTABLE_CATEGORIES.get(category_id, category_id)
+            log.info(f"[OTDB] Category changed to {cat_name}, {self._bank_available} banked questions ready")
         self._current_category_id = category_id
 
     # ------------------------------------------
@@ -1017,8 +1072,55 @@ class QuizLogic:
         return True
 
     def process_message(self, username: str, message: str):
-        msg = message.strip().lower()
+        """Handle a single chat message (see process_messages)."""
+        self.process_messages([ChatMessage(username, message, time.time())])
+
+    def process_messages(self, batch: list[ChatMessage]):
+        """
+        Handle a frame's worth of chat at once, in arrival order.
+        Consecutive answers are collapsed per user and applied together, with
+        one grace-period decision and one bot trim, so a burst costs one pass
+        instead of one pass per message. Chatter is skipped and does not break
+        the run. A command (CHAT_COMMANDS) does: the answers before it are
+        applied first, so "A", "reset", "B" still happens in order.
+        """
+        answers: dict[str, list[int]] = {}  # username -> choices, in arrival order
+        for chat_msg in batch:
+            msg = chat_msg.message.strip().lower()
+            choice = self._parse_answer(msg)
+            if choice is None:
+                if msg not in CHAT_COMMANDS:
+                    continue  # chatter
+                if answers:
+                    self._process_answers(answers)
+                    answers = {}
+                self._process_command(chat_msg.username, msg)
+            else:
+                answers.setdefault(chat_msg.username, []).append(choice)
+        if answers:
+            self._process_answers(answers)
+
+    def _process_answers(self, answers: dict[str, list[int]]):
+        # Determine effective state: use grace period for late messages
+        effective_state = self.state
+        in_grace = False
+        if self.state not in (GameState.ASKING, GameState.THEME_VOTE):
+            elapsed = time.time() - self._prev_state_end_time
+            if elapsed < LATE_ANSWER_GRACE and self._prev_state in (GameState.ASKING, GameState.THEME_VOTE):
+                effective_state = self._prev_state
+                in_grace = True
+
+        if effective_state == GameState.ASKING:
+            self._apply_answers(answers, in_grace)
+        elif effective_state == GameState.THEME_VOTE:
+            self._apply_votes(answers, in_grace)
+        else:
+            answer_log.info(f"[Game] {len(answers)} player(s) answered during {self.state.name} (ignored)")
+
+    # Shared with the chat ingestor, which collapses answers before they get here
+    _parse_answer = staticmethod(parse_answer)
 
+    def _process_command(self, username: str, msg: str):
         if msg in ("reset", "clear"):
             if not self._check_command_cooldown(username):
                 return
@@ -1032,8 +1134,10 @@ class QuizLogic:
             if not self._check_command_cooldown(username):
                 return
             player = self.db.get_or_create_player(username)
+            position, total = self.db.get_player_rank(username)
             self._push_event(
-                f"{username}: {player.score:,} pts | {player.rank} | x{player.streak} streak",
+                f"{username}: {player.score:,} pts | #{position:,} of {total:,} | "
+                f"{player.rank} | x{player.streak} streak",
                 COLOR_TEXT_GOLD, "PTS",
             )
             return
@@ -1042,103 +1146,94 @@ class QuizLogic:
         if username.lower() == "themomatthias":
             if msg in ("clear_bots", "clearbots"):
                 self.clear_bots()
-                return
             elif msg in ("reset_bots", "resetbots"):
                 self.reset_bot_scores()
-                return
             elif msg in ("reset_all", "resetall"):
                 self.reset_all_scores()
-                return
 
-        # Accept "1", "2", "3", "4" — already normalized by chat (punctuation stripped)
-        # Also handle edge cases: "1 ", "answer 2", etc. — check first char
-        answer = ""
-        if msg in ("1", "2", "3", "4"):
-            answer = msg
-        elif len(msg) <= 10 and msg and msg[0] in "1234":
-            # Short message starting with a valid digit (e.g. "1!" normalized to "1")
-            answer = msg[0]
-
-        if answer:
-            choice = int(answer) - 1
-
-            # Determine effective state: use grace period for late messages
-            effective_state = self.state
-            in_grace = False
-            if self.state not in (GameState.ASKING, GameState.THEME_VOTE):
-                elapsed = time.time() - self._prev_state_end_time
-                if elapsed < LATE_ANSWER_GRACE and self._prev_state in (GameState.ASKING, GameState.THEME_VOTE):
-                    effective_state = self._prev_state
-                    in_grace = True
-
-            if effective_state == GameState.ASKING:
-                player = self.db.get_or_create_player(username)
-                old_answer = self.current_answers.get(username)
-
-                if in_grace and self.current_question:
-                    if old_answer is None:
-                        # Late first answer — score immediately
-                        self.current_answers[username] = (choice, time.time())
-                        correct_idx = self.current_question.correct_index
-                        if choice == correct_idx:
-                            pts = BASE_POINTS  # no speed bonus for late
-                            player.record_correct(pts)
-                            print(f"[Game] {username} late answer {msg} - CORRECT (+{pts} pts, grace period)")
-                        else:
-                            player.record_wrong()
-                            print(f"[Game] {username} late answer {msg} - wrong (grace period)")
-                        self.db.mark_dirty(username)
-                        self.sound_queue.append("answer_lock")
+    def _apply_answers(self, answers: dict[str, list[int]], in_grace: bool):
+        now = time.time()
+        locked = changed = late = denied = 0
+        real_answered = False
+
+        # Cold and new players in one lookup, not a SELECT per viewer
+        players = self.db.get_or_create_players(list(answers))
+        for (username, choices), player in zip(answers.items(), players):
+            # First answer from someone who had no row when the game started
+            # (they may have been created earlier this session by a command)
+            first_visit = username not in self._welcomed and self.db.is_new_player(username)
+            if first_visit:
+                self._welcomed.add(username)
+            old_answer = self.current_answers.get(username)
+
+            if in_grace and self.current_question:
+                if old_answer is None:
+                    # Late first answer — score immediately; later ones in the batch are changes (denied)
+                    choice = choices[0]
+                    self._set_answer(username, choice, now)
+                    if choice == self.current_question.correct_index:
+                        player.record_correct(BASE_POINTS)  # no speed bonus for late
                     else:
-                        # Can't change answer after time expired
-                        print(f"[Game] {username} tried to change answer during grace period (denied)")
-                elif old_answer is None:
-                    # First answer
-                    self.current_answers[username] = (choice, time.time())
+                        player.record_wrong()
+                    self.db.mark_dirty(username)
                     self.sound_queue.append("answer_lock")
-                    print(f"[Game] {username} locked in answer {msg}")
+                    late += 1
+                    denied += len(choices) - 1
                 else:
-                    # Changed answer — update choice and timestamp
-                    old_choice = old_answer[0]
-                    if old_choice != choice:
-                        self.current_answers[username] = (choice, time.time())
-                        self.sound_queue.append("answer_lock")
-                        print(f"[Game] {username} changed answer from {old_choice + 1} to {msg}")
-                    else:
-                        print(f"[Game] {username} already picked {msg}")
-
-                # Dynamically adjust bots when a real player answers
-                if not username.startswith(BOT_PREFIX):
-                    self._remove_excess_bots()
-
-                # Welcome new players (skip bots)
-                if username not in self._known_players:
-                    self._known_players.add(username)
-                    if not username.startswith(BOT_PREFIX):
-                        self.new_players_this_round.append(username)
-                        self._push_event(
-                            f"Welcome {username}! First time here",
-                            COLOR_CORRECT, "NEW",
-                        )
-
-            elif effective_state == GameState.THEME_VOTE:
-                if self.vote_state:
-                    vote_num = int(answer)
-                    if vote_num in self.vote_state.options:
-                        old_vote = self.vote_state.votes.get(username)
-                        self.vote_state.votes[username] = vote_num
-                        cat_name = self.vote_state.options[vote_num][1]
-                        late_tag = " (late, grace period)" if in_grace else ""
-                        if old_vote is None:
-                            self.sound_queue.append("vote")
-                            print(f"[Game] {username} voted #{vote_num} ({cat_name}){late_tag}")
-                        else:
-                            print(f"[Game] {username} changed vote to #{vote_num} ({cat_name}){late_tag}")
-                    else:
-                        print(f"[Game] {username} voted {vote_num} but options are {list(self.vote_state.options.keys())}")
+                    # Can't change answer after time expired
+                    denied += len(choices)
+            elif old_answer is None:
+                # First answer (last one in the batch wins)
+                self._set_answer(username, choices[-1], now)
+                self.sound_queue.append("answer_lock")
+                locked += 1
+            elif any(c != old_answer[0] for c in choices):
+                # Changed answer — any change resets the timestamp, even if it ends on the old choice
+                self._set_answer(username, choices[-1], now)
+                self.sound_queue.append("answer_lock")
+                changed += 1
+
+            if not username.startswith(BOT_PREFIX):
+                real_answered = True
+                # Welcome new players
+                if first_visit:
+                    self.new_players_this_round.append(username)
+                    self._push_event(
+                        f"Welcome {username}! First time here",
+                        COLOR_CORRECT, "NEW",
+                    )
 
+        # Dynamically adjust bots once real players have answered
+        if real_answered:
+            self._remove_excess_bots()
+
+        if locked or changed or late or denied:
+            grace_tag = f", {late} late, {denied} denied (grace period)" if in_grace else ""
+            answer_log.info(f"[Game] Answers: {locked} locked in, {changed} changed{grace_tag} "
+                            f"(total: {len(self.current_answers)})")
+
+    def _apply_votes(self, answers: dict[str, list[int]], in_grace: bool):
+        if not self.vote_state:
+            return
+        options = self.vote_state.options
+        new_votes = changed = invalid = 0
+        for username, choices in answers.items():
+            valid = [c + 1 for c in choices if c + 1 in options]
+            invalid += len(choices) - len(valid)
+            if not valid:
+                continue
+            old_vote = self.vote_state.votes.get(username)
+            self.vote_state.votes[username] = valid[-1]
+            if old_vote is None:
+                new_votes += 1
             else:
-                print(f"[Game] {username} sent '{msg}' during {self.state.name} (ignored)")
+                changed += 1
+        if new_votes:
+            self.sound_queue.append("vote")
+        if new_votes or changed or invalid:
+            late_tag = " (late, grace period)" if in_grace else ""
+            answer_log.info(f"[Game] Votes: {new_votes} new, {changed} changed, {invalid} invalid{late_tag} "
+                            f"(total: {len(self.vote_state.votes)})")
 
     # ------------------------------------------
     # ACCESSORS
@@ -1158,7 +1253,7 @@ class QuizLogic:
         return len(self.current_answers)
 
     @property
-    def leaderboard(self) -> list[Player]:
+    def leaderboard(self) -> list[PlayerSnapshot]:
         return self._leaderboard
 
     @property
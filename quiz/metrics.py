@@ -0,0 +1,147 @@
+"""
+The Lifelong Quiz - Latency Metrics
+Rolling chat-to-score latency histograms, per pipeline stage.
+
+Every ChatMessage carries three clocks:
+    source_ts     when YouTube says it was sent (pytchat item timestamp; 0 if unknown)
+    timestamp     when the ingestor read it (ingest time)
+    processed_ts  when QuizLogic finished processing the frame's batch
+
+and the controller notes when it drained the batch from the chat ring, giving
+four stages:
+    source   source_ts -> ingest    YouTube delivery + pytchat polling/pacing
+    queue    ingest -> drained      chat ring + wait for the next frame
+    process  drained -> processed   process_messages for the whole batch
+    total    source_ts -> processed what a viewer's "2" actually waits
+
+Histograms use log-spaced buckets (1ms .. 2min, ~3% wide) kept per second
+for the last LATENCY_WINDOW seconds, so percentiles are rolling and adding a
+batch is a couple of numpy calls. source_ts is YouTube's clock, so source and
+total include any skew between it and ours (negative values are clamped to 0).
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+from quiz.config import LATENCY_WINDOW, LATE_ANSWER_GRACE
+
+STAGES = ("source", "queue", "process", "total")
+_EDGES = np.geomspace(0.001, 120.0, 400)  # seconds; bucket i covers [edges[i-1], edges[i])
+
+
+class RollingHistogram:
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._counts = np.zeros((window, len(_EDGES) + 1), dtype=np.int64)
+        self._stamps = np.full(window, -1, dtype=np.int64)  # second each row belongs to
+        self._max = np.zeros(window)
+
+    def add(self, values: np.ndarray, now: float):
+        if not len(values):
+            return
+        second = int(now)
+        row = second % self.window
+        if self._stamps[row] != second:
+            self._counts[row] = 0
+            self._max[row] = 0.0
+            self._stamps[row] = second
+        buckets = np.searchsorted(_EDGES, values, side="right")
+        self._counts[row] += np.bincount(buckets, minlength=len(_EDGES) + 1)
+        self._max[row] = max(self._max[row], float(values.max()))
+
+    def add_one(self, value: float, now: float):
+        self.add(np.array((value,)), now)
+
+    def summary(self, now: float, percentiles=(50, 95, 99)) -> dict:
+        live = self._stamps > int(now) - self.window
+        counts = self._counts[live].sum(axis=0)
+        total = int(counts.sum())
+        out = {"count": total}
+        if not total:
+            for p in percentiles:
+                out[f"p{p}"] = None
+            out["max"] = None
+            return out
+        cumulative = np.cumsum(counts)
+        peak = float(self._max[live].max())
+        for p in percentiles:
+            bucket = int(np.searchsorted(cumulative, total * p / 100.0))
+            # Report the bucket's upper edge (conservative, but never above the max), in ms
+            out[f"p{p}"] = min(float(_EDGES[min(bucket, len(_EDGES) - 1)]), peak) * 1000.0
+        out["max"] = peak * 1000.0
+        return out
+
+    def fraction_below(self, seconds: float, now: float) -> float | None:
+        live = self._stamps > int(now) - self.window
+        counts = self._counts[live].sum(axis=0)
+        total = counts.sum()
+        if not total:
+            return None
+        return float(counts[:np.searchsorted(_EDGES, seconds, side="right")].sum() / total)
+
+
+class ChatLatency:
+    """Per-stage rolling latency for chat messages; fed once per frame by the controller."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.stages = {name: RollingHistogram(window) for name in STAGES}
+        self.messages = 0
+
+    def observe(self, batch: list, drained_at: float, processed_at: float):
+        n = len(batch)
+        if not n:
+            return
+        ingest = np.empty(n)
+        source = np.empty(n)
+        for i, msg in enumerate(batch):
+            msg.processed_ts = processed_at
+            ingest[i] = msg.timestamp
+            source[i] = msg.source_ts
+        self.messages += n
+
+        now = processed_at
+        has_source = source > 0
+        self.stages["queue"].add(np.maximum(drained_at - ingest, 0.0), now)
+        self.stages["process"].add(np.full(n, max(processed_at - drained_at, 0.0)), now)
+        if has_source.any():
+            src = source[has_source]
+            self.stages["source"].add(np.maximum(ingest[has_source] - src, 0.0), now)
+            self.stages["total"].add(np.maximum(processed_at - src, 0.0), now)
+
+    def snapshot(self, now: float | None = None) -> dict:
+        now = time.time() if now is None else now
+        snap = {name: hist.summary(now) for name, hist in self.stages.items()}
+        # How many answers the current grace period would still catch (end-to-end)
+        snap["grace_coverage"] = self.stages["total"].fraction_below(LATE_ANSWER_GRACE, now)
+        snap["messages"] = self.messages
+        return snap
+
+    @staticmethod
+    def format(snap: dict) -> list[str]:
+        """Human-readable lines (for the overlay and the log)."""
+        lines = []
+        for name in STAGES:
+            s = snap[name]
+            if not s["count"]:
+                lines.append(f"{name:<8} -")
+                continue
+            lines.append(f"{name:<8} p50 {s['p50']:7.0f}ms  p95 {s['p95']:7.0f}ms  "
+                         f"p99 {s['p99']:7.0f}ms  n={s['count']}")
+        coverage = snap.get("grace_coverage")
+        if coverage is not None:
+            lines.append(f"grace {LATE_ANSWER_GRACE}s covers {coverage * 100:.1f}% of messages")
+        return lines
+
+
+def write_metrics(path: str, metrics: dict):
+    """Atomically replace the metrics dump (readers never see a half-written file)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp, path)
@@ -1,12 +1,14 @@
 """
 The Lifelong Quiz - Data Models
-Enums, dataclasses, and core data structures.
+Enums, dataclasses, and core data structures (incl. the array-backed player store).
 """
 
 from enum import Enum, auto
 from dataclasses import dataclass, field
 import time
 
+import numpy as np
+
 from quiz.config import RANK_THRESHOLDS
 
 
@@ -18,68 +20,326 @@ class GameState(Enum):
     THEME_VOTE = auto()
 
 
-@dataclass
+# Chat commands QuizLogic acts on (normalized; admin ones only for the admin)
+CHAT_COMMANDS = frozenset((
+    "reset", "clear", "score", "points",
+    "clear_bots", "clearbots", "reset_bots", "resetbots", "reset_all", "resetall",
+))
+
+
+def parse_answer(msg: str) -> int | None:
+    """0-based choice for a normalized answer message, or None."""
+    # Accept "1", "2", "3", "4" — already normalized by chat (punctuation stripped)
+    # Also handle edge cases: "1 ", "answer 2", etc. — check first char
+    if msg in ("1", "2", "3", "4"):
+        return int(msg) - 1
+    if len(msg) <= 10 and msg and msg[0] in "1234":
+        # Short message starting with a valid digit (e.g. "1!" normalized to "1")
+        return int(msg[0]) - 1
+    return None
+
+
+RANK_NAMES = [name for _, name in RANK_THRESHOLDS]
+_RANK_CODES = {name: code for code, name in enumerate(RANK_NAMES)}
+
+# Integer stat columns, in the order they are stored and persisted
+_INT_COLUMNS = (
+    "score", "streak", "best_streak", "games_played", "correct_answers",
+    "wrong_answers", "wrong_streak", "participation_streak", "last_participated",
+)
+
+
+class PlayerStore:
+    """
+    Struct-of-arrays player storage.
+    Each stat is a NumPy column indexed by row; usernames map to rows through
+    a dict, and freed rows are recycled. Player objects are views over a row.
+
+    Participation streaks are stamped with the epoch (counted round) they were
+    last extended in; a streak whose stamp is older than participation_epoch
+    has lapsed and reads as 0, so nobody has to walk every player each round.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(1, capacity)
+        for name in _INT_COLUMNS:
+            dtype = np.int64 if name == "score" else np.int32
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.rank = np.zeros(capacity, dtype=np.int8)  # index into RANK_NAMES
+        self.streak_shield = np.zeros(capacity, dtype=np.bool_)
+        self.last_seen = np.zeros(capacity, dtype=np.float64)
+        self.usernames: list[str | None] = [None] * capacity
+
+        self._rows: dict[str, int] = {}
+        self._free: list[int] = []
+        self._next_row = 0
+        # Called as listener(player, old_score) after every score change
+        self.score_listener = None
+        # Latest round counted for participation streaks
+        self.participation_epoch = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._rows
+
+    @property
+    def capacity(self) -> int:
+        return len(self.usernames)
+
+    def _grow(self):
+        old = self.capacity
+        new = old * 2
+        for name in (*_INT_COLUMNS, "rank", "streak_shield", "last_seen"):
+            column = getattr(self, name)
+            grown = np.zeros(new, dtype=column.dtype)
+            grown[:old] = column
+            setattr(self, name, grown)
+        self.usernames.extend([None] * (new - old))
+
+    def add(self, username: str, score: int = 0, streak: int = 0,
+            best_streak: int = 0, rank: str = "Bronze", games_played: int = 0,
+            correct_answers: int = 0, wrong_answers: int = 0,
+            wrong_streak: int = 0, participation_streak: int = 0,
+            last_participated: int = 0, streak_shield: bool = False,
+            last_seen: float | None = None) -> "Player":
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._next_row == self.capacity:
+                self._grow()
+            row = self._next_row
+            self._next_row += 1
+        self.usernames[row] = username
+        self._rows[username] = row
+        self.score[row] = score
+        self.streak[row] = streak
+        self.best_streak[row] = best_streak
+        self.games_played[row] = games_played
+        self.correct_answers[row] = correct_answers
+        self.wrong_answers[row] = wrong_answers
+        self.wrong_streak[row] = wrong_streak
+        self.participation_streak[row] = participation_streak
+        self.last_participated[row] = last_participated
+        self.rank[row] = _RANK_CODES.get(rank, 0)
+        self.streak_shield[row] = streak_shield
+        self.last_seen[row] = time.time() if last_seen is None else last_seen
+        return Player(self, row)
+
+    def remove(self, username: str):
+        row = self._rows.pop(username, None)
+        if row is None:
+            return
+        self.usernames[row] = None
+        self._free.append(row)
+
+    def get(self, username: str) -> "Player | None":
+        row = self._rows.get(username)
+        return None if row is None else Player(self, row)
+
+    def row_of(self, username: str) -> int | None:
+        return self._rows.get(username)
+
+    def reset_row(self, row: int):
+        """Zero a row's stats in place (no score notification)."""
+        for name in _INT_COLUMNS:
+            getattr(self, name)[row] = 0
+        self.rank[row] = 0
+        self.streak_shield[row] = False
+
+    def snapshot_rows(self, rows: list[int]) -> list[tuple]:
+        """
+        Immutable (username, score, streak, best_streak, rank, games_played,
+        correct_answers, wrong_answers, wrong_streak, participation_streak,
+        last_participated, streak_shield, last_seen) tuples for the given rows, in one pass per column.
+        """
+        idx = np.asarray(rows, dtype=np.intp)
+        usernames = [self.usernames[r] for r in rows]
+        ranks = [RANK_NAMES[code] for code in self.rank[idx].tolist()]
+        return list(zip(
+            usernames,
+            self.score[idx].tolist(), self.streak[idx].tolist(),
+            self.best_streak[idx].tolist(), ranks,
+            self.games_played[idx].tolist(), self.correct_answers[idx].tolist(),
+            self.wrong_answers[idx].tolist(), self.wrong_streak[idx].tolist(),
+            self.participation_streak[idx].tolist(), self.last_participated[idx].tolist(),
+            self.streak_shield[idx].astype(np.int64).tolist(),
+            self.last_seen[idx].tolist(),
+        ))
+
+
+def _int_column(name: str):
+    def getter(self):
+        return int(getattr(self._store, name)[self._row])
+
+    def setter(self, value):
+        getattr(self._store, name)[self._row] = value
+
+    return property(getter, setter)
+
+
 class Player:
-    username: str
-    score: int = 0
-    streak: int = 0
-    best_streak: int = 0
-    rank: str = "Bronze"
-    games_played: int = 0
-    correct_answers: int = 0
-    wrong_answers: int = 0
-    wrong_streak: int = 0
-    participation_streak: int = 0
-    streak_shield: bool = False
-    last_seen: float = field(default_factory=time.time)
+    """Lightweight view over one PlayerStore row. Only valid while the row is held."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: PlayerStore, row: int):
+        self._store = store
+        self._row = row
+
+    streak = _int_column("streak")
+    best_streak = _int_column("best_streak")
+    games_played = _int_column("games_played")
+    correct_answers = _int_column("correct_answers")
+    wrong_answers = _int_column("wrong_answers")
+    wrong_streak = _int_column("wrong_streak")
+
+    @property
+    def username(self) -> str:
+        return self._store.usernames[self._row]
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def score(self) -> int:
+        return int(self._store.score[self._row])
+
+    @score.setter
+    def score(self, value: int):
+        self.set_score(value)
+
+    @property
+    def rank(self) -> str:
+        return RANK_NAMES[self._store.rank[self._row]]
+
+    @rank.setter
+    def rank(self, name: str):
+        self._store.rank[self._row] = _RANK_CODES.get(name, 0)
+
+    @property
+    def participation_streak(self) -> int:
+        store, row = self._store, self._row
+        if store.last_participated[row] != store.participation_epoch:
+            return 0  # missed a round since the streak was last extended
+        return int(store.participation_streak[row])
+
+    @participation_streak.setter
+    def participation_streak(self, value: int):
+        self._store.participation_streak[self._row] = value
+        self._store.last_participated[self._row] = self._store.participation_epoch
+
+    def record_participation(self) -> int:
+        """Count this player in the current participation epoch. Returns the new streak."""
+        store, row = self._store, self._row
+        epoch = store.participation_epoch
+        last = store.last_participated[row]
+        if last == epoch:
+            return int(store.participation_streak[row])
+        streak = int(store.participation_streak[row]) + 1 if last == epoch - 1 else 1
+        store.participation_streak[row] = streak
+        store.last_participated[row] = epoch
+        return streak
+
+    @property
+    def streak_shield(self) -> bool:
+        return bool(self._store.streak_shield[self._row])
+
+    @streak_shield.setter
+    def streak_shield(self, value: bool):
+        self._store.streak_shield[self._row] = value
+
+    @property
+    def last_seen(self) -> float:
+        return float(self._store.last_seen[self._row])
+
+    @last_seen.setter
+    def last_seen(self, value: float):
+        self._store.last_seen[self._row] = value
+
+    def add_score(self, points: int):
+        self.set_score(self.score + points)
+
+    def set_score(self, value: int):
+        old_score = self.score
+        self._store.score[self._row] = value
+        listener = self._store.score_listener
+        if listener is not None and value != old_score:
+            listener(self, old_score)
 
     def record_correct(self, points: int):
-        was_wrong_streak = self.wrong_streak
         self.wrong_streak = 0
-        self.score += points
-        self.streak += 1
+        self.add_score(points)
+        streak = self.streak + 1
+        self.streak = streak
         self.correct_answers += 1
         self.games_played += 1
         self.last_seen = time.time()
-        if self.streak > self.best_streak:
-            self.best_streak = self.streak
-        old_rank = self.rank
+        if streak > self.best_streak:
+            self.best_streak = streak
         self.update_rank()
-        self._rank_changed = (self.rank != old_rank)
-        self._was_comeback = (was_wrong_streak >= 3)  # for comeback detection
 
-    def record_wrong(self):
+    def record_wrong(self) -> bool:
+        """Returns True if a streak shield absorbed the miss."""
         self.wrong_streak += 1
         # Streak shield: halve streak instead of resetting to 0
+        shield_used = False
         if self.streak_shield and self.streak > 0:
             self.streak = self.streak // 2
             self.streak_shield = False
-            self._shield_used = True
+            shield_used = True
         else:
             self.streak = 0
-            self._shield_used = False
         self.wrong_answers += 1
         self.games_played += 1
         self.last_seen = time.time()
+        return shield_used
 
     def update_rank(self):
-        new_rank = "Bronze"
-        for threshold, rank_name in RANK_THRESHOLDS:
-            if self.score >= threshold:
-                new_rank = rank_name
-        self.rank = new_rank
+        score = self.score
+        code = 0
+        for i, (threshold, _) in enumerate(RANK_THRESHOLDS):
+            if score >= threshold:
+                code = i
+        self._store.rank[self._row] = code
 
     def reset(self):
-        self.score = 0
-        self.streak = 0
-        self.best_streak = 0
-        self.rank = "Bronze"
-        self.games_played = 0
-        self.correct_answers = 0
-        self.wrong_answers = 0
-        self.wrong_streak = 0
-        self.participation_streak = 0
-        self.streak_shield = False
+        self.set_score(0)
+        self._store.reset_row(self._row)
+
+    def snapshot(self) -> "PlayerSnapshot":
+        """Detached copy that stays valid after this row is evicted or reused."""
+        return PlayerSnapshot(
+            username=self.username, score=self.score, streak=self.streak,
+            best_streak=self.best_streak, rank=self.rank,
+            games_played=self.games_played,
+            correct_answers=self.correct_answers,
+            wrong_answers=self.wrong_answers, wrong_streak=self.wrong_streak,
+            participation_streak=self.participation_streak,
+            streak_shield=self.streak_shield, last_seen=self.last_seen,
+        )
+
+    def __repr__(self) -> str:
+        return f"Player({self.username!r}, score={self.score}, row={self._row})"
+
+
+@dataclass(frozen=True)
+class PlayerSnapshot:
+    """Read-only player state (e.g. for the leaderboard, which outlives a frame)."""
+    username: str
+    score: int
+    streak: int
+    best_streak: int
+    rank: str
+    games_played: int
+    correct_answers: int
+    wrong_answers: int
+    wrong_streak: int
+    participation_streak: int
+    streak_shield: bool
+    last_seen: float
 
 
 @dataclass
@@ -106,7 +366,13 @@ class RoundResult:
 class ChatMessage:
     username: str
     message: str
-    timestamp: float
+    timestamp: float  # ingest time: when our chat reader received it
+    source_ts: float = 0.0  # when the platform says it was sent (0 if the source doesn't know)
+    processed_ts: float = 0.0  # when QuizLogic finished processing it (set by the controller)
+
+    @property
+    def ingest_ts(self) -> float:
+        return self.timestamp
 
 
 @dataclass
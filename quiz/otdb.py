@@ -0,0 +1,331 @@
+"""
+The Lifelong Quiz - Open Trivia DB Client
+Rate-limited, prioritized question fetching over one keep-alive session.
+
+All requests go through a single scheduler thread:
+- A token bucket paces api.php calls to OTDB's per-IP limit
+  (one request per OTDB_REQUEST_COOLDOWN seconds, bursts of OTDB_RATE_BURST).
+- Urgent requests (the current category is nearly out of questions) are
+  always served before speculative ones (theme-vote prefetch).
+- "Rate limit" responses (code 5) are retried with jittered backoff;
+  "token empty/not found" (codes 3/4) reset or renew the session token.
+Counters for latency, hits/misses and throttling are exposed via stats.
+"""
+
+import heapq
+import html
+import logging
+import random
+import threading
+import time
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+from quiz.config import (
+    OTDB_BASE_URL, OTDB_TOKEN_URL, OTDB_BATCH_SIZE, OTDB_REQUEST_COOLDOWN,
+    OTDB_RATE_BURST, OTDB_MAX_RETRIES, OTDB_TIMEOUT,
+)
+from quiz.models import Question
+
+log = logging.getLogger("quiz.otdb")
+
+# OTDB response codes
+_OK, _NO_RESULTS, _INVALID, _TOKEN_NOT_FOUND, _TOKEN_EMPTY, _RATE_LIMIT = range(6)
+
+URGENT = 0
+SPECULATIVE = 1
+
+
+def parse_results(items: list[dict]) -> list[Question]:
+    """Turn OTDB result items into Questions with shuffled options."""
+    questions = []
+    for item in items:
+        text = html.unescape(item["question"])
+        correct = html.unescape(item["correct_answer"])
+        incorrect = [html.unescape(a) for a in item["incorrect_answers"]]
+        options = incorrect + [correct]
+        random.shuffle(options)
+        questions.append(Question(
+            text=text, correct_answer=correct, options=options,
+            correct_index=options.index(correct),
+            category=html.unescape(item["category"]),
+            difficulty=item["difficulty"],
+        ))
+    return questions
+
+
+class TokenBucket:
+    """Classic token bucket: `burst` tokens, one refilled every `interval` seconds."""
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = interval
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.interval <= 0:
+            self._tokens = float(self.burst)
+        else:
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) / self.interval)
+        self._stamp = now
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(time.monotonic())
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) * self.interval
+
+    def take(self):
+        self._refill(time.monotonic())
+        self._tokens -= 1
+
+    def drain(self, penalty: float = 0.0):
+        """Empty the bucket (e.g. after the server said we're too fast)."""
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, 0.0) - (penalty / self.interval if self.interval > 0 else 0)
+
+
+class OTDBClient:
+    def __init__(self, base_url: str = OTDB_BASE_URL, token_url: str = OTDB_TOKEN_URL,
+                 interval: float = OTDB_REQUEST_COOLDOWN, burst: int = OTDB_RATE_BURST):
+        self._base_url = base_url
+        self._token_url = token_url
+        self._bucket = TokenBucket(interval, burst)
+        self._token = ""
+        self._session = None
+        if requests:
+            self._session = requests.Session()
+            self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+
+        # Scheduler state (guarded by _cond)
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, object]] = []  # (priority, seq, category_id)
+        self._jobs: dict[object, dict] = {}  # category_id -> job; one request per category
+        self._seq = 0
+        self._running = False
+        self._thread = None
+
+        # Counters (written by the scheduler thread, read by anyone)
+        self.requests = 0
+        self.hits = 0
+        self.misses = 0
+        self.throttled = 0
+        self.retries = 0
+        self.errors = 0
+        self.bucket_waits = 0
+        self.bucket_wait_s = 0.0
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self._latency_total_ms = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._session is not None
+
+    def start(self):
+        if not self.enabled or self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=OTDB_TIMEOUT)
+            self._thread = None
+        if self._session is not None:
+            self._session.close()
+
+    # ------------------------------------------
+    # REQUESTS (any thread)
+    # ------------------------------------------
+    def request(self, category_id, callback, urgent: bool = True,
+                amount: int = OTDB_BATCH_SIZE) -> bool:
+        """
+        Queue a question fetch; callback(category_id, questions) runs on the
+        scheduler thread. At most one request per category is queued; asking
+        again urgently upgrades a queued speculative one. Returns True if queued.
+        """
+        if not self.enabled:
+            return False
+        priority = URGENT if urgent else SPECULATIVE
+        with self._cond:
+            job = self._jobs.get(category_id)
+            if job is not None:
+                if priority < job["priority"] and not job["started"]:
+                    job["priority"] = priority
+                    self._push(priority, category_id)
+                return False
+            self._jobs[category_id] = {
+                "priority": priority, "callback": callback, "amount": amount,
+                "attempt": 0, "started": False,
+            }
+            self._push(priority, category_id)
+            return True
+
+    def is_pending(self, category_id) -> bool:
+        with self._cond:
+            return category_id in self._jobs
+
+    def cancel_speculative(self):
+        """Drop queued speculative requests that haven't started yet."""
+        with self._cond:
+            for cid, job in list(self._jobs.items()):
+                if job["priority"] == SPECULATIVE and not job["started"]:
+                    del self._jobs[cid]
+
+    def _push(self, priority: int, category_id):
+        self._seq += 1
+        heapq.heappush(self._heap, (priority, self._seq, category_id))
+        self._cond.notify()
+
+    @property
+    def stats(self) -> dict:
+        done = self.hits + self.misses
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "misses": self.misses,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "errors": self.errors,
+            "bucket_waits": self.bucket_waits,
+            "bucket_wait_s": self.bucket_wait_s,
+            "last_ms": self.last_latency_ms,
+            "avg_ms": self._latency_total_ms / done if done else 0.0,
+            "max_ms": self.max_latency_ms,
+            "queued": len(self._jobs),
+        }
+
+    # ------------------------------------------
+    # SCHEDULER THREAD
+    # ------------------------------------------
+    def _next_job(self):
+        """Block until a job is queued and the bucket has a token. Returns (category_id, job)."""
+        wait_start = None
+        with self._cond:
+            while self._running:
+                # Skip heap entries superseded by a priority upgrade or cancelled
+                while self._heap:
+                    priority, _, cid = self._heap[0]
+                    job = self._jobs.get(cid)
+                    if job is not None and job["priority"] == priority and not job["started"]:
+                        break
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._bucket.wait_time()
+                if delay > 0:
+                    if wait_start is None:
+                        wait_start = time.monotonic()
+                    # Re-check on wake: an urgent job may have arrived meanwhile
+                    self._cond.wait(delay)
+                    continue
+                _, _, cid = heapq.heappop(self._heap)
+                job = self._jobs[cid]
+                job["started"] = True
+                self._bucket.take()
+                if wait_start is not None:
+                    self.bucket_waits += 1
+                    self.bucket_wait_s += time.monotonic() - wait_start
+                return cid, job
+        return None, None
+
+    def _run(self):
+        self._request_token()
+        while True:
+            cid, job = self._next_job()
+            if job is None:
+                return
+            questions, retry = self._fetch(cid, job)
+            if retry and job["attempt"] < OTDB_MAX_RETRIES:
+                job["attempt"] += 1
+                self.retries += 1
+                # Jittered exponential backoff on top of the drained bucket
+                backoff = self._bucket.interval * (2 ** (job["attempt"] - 1)) * random.uniform(0.5, 1.5)
+                self._bucket.drain(backoff)
+                with self._cond:
+                    job["started"] = False
+                    self._push(job["priority"], cid)
+                continue
+            with self._cond:
+                self._jobs.pop(cid, None)
+            try:
+                job["callback"](cid, questions)
+            except Exception as e:
+                log.error(f"[OTDB] Callback error: {e}")
+
+    def _fetch(self, category_id, job) -> tuple[list[Question], bool]:
+        """One api.php call. Returns (questions, should_retry)."""
+        params = {"amount": job["amount"], "type": "multiple"}
+        if category_id:
+            params["category"] = category_id
+        if self._token:
+            params["token"] = self._token
+
+        self.requests += 1
+        start = time.perf_counter()
+        try:
+            data = self._session.get(self._base_url, params=params, timeout=OTDB_TIMEOUT).json()
+        except Exception as e:
+            self.errors += 1
+            log.warning(f"[OTDB] Fetch error: {e}")
+            return [], True
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        code = data.get("response_code")
+        if code == _RATE_LIMIT:
+            self.throttled += 1
+            return [], True
+        self.last_latency_ms = elapsed_ms
+        self.max_latency_ms = max(self.max_latency_ms, elapsed_ms)
+        self._latency_total_ms += elapsed_ms
+        if code == _OK and data.get("results"):
+            self.hits += 1
+            return parse_results(data["results"]), False
+        self.misses += 1
+        if code == _TOKEN_EMPTY:
+            self._reset_token()
+            return [], True
+        if code == _TOKEN_NOT_FOUND:
+            self._request_token()
+            return [], True
+        return [], False
+
+    # ------------------------------------------
+    # SESSION TOKEN
+    # ------------------------------------------
+    def _request_token(self):
+        try:
+            data = self._session.get(
+                self._token_url, params={"command": "request"}, timeout=OTDB_TIMEOUT,
+            ).json()
+            if data.get("response_code") == _OK:
+                self._token = data["token"]
+                log.info("[OTDB] Got session token")
+        except Exception as e:
+            log.warning(f"[OTDB] Token fetch error: {e}")
+
+    def _reset_token(self):
+        if not self._token:
+            return
+        try:
+            data = self._session.get(
+                self._token_url, params={"command": "reset", "token": self._token},
+                timeout=OTDB_TIMEOUT,
+            ).json()
+            if data.get("response_code") == _OK:
+                log.info("[OTDB] Session token reset")
+        except Exception as e:
+            log.warning(f"[OTDB] Token reset error: {e}")
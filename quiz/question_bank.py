@@ -0,0 +1,251 @@
+"""
+The Lifelong Quiz - Question Bank
+Persistent SQLite store of every question fetched from OTDB.
+
+Questions are indexed by category and difficulty and stamped with the time
+they were last served, so picking the next question for a category is an
+index range lookup, "recently seen" survives restarts, and category
+switches or cold starts are served from disk instead of waiting on the API.
+
+Questions served from outside the bank (the hardcoded fallback pool) are
+tracked in a time-ordered seen-set that expires from the oldest end and is
+persisted in the same file, so OTDB_SEEN_EXPIRY holds across restarts too.
+"""
+
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import os
+from collections import OrderedDict
+
+from quiz.config import QUESTION_BANK_PATH, OTDB_SEEN_EXPIRY
+from quiz.models import Question
+
+log = logging.getLogger("quiz.bank")
+
+# OTDB category names (as returned in results) -> category id
+_OTDB_CATEGORY_IDS = {
+    "General Knowledge": 9,
+    "Entertainment: Books": 10,
+    "Entertainment: Film": 11,
+    "Entertainment: Music": 12,
+    "Entertainment: Musicals & Theatres": 13,
+    "Entertainment: Television": 14,
+    "Entertainment: Video Games": 15,
+    "Entertainment: Board Games": 16,
+    "Science & Nature": 17,
+    "Science: Computers": 18,
+    "Science: Mathematics": 19,
+    "Mythology": 20,
+    "Sports": 21,
+    "Geography": 22,
+    "History": 23,
+    "Politics": 24,
+    "Art": 25,
+    "Celebrities": 26,
+    "Animals": 27,
+    "Vehicles": 28,
+    "Entertainment: Comics": 29,
+    "Science: Gadgets": 30,
+    "Entertainment: Japanese Anime & Manga": 31,
+    "Entertainment: Cartoon & Animations": 32,
+}
+
+# Candidates read per pick; one is chosen at random so order isn't fully predictable
+_PICK_WINDOW = 8
+
+_INSERT_SQL = """
+    INSERT OR IGNORE INTO questions
+    (text, correct, incorrect, category, category_id, difficulty, added)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class QuestionBank:
+    def __init__(self, path: str = QUESTION_BANK_PATH):
+        self._path = path
+        self._lock = threading.Lock()  # game thread reads, fetch threads write
+
+        bank_dir = os.path.dirname(path)
+        if bank_dir:
+            os.makedirs(bank_dir, exist_ok=True)
+
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._create_tables()
+        except sqlite3.DatabaseError:
+            # The bank is only a cache of OTDB; start over rather than fail
+            log.warning("[Bank] Question bank corrupted, recreating")
+            if os.path.exists(path):
+                os.remove(path)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._create_tables()
+
+        # Seen-set for non-bank questions: key -> served time, oldest first
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self._load_seen()
+        log.info(f"[Bank] {len(self)} questions banked, {len(self._seen)} recently seen")
+
+    def _create_tables(self):
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Losing the last few stamps in a power cut is harmless; an fsync per served question isn't
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS questions (
+                id          INTEGER PRIMARY KEY,
+                text        TEXT NOT NULL UNIQUE,
+                correct     TEXT NOT NULL,
+                incorrect   TEXT NOT NULL,
+                category    TEXT,
+                category_id INTEGER,
+                difficulty  TEXT,
+                added       REAL DEFAULT 0,
+                last_served REAL DEFAULT 0
+            )
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_questions_category
+            ON questions(category_id, difficulty)
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_questions_serve
+            ON questions(category_id, last_served)
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_questions_last_served
+            ON questions(last_served)
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen (
+                key  TEXT PRIMARY KEY,
+                ts   REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    # ------------------------------------------
+    # POPULATE
+    # ------------------------------------------
+    def add(self, questions: list[Question], category_id=None) -> int:
+        """Bank fetched questions (duplicates are ignored). Returns how many were new."""
+        now = time.time()
+        rows = []
+        for q in questions:
+            incorrect = [o for o in q.options if o != q.correct_answer]
+            cid = category_id or _OTDB_CATEGORY_IDS.get(q.category)
+            rows.append((q.text, q.correct_answer, json.dumps(incorrect),
+                         q.category, cid, q.difficulty, now))
+        with self._lock:
+            before = self._conn.total_changes
+            with self._conn:
+                self._conn.executemany(_INSERT_SQL, rows)
+            return self._conn.total_changes - before
+
+    # ------------------------------------------
+    # SERVE
+    # ------------------------------------------
+    def available(self, category_id=None) -> int:
+        """Questions in a category (None = any) not served within OTDB_SEEN_EXPIRY."""
+        cutoff = time.time() - OTDB_SEEN_EXPIRY
+        with self._lock:
+            if category_id is None:
+                sql = "SELECT COUNT(*) FROM questions WHERE last_served < ?"
+                return self._conn.execute(sql, (cutoff,)).fetchone()[0]
+            sql = "SELECT COUNT(*) FROM questions WHERE category_id = ? AND last_served < ?"
+            return self._conn.execute(sql, (category_id, cutoff)).fetchone()[0]
+
+    def take(self, category_id=None, difficulty=None,
+             allow_seen: bool = False) -> Question | None:
+        """
+        Serve a question and stamp it as seen. Picks among the least recently
+        served in the category; with allow_seen, recently seen questions
+        qualify too (oldest first). Returns None if nothing matches.
+        """
+        now = time.time()
+        where, params = [], []
+        if category_id is not None:
+            where.append("category_id = ?")
+            params.append(category_id)
+        if difficulty is not None:
+            where.append("difficulty = ?")
+            params.append(difficulty)
+        if not allow_seen:
+            where.append("last_served < ?")
+            params.append(now - OTDB_SEEN_EXPIRY)
+        sql = (
+            "SELECT id, text, correct, incorrect, category, difficulty FROM questions"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY last_served LIMIT ?"
+        )
+        with self._lock:
+            window = 1 if allow_seen else _PICK_WINDOW  # repeats: strictly oldest first
+            rows = self._conn.execute(sql, (*params, window)).fetchall()
+            if not rows:
+                return None
+            qid, text, correct, incorrect, category, diff = random.choice(rows)
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE questions SET last_served = ? WHERE id = ?", (now, qid),
+                )
+
+        options = json.loads(incorrect) + [correct]
+        random.shuffle(options)
+        return Question(
+            text=text, correct_answer=correct, options=options,
+            correct_index=options.index(correct),
+            category=category, difficulty=diff,
+        )
+
+    # ------------------------------------------
+    # SEEN-SET (questions served from outside the bank)
+    # ------------------------------------------
+    def _load_seen(self):
+        cutoff = time.time() - OTDB_SEEN_EXPIRY
+        with self._conn:
+            self._conn.execute("DELETE FROM seen WHERE ts < ?", (cutoff,))
+        for key, ts in self._conn.execute("SELECT key, ts FROM seen ORDER BY ts"):
+            self._seen[key] = ts
+
+    def _expire_seen(self):
+        """Drop expired entries from the oldest end; O(expired), not O(seen)."""
+        cutoff = time.time() - OTDB_SEEN_EXPIRY
+        expired = False
+        while self._seen:
+            key = next(iter(self._seen))
+            if self._seen[key] >= cutoff:
+                break
+            del self._seen[key]
+            expired = True
+        if expired:
+            with self._conn:
+                self._conn.execute("DELETE FROM seen WHERE ts < ?", (cutoff,))
+
+    def is_seen(self, key: str) -> bool:
+        with self._lock:
+            self._expire_seen()
+            return key in self._seen
+
+    def mark_seen(self, key: str):
+        now = time.time()
+        with self._lock:
+            self._seen[key] = now
+            self._seen.move_to_end(key)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO seen (key, ts) VALUES (?, ?)", (key, now),
+                )
+
+    @property
+    def seen_count(self) -> int:
+        return len(self._seen)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
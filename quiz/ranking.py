@@ -0,0 +1,193 @@
+"""
+The Lifelong Quiz - Score Ranking
+Incrementally maintained leaderboard order over every known player.
+
+Players are kept sorted by (score desc, username asc) in a bucketed sorted
+list: a list of short sorted sublists plus the max key of each. Inserts and
+removals touch one sublist, so score updates cost O(log n + LOAD) and
+reading the top N walks only the first few sublists.
+
+A Fenwick tree over sublist lengths turns "how many players rank above me"
+into an O(log n) prefix sum, so rank lookups never scan the population.
+"""
+
+from bisect import bisect_left, insort
+
+# Target sublist length. Sublists split at 2x and merge below 0.5x.
+_LOAD = 1000
+
+
+def _key(username: str, score: int) -> tuple:
+    return (-score, username)
+
+
+class ScoreIndex:
+    def __init__(self, items=()):
+        """items: optional iterable of (username, score) pairs to bulk-load."""
+        self._lists: list[list[tuple]] = []
+        self._maxes: list[tuple] = []
+        self._len = 0
+        self._tree: list[int] | None = None  # Fenwick tree over sublist lengths (lazy)
+        self._rebuild([_key(u, s) for u, s in items])
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, username: str, score: int):
+        key = _key(username, score)
+        if not self._maxes:
+            self._lists.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            self._tree = None
+            return
+
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            # Goes after everything: append to the last sublist
+            i -= 1
+            self._lists[i].append(key)
+            self._maxes[i] = key
+        else:
+            insort(self._lists[i], key)
+        self._len += 1
+        if self._tree is not None:
+            self._tree_add(i, 1)
+
+        if len(self._lists[i]) > 2 * _LOAD:
+            self._split(i)
+
+    def remove(self, username: str, score: int) -> bool:
+        """Remove an entry. Returns False if it wasn't indexed."""
+        key = _key(username, score)
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        lst = self._lists[i]
+        j = bisect_left(lst, key)
+        if j == len(lst) or lst[j] != key:
+            return False
+
+        del lst[j]
+        self._len -= 1
+        if not lst:
+            del self._lists[i]
+            del self._maxes[i]
+            self._tree = None
+        else:
+            if self._tree is not None:
+                self._tree_add(i, -1)
+            if j == len(lst):
+                self._maxes[i] = lst[-1]
+            if len(lst) < _LOAD // 2 and len(self._lists) > 1:
+                self._merge(i)
+        return True
+
+    def update(self, username: str, old_score: int, new_score: int):
+        if old_score == new_score:
+            return
+        self.remove(username, old_score)
+        self.add(username, new_score)
+
+    def update_many(self, changes):
+        """Apply (username, old_score, new_score) changes; rebuilds when most entries move."""
+        changes = [c for c in changes if c[1] != c[2]]
+        if len(changes) * 4 > self._len:
+            drop = {_key(u, old) for u, old, _ in changes}
+            keys = [k for lst in self._lists for k in lst if k not in drop]
+            keys.extend(_key(u, new) for u, _, new in changes)
+            self._rebuild(keys)
+            return
+        for username, old_score, new_score in changes:
+            self.remove(username, old_score)
+            self.add(username, new_score)
+
+    def rank(self, username: str, score: int) -> int:
+        """1-based leaderboard position of an indexed entry, or 0 if it isn't indexed."""
+        key = _key(username, score)
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return 0
+        lst = self._lists[i]
+        j = bisect_left(lst, key)
+        if j == len(lst) or lst[j] != key:
+            return 0
+        if self._tree is None:
+            self._build_tree()
+        return self._tree_prefix(i) + j + 1
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        """Best n entries as (username, score), highest score first."""
+        result = []
+        for lst in self._lists:
+            for neg_score, username in lst:
+                if len(result) >= n:
+                    return result
+                result.append((username, -neg_score))
+        return result
+
+    def clear(self):
+        self._lists = []
+        self._maxes = []
+        self._len = 0
+        self._tree = None
+
+    # ------------------------------------------
+    # SUBLIST MAINTENANCE
+    # ------------------------------------------
+    def _rebuild(self, keys: list[tuple]):
+        keys.sort()
+        self._lists = [keys[i:i + _LOAD] for i in range(0, len(keys), _LOAD)]
+        self._maxes = [lst[-1] for lst in self._lists]
+        self._len = len(keys)
+        self._tree = None
+
+    def _split(self, i: int):
+        lst = self._lists[i]
+        half = len(lst) // 2
+        right = lst[half:]
+        del lst[half:]
+        self._lists.insert(i + 1, right)
+        self._maxes[i] = lst[-1]
+        self._maxes.insert(i + 1, right[-1])
+        self._tree = None
+
+    def _merge(self, i: int):
+        # Fold sublist i into its right neighbour (or left, if it is the last one)
+        j = i + 1 if i + 1 < len(self._lists) else i - 1
+        lo, hi = min(i, j), max(i, j)
+        self._lists[lo].extend(self._lists[hi])
+        self._maxes[lo] = self._lists[lo][-1]
+        del self._lists[hi]
+        del self._maxes[hi]
+        self._tree = None
+        if len(self._lists[lo]) > 2 * _LOAD:
+            self._split(lo)
+
+    # ------------------------------------------
+    # FENWICK TREE (positional index)
+    # ------------------------------------------
+    def _build_tree(self):
+        tree = [len(lst) for lst in self._lists]
+        n = len(tree)
+        for i in range(n):
+            parent = i | (i + 1)
+            if parent < n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, i: int, delta: int):
+        tree = self._tree
+        n = len(tree)
+        while i < n:
+            tree[i] += delta
+            i |= i + 1
+
+    def _tree_prefix(self, i: int) -> int:
+        """Total length of sublists [0, i)."""
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i - 1]
+            i &= i - 1
+        return total
@@ -3,15 +3,26 @@ The Lifelong Quiz - Stream Finder
 Automatically finds a live YouTube stream from one of the configured channels.
 
 Detection methods (tried in order):
-1. Direct HTTP fetch of channel /live page (most reliable)
+1. Direct HTTP fetch of channel /live and /streams pages (most reliable)
 2. scrapetube channel scan (fallback)
 
+Within each method every channel (and tab) is probed at once on a small
+thread pool; the first probe to find a live stream wins and the rest are
+cancelled (downloads in flight stop at their next chunk), so a slow YouTube
+response costs one timeout, not one per page.
+Channel pages (1 MB+) are scanned as they download over a shared keep-alive
+session, and the download stops once PageScanner has an answer. If little of
+the page is left by then it is read to the end, so the connection goes back
+to the pool; otherwise the connection is dropped and the next poll reconnects.
+
 Note: Includes EU cookie consent bypass (required for YouTube in EU countries).
 """
 
+import queue
 import re
-import time
 import threading
+import time
+from collections import deque
 
 try:
     import requests as _requests
@@ -23,7 +34,11 @@ try:
 except ImportError:
     scrapetube = None
 
-from quiz.config import CHANNEL_IDS, STREAM_POLL_INTERVAL
+from quiz.config import (
+    CHANNEL_IDS, STREAM_POLL_INTERVAL, STREAM_PROBE_WORKERS, STREAM_PROBE_TIMEOUT,
+    STREAM_POLL_MAX_INTERVAL, STREAM_POLL_TIGHT, STREAM_LIVENESS_GRACE,
+    STREAM_RESTART_WINDOW, STREAM_RESTART_TIMES, STREAM_NEGATIVE_TTL,
+)
 
 # Browser-like headers so YouTube doesn't reject the request
 _HEADERS = {
@@ -40,75 +55,158 @@ _COOKIES = {
     "SOCS": "CAISNQgDEitib3FfaWRlbnRpdHlmcm9udGVuZHVpc2VydmVyXzIwMjMwODI5LjA3X3AxGgJlbiADGgYIgJnSmgY",
 }
 
-# Regex patterns for YouTube page parsing
-_VIDEO_ID_RE = re.compile(r'"videoId"\s*:\s*"([a-zA-Z0-9_-]{11})"')
-_IS_LIVE_RE = re.compile(r'"isLive"\s*:\s*true', re.IGNORECASE)
-_IS_LIVE_NOW_RE = re.compile(r'"isLiveNow"\s*:\s*true', re.IGNORECASE)
-_IS_LIVE_CONTENT_RE = re.compile(r'"isLiveContent"\s*:\s*true', re.IGNORECASE)
-_LIVE_BADGE_RE = re.compile(r'BADGE_STYLE_TYPE_LIVE_NOW')
-
-
-def _find_live_via_http(channel_id: str) -> str | None:
+# Page patterns, matched on raw bytes as the page streams in. Each starts
+# with a literal '"' or 'B', so the regex engine skips ahead to candidates quickly.
+# isLive/isLiveNow stay case-insensitive, as they were on the decoded page.
+_VIDEO_ID_RE = re.compile(rb'"videoId"\s*:\s*"([a-zA-Z0-9_-]{11})"')
+_IS_LIVE_RE = re.compile(rb'"isLive(?:Now)?"\s*:\s*true', re.IGNORECASE)
+_LIVE_BADGE_RE = re.compile(rb'BADGE_STYLE_TYPE_LIVE_NOW')
+
+_CHUNK_SIZE = 32 * 1024
+_OVERLAP = 128               # longer than any match, so none is split between chunks
+_LIVE_LOOKAHEAD = 128 * 1024  # /live: how far past the video ID to look for a live marker
+_MAX_VIDEOS = 5              # /streams: the live one is at the top of the newest-first grid
+_MAX_PAGE_BYTES = 4 * 1024 * 1024
+_DRAIN_MAX = 256 * 1024      # read at most this much past the answer to keep the connection
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _http_session():
+    """Shared keep-alive session for channel page probes (one connection per probe thread)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = _requests.Session()
+            session.headers.update(_HEADERS)
+            session.cookies.update(_COOKIES)
+            adapter = _requests.adapters.HTTPAdapter(pool_maxsize=STREAM_PROBE_WORKERS)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+class PageScanner:
     """
-    Find live video ID by fetching the channel's /live page.
-    YouTube's /live endpoint shows the current livestream for a channel.
-    Falls back to /streams tab if /live doesn't find anything.
+    Incremental scan of a channel tab page for a live stream. feed() chunks
+    as they arrive until it returns True (the answer is decided), then read
+    video_id / live.
+
+    /live:    the first video ID on the page is the stream (YouTube only
+              shows live or upcoming content there); after it, look a little
+              further for a live marker to tell "live" from "starting".
+    /streams: a live marker (LIVE badge, isLive/isLiveNow) belongs to the
+              video whose ID came just before it. The grid is newest first,
+              so once _MAX_VIDEOS videos have gone by without one, nothing
+              further down is live.
     """
-    if not _requests:
-        return None
 
-    # Method A: Check /live page (shows currently active stream)
-    vid = _check_channel_page(channel_id, "live")
-    if vid:
-        return vid
+    def __init__(self, tab: str):
+        self.tab = tab
+        self.video_id: str | None = None
+        self.live = False
+        self.bytes_read = 0
+        self._tail = b""
+        self._last_video: bytes | None = None
+        self._videos: set[bytes] = set()
+        self._first_video_at = 0
+        self._marker_pending = False  # live marker seen before any video ID
+
+    def feed(self, chunk: bytes) -> bool:
+        start = self.bytes_read - len(self._tail)  # page offset of buf[0]
+        buf = self._tail + chunk
+        self.bytes_read += len(chunk)
+        fresh = len(self._tail)  # matches ending at or before this were seen last time
+        events = [(m.start(), m.group(1)) for m in _VIDEO_ID_RE.finditer(buf) if m.end() > fresh]
+        for marker_re in (_IS_LIVE_RE, _LIVE_BADGE_RE):
+            events += [(m.start(), None) for m in marker_re.finditer(buf) if m.end() > fresh]
+        events.sort(key=lambda e: e[0])
+        self._tail = buf[-_OVERLAP:]
+
+        for pos, video in events:
+            if video is not None:
+                self._last_video = video
+                if self.tab == "live":
+                    if self.video_id is None:
+                        self.video_id = video.decode("ascii")
+                        self._first_video_at = start + pos
+                        if self._marker_pending:
+                            self.live = True
+                            return True
+                elif self._marker_pending:
+                    return self._found(video)
+                else:
+                    self._videos.add(video)
+                    if len(self._videos) > _MAX_VIDEOS:
+                        return True  # past the top of the grid: nothing live
+            elif self.tab == "live":
+                if self.video_id is None:
+                    self._marker_pending = True
+                else:
+                    self.live = True
+                    return True
+            elif self._last_video is not None:
+                return self._found(self._last_video)
+            else:
+                self._marker_pending = True
 
-    # Method B: Check /streams tab (shows all streams including currently live)
-    vid = _check_channel_page(channel_id, "streams")
-    if vid:
-        return vid
+        if self.tab == "live" and self.video_id is not None:
+            return self.bytes_read - self._first_video_at > _LIVE_LOOKAHEAD
+        return self.bytes_read >= _MAX_PAGE_BYTES
 
-    return None
+    def _found(self, video: bytes) -> bool:
+        self.video_id = video.decode("ascii")
+        self.live = True
+        return True
 
 
-def _check_channel_page(channel_id: str, tab: str) -> str | None:
-    """Fetch a channel tab page and look for a live stream video ID."""
+def _check_channel_page(channel_id: str, tab: str,
+                        stop: threading.Event | None = None) -> str | None:
+    """
+    Fetch a channel tab page and look for a live stream video ID. The page is
+    scanned as it streams in and the download stops as soon as PageScanner
+    has an answer, usually within the first few hundred KB of a 1 MB+ page,
+    or as soon as stop is set (another probe already found the stream).
+    """
     url = f"https://www.youtube.com/channel/{channel_id}/{tab}"
+    if stop is not None and stop.is_set():
+        return None
     try:
-        resp = _requests.get(url, timeout=15, headers=_HEADERS, cookies=_COOKIES)
-        if resp.status_code != 200:
-            print(f"[Stream] HTTP {resp.status_code} for {channel_id}/{tab}")
-            return None
-
-        # Check if we got redirected to consent page (shouldn't happen with cookie)
-        if "consent.youtube.com" in resp.url:
-            print(f"[Stream] Consent redirect on {channel_id}/{tab} (cookie expired)")
-            return None
-
-        text = resp.text
-        match = _VIDEO_ID_RE.search(text)
-        if not match:
+        with _http_session().get(url, timeout=STREAM_PROBE_TIMEOUT, stream=True) as resp:
+            if resp.status_code != 200:
+                print(f"[Stream] HTTP {resp.status_code} for {channel_id}/{tab}")
+                return None
+
+            # Check if we got redirected to consent page (shouldn't happen with cookie)
+            if "consent.youtube.com" in resp.url:
+                print(f"[Stream] Consent redirect on {channel_id}/{tab} (cookie expired)")
+                return None
+
+            scanner = PageScanner(tab)
+            chunks = resp.iter_content(_CHUNK_SIZE)
+            for chunk in chunks:
+                if stop is not None and stop.is_set():
+                    return None  # cancelled: closing drops the connection mid-page
+                if scanner.feed(chunk):
+                    _drain(resp, chunks)
+                    break
+
+        vid = scanner.video_id
+        if not vid:
             return None
 
-        vid = match.group(1)
-
         # On the /live tab, ANY video found is a live/upcoming stream.
-        # YouTube only shows live content on this endpoint.
         if tab == "live":
-            # Check for explicit live indicators for better logging
-            is_live_now = bool(_IS_LIVE_NOW_RE.search(text) or _IS_LIVE_RE.search(text))
-            has_live_badge = bool(_LIVE_BADGE_RE.search(text))
-            if is_live_now or has_live_badge:
+            if scanner.live:
                 print(f"[Stream] Found ACTIVE live stream: {vid} on {channel_id}")
             else:
                 print(f"[Stream] Found live stream video: {vid} on {channel_id} (may be starting)")
             return vid
 
-        # On /streams tab, require a LIVE badge since it lists past streams too
-        has_live_badge = bool(_LIVE_BADGE_RE.search(text))
-        is_live_now = bool(_IS_LIVE_NOW_RE.search(text) or _IS_LIVE_RE.search(text))
-        if has_live_badge or is_live_now:
-            print(f"[Stream] Found ACTIVE stream on /streams tab: {vid}")
-            return vid
+        # On /streams tab, the video had a LIVE badge (the tab lists past streams too)
+        print(f"[Stream] Found ACTIVE stream on /streams tab: {vid}")
+        return vid
 
     except Exception as e:
         print(f"[Stream] HTTP check failed for {channel_id}/{tab}: {e}")
@@ -116,9 +214,27 @@ def _check_channel_page(channel_id: str, tab: str) -> str | None:
     return None
 
 
-def _find_live_via_scrapetube(channel_id: str) -> str | None:
+def _drain(resp, chunks) -> bool:
+    """
+    Read what is left of a response whose answer is already decided, so
+    closing it returns the connection to the session's pool. Bodies with
+    more than _DRAIN_MAX left are not worth it: leaving them unread drops the
+    connection. Returns True if the connection was kept.
+    """
+    remaining = getattr(resp.raw, "length_remaining", None)  # None: chunked, size unknown
+    if remaining is not None and remaining > _DRAIN_MAX:
+        return False
+    drained = 0
+    for chunk in chunks:
+        drained += len(chunk)
+        if drained > _DRAIN_MAX:
+            return False
+    return True
+
+
+def _find_live_via_scrapetube(channel_id: str, stop: threading.Event | None = None) -> str | None:
     """Fallback: use scrapetube to search for live streams on a channel."""
-    if not scrapetube:
+    if not scrapetube or (stop is not None and stop.is_set()):
         return None
 
     try:
@@ -130,6 +246,8 @@ def _find_live_via_scrapetube(channel_id: str) -> str | None:
         )
 
         for v in videos:
+            if stop is not None and stop.is_set():
+                return None  # cancelled; the generator fetches no further pages
             vid_id = v.get("videoId", "")
 
             # Check thumbnailOverlays for LIVE badge
@@ -150,33 +268,77 @@ def _find_live_via_scrapetube(channel_id: str) -> str | None:
     return None
 
 
-def find_live_video_id(channel_ids: list[str] | None = None) -> str | None:
+def _first_live(probes: list) -> tuple[str | None, str | None]:
+    """
+    Run (function, channel_id, *args) probes concurrently on up to
+    STREAM_PROBE_WORKERS threads; return the first video ID any of them
+    finds, with its channel. Each probe is called with stop=<Event>; once
+    one succeeds the event is set, no further probes start, and those in
+    flight give up at their next chunk or page. Daemon threads rather than
+    a ThreadPoolExecutor, whose workers would hold up exiting the game until
+    a request still waiting on a connect or first byte times out.
+    """
+    tasks = queue.SimpleQueue()
+    for probe in probes:
+        tasks.put(probe)
+    results = queue.SimpleQueue()
+    found = threading.Event()
+
+    def worker():
+        while not found.is_set():
+            try:
+                fn, *args = tasks.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results.put((fn(*args, stop=found), args[0]))
+            except Exception as e:
+                print(f"[Stream] Probe {fn.__name__}{tuple(args)} failed: {e}")
+                results.put((None, args[0]))
+
+    for i in range(min(STREAM_PROBE_WORKERS, len(probes))):
+        threading.Thread(target=worker, name=f"stream-probe-{i}", daemon=True).start()
+    for _ in probes:
+        vid, channel_id = results.get()
+        if vid:
+            found.set()
+            return vid, channel_id
+    return None, None
+
+
+def find_live_stream(channel_ids: list[str] | None = None) -> tuple[str | None, str | None]:
     """
-    Search YouTube channels for an active livestream.
-    Tries HTTP /live page first (fast, reliable), then scrapetube fallback.
+    Search YouTube channels for an active livestream; returns (video_id, channel_id).
+    Tries HTTP /live and /streams pages first (fast, reliable), then scrapetube fallback.
     """
     if not channel_ids:
-        return None
+        return None, None
 
     # Method 1: Direct HTTP fetch (preferred — handles EU consent)
-    for cid in channel_ids:
-        print(f"[Stream] Checking {cid} via HTTP...")
-        vid = _find_live_via_http(cid)
+    if _requests:
+        print(f"[Stream] Checking {len(channel_ids)} channel(s) via HTTP...")
+        vid, cid = _first_live([
+            (_check_channel_page, cid, tab) for cid in channel_ids for tab in ("live", "streams")
+        ])
         if vid:
-            return vid
+            return vid, cid
 
     # Method 2: scrapetube fallback
     if scrapetube:
-        for cid in channel_ids:
-            print(f"[Stream] Checking {cid} via scrapetube...")
-            vid = _find_live_via_scrapetube(cid)
-            if vid:
-                return vid
+        print(f"[Stream] Checking {len(channel_ids)} channel(s) via scrapetube...")
+        vid, cid = _first_live([(_find_live_via_scrapetube, cid) for cid in channel_ids])
+        if vid:
+            return vid, cid
     elif not _requests:
         print("[Stream] Neither requests nor scrapetube available for auto-detection")
 
     print("[Stream] No active livestream found on any channel")
-    return None
+    return None, None
+
+
+def find_live_video_id(channel_ids: list[str] | None = None) -> str | None:
+    """Search YouTube channels for an active livestream (see find_live_stream)."""
+    return find_live_stream(channel_ids)[0]
 
 
 def resolve_video_id(
@@ -202,34 +364,179 @@ def resolve_video_id(
 
 class StreamWatcher:
     """
-    Background thread that polls configured channels for a new livestream.
-    When a stream is found, calls the callback with the video ID.
+    Background thread that follows the show's broadcast for as long as the
+    game runs, and calls the callback with the video ID whenever the live
+    stream changes (first found, or a new broadcast after the old one ended).
+
+    Liveness comes from the chat (is_live: the chat ingestor is connected),
+    so a healthy stream costs no requests beyond an occasional check of its
+    own channel for a newer broadcast. Polling adapts:
+      - nothing changes: the interval doubles from STREAM_POLL_INTERVAL up to
+        STREAM_POLL_MAX_INTERVAL
+      - chat lost its stream, or inside an expected restart window
+        (STREAM_RESTART_TIMES plus the times restarts were seen): every
+        STREAM_POLL_TIGHT seconds, for STREAM_RESTART_WINDOW
+      - a channel with no live stream isn't asked again for
+        STREAM_NEGATIVE_TTL, doubling per miss (ignored while polling tightly)
     """
 
-    def __init__(self, on_stream_found, channel_ids: list[str] | None = None):
+    def __init__(self, on_stream_found, channel_ids: list[str] | None = None,
+                 video_id: str = "", is_live=None):
         self._callback = on_stream_found
         self._channel_ids = channel_ids or []
+        self._is_live = is_live or (lambda: False)
         self._running = False
+        self._stop_event = threading.Event()
         self._thread = None
 
+        self._current = video_id    # stream the chat is on (or connecting to)
+        self._channel = None        # its channel, if we found it ourselves
+        self._interval = STREAM_POLL_INTERVAL
+        self._last_live_at = time.time()  # chat last seen connected (or a switch was made)
+        self._negative: dict[str, tuple[float, int]] = {}  # channel -> (skip until, misses)
+        # Streams we moved away from; a channel page can still list one as live
+        # for a while, and switching back to it would flap
+        self._retired: deque[str] = deque(maxlen=16)
+        self._restart_times = [_clock_seconds(t) for t in STREAM_RESTART_TIMES]
+
+        # Counters
+        self.checks = 0
+        self.changes = 0
+        self.last_detect_latency: float | None = None  # stream lost -> new one found (seconds)
+
     def start(self):
         if not self._channel_ids:
             return
         self._running = True
-        self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread = threading.Thread(target=self._poll_loop, name="stream-watcher", daemon=True)
         self._thread.start()
-        print(f"[Stream] Watcher started, polling every {STREAM_POLL_INTERVAL}s")
+        print(f"[Stream] Watcher started, polling every {STREAM_POLL_INTERVAL}-"
+              f"{STREAM_POLL_MAX_INTERVAL}s ({STREAM_POLL_TIGHT}s around restarts)")
+
+    def stats(self) -> dict:
+        return {
+            "video_id": self._current,
+            "checks": self.checks,
+            "changes": self.changes,
+            "interval": self._interval,
+            "last_detect_latency": self.last_detect_latency,
+            "negative_cached": sorted(c for c, (until, _) in self._negative.items() if until > time.time()),
+        }
 
     def _poll_loop(self):
+        next_check = time.time()
         while self._running:
-            time.sleep(STREAM_POLL_INTERVAL)
+            self._sleep_until(next_check)
             if not self._running:
                 break
-            vid = find_live_video_id(self._channel_ids)
+            now = time.time()
+            next_check = now + self._check(now)
+
+    def _sleep_until(self, deadline: float):
+        """Wait for deadline, but wake up GRACE after the chat loses its stream."""
+        was_live = self._is_live()
+        while self._running:
+            now = time.time()
+            if self._is_live():
+                self._last_live_at = now
+                was_live = True
+            elif was_live:
+                was_live = False
+                deadline = min(deadline, self._last_live_at + STREAM_LIVENESS_GRACE)
+            if now >= deadline:
+                return
+            self._stop_event.wait(min(1.0, deadline - now))
+
+    def _check(self, now: float) -> float:
+        """One round of checks; returns seconds until the next one."""
+        if self._current and now - self._last_live_at < STREAM_LIVENESS_GRACE:
+            # Live (or just switched): only look for a newer broadcast on the same channel
+            if self._channel is not None:
+                vid, _ = find_live_stream([self._channel])
+                self.checks += 1
+                if vid and vid != self._current and vid not in self._retired:
+                    self._switch(vid, self._channel, now, lost=False)
+                    return STREAM_POLL_INTERVAL
+            self._interval = min(self._interval * 2, STREAM_POLL_MAX_INTERVAL)
+            return self._interval
+
+        lost_recently = bool(self._current) and now - self._last_live_at < STREAM_RESTART_WINDOW
+        tight = lost_recently or self._in_restart_window(now)
+        channels = self._channel_ids if tight else [
+            c for c in self._channel_ids if self._negative.get(c, (0.0, 0))[0] <= now
+        ]
+        if channels:
+            vid, channel = find_live_stream(channels)
+            self.checks += 1
+            if vid in self._retired:
+                vid = None
             if vid:
-                print(f"[Stream] Stream detected: {vid}")
-                self._callback(vid)
-                break  # Stop polling once found
+                self._negative.pop(channel, None)
+                if vid != self._current:
+                    self._switch(vid, channel, now, lost=bool(self._current))
+                    return STREAM_POLL_INTERVAL
+                # Same stream: the chat is still reconnecting to it by itself
+            else:
+                for c in channels:
+                    _, misses = self._negative.get(c, (0.0, 0))
+                    ttl = min(STREAM_NEGATIVE_TTL * 2 ** misses, STREAM_POLL_MAX_INTERVAL)
+                    self._negative[c] = (now + ttl, misses + 1)
+
+        if tight:
+            return STREAM_POLL_TIGHT
+        self._interval = min(self._interval * 2, STREAM_POLL_MAX_INTERVAL)
+        return min(self._interval, self._until_restart_window(now))
+
+    def _switch(self, video_id: str, channel_id: str, now: float, lost: bool):
+        if lost:
+            self.last_detect_latency = now - self._last_live_at
+            self._learn_restart(now)
+            print(f"[Stream] New stream detected: {video_id} "
+                  f"({self.last_detect_latency:.0f}s after the last one went offline)")
+        else:
+            print(f"[Stream] Stream detected: {video_id}")
+        if self._current:
+            self._retired.append(self._current)
+        self._current = video_id
+        self._channel = channel_id
+        self._interval = STREAM_POLL_INTERVAL
+        self._last_live_at = now  # give the chat GRACE to connect before calling it lost
+        self.changes += 1
+        self._callback(video_id)
+
+    # ------------------------------------------
+    # RESTART WINDOWS
+    # ------------------------------------------
+    def _learn_restart(self, now: float):
+        """Remember the time of day a broadcast restarted; the show tends to repeat it."""
+        clock = _clock_seconds(now)
+        if not any(_clock_distance(clock, t) <= STREAM_RESTART_WINDOW for t in self._restart_times):
+            self._restart_times = (self._restart_times + [clock])[-8:]
+            print(f"[Stream] Expecting restarts around {time.strftime('%H:%M', time.localtime(now))}")
+
+    def _in_restart_window(self, now: float) -> bool:
+        clock = _clock_seconds(now)
+        return any(_clock_distance(clock, t) <= STREAM_RESTART_WINDOW for t in self._restart_times)
+
+    def _until_restart_window(self, now: float) -> float:
+        clock = _clock_seconds(now)
+        waits = [(t - STREAM_RESTART_WINDOW - clock) % 86400 for t in self._restart_times]
+        return max(min(waits, default=float("inf")), STREAM_POLL_TIGHT)
 
     def stop(self):
         self._running = False
+        self._stop_event.set()
+
+
+def _clock_seconds(when) -> int:
+    """Seconds since local midnight, for a timestamp or an "HH:MM" string."""
+    if isinstance(when, str):
+        hours, minutes = when.split(":")
+        return int(hours) * 3600 + int(minutes) * 60
+    t = time.localtime(when)
+    return t.tm_hour * 3600 + t.tm_min * 60 + t.tm_sec
+
+
+def _clock_distance(a: int, b: int) -> int:
+    d = abs(a - b) % 86400
+    return min(d, 86400 - d)
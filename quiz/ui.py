@@ -19,7 +19,7 @@ from quiz.config import (
     RANK_COLORS, FONT_PATH, MAX_PARTICLES,
     CHAT_FEED_DURATION,
 )
-from quiz.models import GameState, Player, Question, RoundResult, ThemeVoteState, GameEvent
+from quiz.models import GameState, PlayerSnapshot, Question, RoundResult, ThemeVoteState, GameEvent
 
 
 # ==========================================
@@ -151,6 +151,8 @@ class UIManager:
             self.font_large = pygame.font.SysFont("Arial", 44)
             self.font_title = pygame.font.SysFont("Arial", 64)
             self.font_huge = pygame.font.SysFont("Arial", 80)
+        # Debug overlay only; monospace so the latency columns line up
+        self.font_mono = pygame.font.SysFont("consolas,menlo,dejavusansmono,monospace", 16)
 
     def _create_background(self):
         """Pre-render radial gradient background."""
@@ -259,6 +261,11 @@ class UIManager:
         # HUD
         self._draw_hud(data)
 
+        # Debug overlay (F6)
+        debug_lines = data.get("debug_lines")
+        if debug_lines:
+            self._draw_debug_overlay(debug_lines)
+
         # Particles
         self._update_and_draw_particles(dt)
         self._update_and_draw_sparkles(dt)
@@ -714,7 +721,7 @@ class UIManager:
     # LEADERBOARD STATE
     # ------------------------------------------
     def _draw_leaderboard(self, data, fade):
-        top_players: list[Player] = data.get("leaderboard", [])
+        top_players: list[PlayerSnapshot] = data.get("leaderboard", [])
         round_count = data.get("round_count", 0)
         player_count = data.get("player_count", 0)
         changes = data.get("leaderboard_changes", [])
@@ -1245,6 +1252,18 @@ class UIManager:
             f"{pc} Players", self.font_small, COLOR_TEXT_SECONDARY, (rx, y),
         )
 
+    def _draw_debug_overlay(self, lines: list[str]):
+        line_h = self.font_mono.get_linesize()
+        rendered = [self.font_mono.render(line, True, COLOR_TEXT_PRIMARY) for line in lines]
+        w = max(r.get_width() for r in rendered) + 24
+        h = line_h * len(rendered) + 16
+        panel = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.rect(panel, (*COLOR_HUD_BG, 220), (0, 0, w, h), border_radius=6)
+        x, y = 16, SCREEN_HEIGHT - h - 16
+        self.screen.blit(panel, (x, y))
+        for i, r in enumerate(rendered):
+            self.screen.blit(r, (x + 12, y + 8 + i * line_h))
+
     # ------------------------------------------
     # PARTICLES
     # ------------------------------------------
@@ -0,0 +1,178 @@
+"""
+Benchmark the channel page check: full-page regexes vs the streaming PageScanner.
+
+Works on saved pages, named <anything>-live.html or <anything>-streams.html
+after the tab they came from. For each page it reports the bytes each
+approach reads and the CPU time per check, and that both find the same video.
+"stream read" includes the tail read to keep the connection (marked "keep");
+pages with more than stream._DRAIN_MAX left drop it and reconnect next poll.
+
+Usage:
+    python scripts/bench_channel_page.py --save data/page_fixtures      # fetch CHANNEL_IDS' tabs
+    python scripts/bench_channel_page.py --synthesize data/page_fixtures
+    python scripts/bench_channel_page.py data/page_fixtures
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz import stream  # noqa: E402
+from quiz.config import CHANNEL_IDS  # noqa: E402
+
+# The previous implementation: decode the whole page, then up to five searches over it
+_VIDEO_ID_RE = re.compile(r'"videoId"\s*:\s*"([a-zA-Z0-9_-]{11})"')
+_IS_LIVE_RE = re.compile(r'"isLive"\s*:\s*true', re.IGNORECASE)
+_IS_LIVE_NOW_RE = re.compile(r'"isLiveNow"\s*:\s*true', re.IGNORECASE)
+_LIVE_BADGE_RE = re.compile(r'BADGE_STYLE_TYPE_LIVE_NOW')
+
+
+def full_page_check(page: bytes, tab: str) -> tuple[str | None, int]:
+    text = page.decode("utf-8")
+    match = _VIDEO_ID_RE.search(text)
+    if not match:
+        return None, len(page)
+    is_live_now = bool(_IS_LIVE_NOW_RE.search(text) or _IS_LIVE_RE.search(text))
+    has_live_badge = bool(_LIVE_BADGE_RE.search(text))
+    if tab == "live" or is_live_now or has_live_badge:
+        return match.group(1), len(page)
+    return None, len(page)
+
+
+def streaming_check(page: bytes, tab: str) -> tuple[str | None, int, bool]:
+    scanner = stream.PageScanner(tab)
+    for i in range(0, len(page), stream._CHUNK_SIZE):
+        if scanner.feed(page[i:i + stream._CHUNK_SIZE]):
+            break
+    left = len(page) - scanner.bytes_read
+    keep = left <= stream._DRAIN_MAX  # _drain, for a page sent with Content-Length
+    return scanner.video_id, scanner.bytes_read + (left if keep else 0), keep
+
+
+def cpu_time(fn, page: bytes, tab: str, reps: int) -> float:
+    best = float("inf")
+    for _ in range(reps):
+        start = time.process_time()
+        fn(page, tab)
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def bench(directory: str, reps: int):
+    names = sorted(n for n in os.listdir(directory) if n.endswith(("-live.html", "-streams.html")))
+    if not names:
+        sys.exit(f"no <name>-live.html / <name>-streams.html pages in {directory}")
+    total = {"full": [0, 0.0], "stream": [0, 0.0]}
+    reconnects = 0
+    print(f"{'page':<32} {'answer':<13} {'full read':>10} {'stream read':>17} "
+          f"{'full cpu':>9} {'stream cpu':>11}")
+    for name in names:
+        tab = "live" if name.endswith("-live.html") else "streams"
+        with open(os.path.join(directory, name), "rb") as f:
+            page = f.read()
+        full_vid, full_bytes = full_page_check(page, tab)
+        vid, read, keep = streaming_check(page, tab)
+        reconnects += not keep
+        full_cpu = cpu_time(full_page_check, page, tab, reps)
+        stream_cpu = cpu_time(streaming_check, page, tab, reps)
+        note = "" if vid == full_vid else f"  (full-page check says {full_vid})"
+        print(f"{name:<32} {str(vid):<13} {full_bytes / 1024:8.0f}KB "
+              f"{read / 1024:10.0f}KB {'keep' if keep else 'drop':>4} "
+              f"{full_cpu * 1000:7.2f}ms {stream_cpu * 1000:9.2f}ms{note}")
+        total["full"][0] += full_bytes
+        total["full"][1] += full_cpu
+        total["stream"][0] += read
+        total["stream"][1] += stream_cpu
+    (fb, fc), (sb, sc) = total["full"], total["stream"]
+    print(f"per poll of all {len(names)} pages: read {fb / 1024:.0f}KB -> {sb / 1024:.0f}KB "
+          f"({fb / max(sb, 1):.1f}x less), cpu {fc * 1000:.2f}ms -> {sc * 1000:.2f}ms "
+          f"({fc / max(sc, 1e-9):.1f}x less), {reconnects} of {len(names)} connections dropped")
+
+
+def save(directory: str):
+    """Download every configured channel's /live and /streams page as-is."""
+    import requests
+    os.makedirs(directory, exist_ok=True)
+    for cid in CHANNEL_IDS:
+        for tab in ("live", "streams"):
+            resp = requests.get(f"https://www.youtube.com/channel/{cid}/{tab}", timeout=30,
+                                headers=stream._HEADERS, cookies=stream._COOKIES)
+            path = os.path.join(directory, f"{cid}-{tab}.html")
+            with open(path, "wb") as f:
+                f.write(resp.content)
+            print(f"[Bench] {path}: HTTP {resp.status_code}, {len(resp.content) / 1024:.0f}KB")
+
+
+def synthesize(directory: str, seed: int):
+    """
+    Write YouTube-shaped pages (~1.2 MB of inline JSON each): a live watch
+    page, a /live redirect to the channel home, and /streams grids with and
+    without a live stream on top.
+    """
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-"
+
+    def vid():
+        return "".join(rng.choice(alphabet) for _ in range(11))
+
+    def filler(size):
+        words = ["responseContext", "serviceTrackingParams", "clickTrackingParams",
+                 "commandMetadata", "webCommandMetadata", "accessibilityData", "label"]
+        out, n = [], 0
+        while n < size:
+            part = f'"{rng.choice(words)}":"{"".join(rng.choice(alphabet) for _ in range(40))}",'
+            out.append(part)
+            n += len(part)
+        return "".join(out)
+
+    def grid_item(video, live):
+        badge = ('"badges":[{"metadataBadgeRenderer":{"style":"BADGE_STYLE_TYPE_LIVE_NOW",'
+                 '"label":"LIVE"}}],' if live else "")
+        return ('{"gridVideoRenderer":{"videoId":"%s","thumbnail":{%s},%s"navigationEndpoint":'
+                '{"watchEndpoint":{"videoId":"%s"}},%s}},' % (video, filler(600), badge, video, filler(9000)))
+
+    def page(body):
+        head = "<!DOCTYPE html><html><head>" + "<script>" + filler(250_000) + "</script></head><body>"
+        return (head + "<script>var ytInitialData = {" + body + filler(600_000) + "};</script></body></html>")
+
+    live_vid = vid()
+    pages = {
+        "watch-live": page('"videoDetails":{"videoId":"%s",%s"isLiveContent":true},'
+                           '"microformat":{%s"isLiveNow":true},' % (live_vid, filler(20_000), filler(30_000))),
+        "home-live": page("".join(grid_item(vid(), False) for _ in range(30))),
+        "with-live-streams": page("".join(grid_item(vid(), i == 0) for i in range(30))),
+        "offline-streams": page("".join(grid_item(vid(), False) for _ in range(30))),
+    }
+    os.makedirs(directory, exist_ok=True)
+    for name, html in pages.items():
+        path = os.path.join(directory, f"synthetic-{name}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"[Bench] Wrote {path} ({len(html) / 1024:.0f}KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", help="directory of saved pages")
+    parser.add_argument("--save", metavar="DIR", help="download the configured channels' pages into DIR")
+    parser.add_argument("--synthesize", metavar="DIR", help="write synthetic pages into DIR")
+    parser.add_argument("--reps", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if args.save:
+        save(args.save)
+    elif args.synthesize:
+        synthesize(args.synthesize, args.seed)
+    elif args.path:
+        bench(args.path, args.reps)
+    else:
+        parser.error("give a directory of saved pages, or --save/--synthesize DIR")
+
+
+if __name__ == "__main__":
+    main()
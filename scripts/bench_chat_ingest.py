@@ -0,0 +1,136 @@
+"""
+Benchmark: game frame times while chat is being ingested at a high rate.
+
+Renders a 1920x1080 frame budget-limited loop (shapes, text and a full-frame
+pixel grab, like UIManager.draw + send_frame) and drains the chat ring each
+frame, while a flood source emits pytchat-style JSON chat items (parsed and
+normalized by the ingestor) at --rate messages/s. Runs three passes: no chat,
+ingestor as a thread in this interpreter, ingestor in its own process.
+
+Usage:
+    python scripts/bench_chat_ingest.py
+    python scripts/bench_chat_ingest.py --rate 2000 --seconds 10
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+
+from quiz.chat import ChatManager  # noqa: E402
+from quiz.chat_sources import ChatSource  # noqa: E402
+from quiz.config import CHAT_BATCH_MAX, SCREEN_WIDTH, SCREEN_HEIGHT, FPS  # noqa: E402
+from quiz.log import setup_logging, shutdown_logging  # noqa: E402
+
+
+class FloodSource(ChatSource):
+    """Picklable chat source: `rate` pytchat-like items per second, emitted in 100ms polls."""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+
+    def run(self, ingestor):
+        rng = random.Random(1)
+        poll = 0.1
+        per_poll = max(1, int(self.rate * poll))
+        next_poll = time.perf_counter()
+        while ingestor.running:
+            # One "HTTP response" worth of items, as JSON, like pytchat's parser sees it
+            payload = json.dumps([
+                {"author": {"name": f"viewer{rng.randrange(50_000)}"},
+                 "message": rng.choice(("1", "2!", " 3 ", "4", "!vote 2", "gg lol", "B"))}
+                for _ in range(per_poll)
+            ])
+            for item in json.loads(payload):
+                ingestor.emit(item["author"]["name"], item["message"])
+            next_poll += poll
+            time.sleep(max(0.0, next_poll - time.perf_counter()))
+
+
+def _frame(screen, font, t: int):
+    screen.fill((12, 12, 30))
+    for i in range(120):
+        x = (i * 97 + t * 3) % SCREEN_WIDTH
+        pygame.draw.rect(screen, (40 + i, 80, 160), (x, (i * 53) % SCREEN_HEIGHT, 140, 60), border_radius=8)
+    for i in range(12):
+        screen.blit(font.render(f"Leaderboard row {i}: {t * 7 + i}", True, (255, 255, 255)), (60, 80 + i * 60))
+    pygame.image.tobytes(screen, "RGB")  # what the broadcaster grabs per frame
+
+
+def run_pass(label: str, seconds: float, manager: ChatManager | None) -> dict:
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    font = pygame.font.Font(None, 42)
+    clock = pygame.time.Clock()
+    if manager is not None:
+        manager.start()
+        time.sleep(1.0)  # let the ingestor spin up (and the process import its modules)
+        manager.drain(10 ** 9)
+
+    times = []
+    drained = 0
+    end = time.perf_counter() + seconds
+    t = 0
+    while time.perf_counter() < end:
+        clock.tick(FPS)
+        start = time.perf_counter()
+        if manager is not None:
+            drained += len(manager.drain(CHAT_BATCH_MAX))
+        _frame(screen, font, t)
+        times.append((time.perf_counter() - start) * 1000.0)
+        t += 1
+
+    dropped = collapsed = shed = 0
+    if manager is not None:
+        dropped, collapsed, shed = manager.dropped_count, manager.collapsed_count, manager.shed_count
+        manager.stop()
+    times.sort()
+    return {
+        "label": label,
+        "frames": len(times),
+        "p50": statistics.median(times),
+        "p99": times[int(len(times) * 0.99) - 1],
+        "max": times[-1],
+        "msgs_per_s": drained / seconds,
+        "dropped": dropped,
+        "collapsed": collapsed,
+        "shed": shed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=int, default=2000, help="chat messages per second")
+    parser.add_argument("--seconds", type=float, default=8.0)
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING", log_file="")  # keep per-message chat logs out of the numbers
+    pygame.init()
+    results = [
+        run_pass("no chat", args.seconds, None),
+        run_pass("thread ingestor", args.seconds,
+                 ChatManager("", use_process=False, source=FloodSource(args.rate))),
+        run_pass("process ingestor", args.seconds,
+                 ChatManager("", use_process=True, source=FloodSource(args.rate))),
+    ]
+    pygame.quit()
+    shutdown_logging()
+
+    print(f"frame work at {args.rate} chat msgs/s ({os.cpu_count()} CPU(s)):")
+    for r in results:
+        print(f"  {r['label']:<17} frames {r['frames']:5d} | p50 {r['p50']:6.2f}ms | "
+              f"p99 {r['p99']:6.2f}ms | max {r['max']:6.2f}ms | "
+              f"drained {r['msgs_per_s']:7.0f} msg/s | collapsed {r['collapsed']} | "
+              f"shed {r['shed']} | dropped {r['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: game-thread time per captured stream frame.
+
+Compares the previous capture (pygame.image.tobytes(surface, "RGB") into a
+queue) with FrameRing.capture (one copy of the display's native pixels into
+a preallocated buffer), on a 1920x1080 display surface with a typical frame
+drawn on it. A writer thread drains both paths to a pipe, as the broadcaster's
+writer does, so buffers are recycled like in a real stream.
+
+Usage:
+    python scripts/bench_frame_capture.py
+    python scripts/bench_frame_capture.py --frames 600
+"""
+
+import argparse
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+
+from quiz.broadcaster import FrameRing  # noqa: E402
+from quiz.config import SCREEN_WIDTH, SCREEN_HEIGHT  # noqa: E402
+
+
+def _draw(screen, font, t: int):
+    screen.fill((12, 12, 30))
+    for i in range(60):
+        x = (i * 97 + t * 3) % SCREEN_WIDTH
+        pygame.draw.rect(screen, (40 + i, 80, 160), (x, (i * 53) % SCREEN_HEIGHT, 140, 60), border_radius=8)
+    screen.blit(font.render(f"Question {t}", True, (255, 255, 255)), (60, 80))
+
+
+def _drain_to_devnull(frames: queue.Queue, write):
+    with open(os.devnull, "wb", buffering=0) as sink:
+        while True:
+            item = frames.get()
+            if item is None:
+                return
+            write(sink, item)
+
+
+def bench_tobytes(screen, font, n: int) -> list[float]:
+    frames = queue.Queue(maxsize=8)  # the old queue held up to 8 bytes objects
+    writer = threading.Thread(target=_drain_to_devnull, args=(frames, lambda sink, raw: sink.write(raw)))
+    writer.start()
+    times = []
+    for t in range(n):
+        _draw(screen, font, t)
+        start = time.perf_counter()
+        try:
+            frames.put_nowait(pygame.image.tobytes(screen, "RGB"))
+        except queue.Full:
+            pass
+        times.append((time.perf_counter() - start) * 1000.0)
+        time.sleep(1 / 30)
+    frames.put(None)
+    writer.join()
+    return times
+
+
+def bench_ring(screen, font, n: int) -> tuple[list[float], str]:
+    ring = FrameRing(SCREEN_WIDTH, SCREEN_HEIGHT, screen)
+    frames = queue.Queue()
+
+    def write(sink, slot):
+        sink.write(ring.view(slot))
+        ring.release(slot)
+
+    writer = threading.Thread(target=_drain_to_devnull, args=(frames, write))
+    writer.start()
+    times = []
+    for t in range(n):
+        _draw(screen, font, t)
+        start = time.perf_counter()
+        slot = ring.capture(screen)
+        if slot is not None:
+            frames.put(slot)
+        times.append((time.perf_counter() - start) * 1000.0)
+        time.sleep(1 / 30)
+    frames.put(None)
+    writer.join()
+    return times, ring.pix_fmt
+
+
+def _summary(times: list[float]) -> str:
+    times = sorted(times)
+    return (f"p50 {statistics.median(times):6.2f}ms | p99 {times[int(len(times) * 0.99) - 1]:6.2f}ms | "
+            f"max {times[-1]:6.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    font = pygame.font.Font(None, 42)
+    before = bench_tobytes(screen, font, args.frames)
+    after, pix_fmt = bench_ring(screen, font, args.frames)
+    pygame.quit()
+
+    print(f"game-thread time per captured {SCREEN_WIDTH}x{SCREEN_HEIGHT} frame ({args.frames} frames):")
+    print(f"  tobytes RGB + queue     {_summary(before)}")
+    print(f"  {'FrameRing (' + pix_fmt + ')':<23} {_summary(after)}")
+
+
+if __name__ == "__main__":
+    main()
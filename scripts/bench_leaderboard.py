@@ -0,0 +1,87 @@
+"""
+Benchmark: leaderboard (top-N) cost vs. lifetime player count.
+
+Compares the old full sort over every player against the incrementally
+maintained ScoreIndex. Index top-N should stay flat as the population grows,
+and rank lookups (the "score" chat command) should stay in microseconds.
+
+Usage:
+    python scripts/bench_leaderboard.py
+    python scripts/bench_leaderboard.py --sizes 10000 100000 --no-sort
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz.ranking import ScoreIndex  # noqa: E402
+
+TOP_N = 10
+REPEATS = 200
+SORT_LIMIT = 1_000_000  # full sort above this is too slow to be worth waiting for
+
+
+def _time_per_call(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def bench(size: int, with_sort: bool):
+    rng = random.Random(size)
+    scores = {f"user{i}": rng.randint(0, 20000) for i in range(size)}
+
+    t0 = time.perf_counter()
+    index = ScoreIndex(scores.items())
+    build_s = time.perf_counter() - t0
+
+    top_s = _time_per_call(lambda: index.top(TOP_N), REPEATS)
+
+    probes = rng.sample(list(scores.items()), min(1000, size))
+
+    def _ranks():
+        for name, score in probes:
+            index.rank(name, score)
+
+    rank_s = _time_per_call(_ranks, 5) / len(probes)
+
+    # One round of score updates for 1k answering players
+    names = rng.sample(list(scores), min(1000, size))
+
+    def _round():
+        for name in names:
+            old = scores[name]
+            scores[name] = old + 20
+            index.update(name, old, old + 20)
+
+    update_s = _time_per_call(_round, 5) / len(names)
+
+    line = (f"{size:>10,} players | build {build_s:7.2f}s | "
+            f"top-{TOP_N} {top_s * 1e6:8.1f}us | rank {rank_s * 1e6:6.2f}us | "
+            f"update {update_s * 1e6:6.2f}us")
+    if with_sort and size <= SORT_LIMIT:
+        sort_s = _time_per_call(
+            lambda: sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N], 3,
+        )
+        line += f" | full sort {sort_s * 1e3:9.1f}ms"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--no-sort", action="store_true",
+                        help="skip the full-sort baseline")
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size, with_sort=not args.no_sort)
+
+
+if __name__ == "__main__":
+    main()
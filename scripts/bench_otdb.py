@@ -0,0 +1,84 @@
+"""
+Load test: OTDB client against the local stand-in server (no network needed).
+
+Queues a mix of speculative and urgent fetches, lets the client pace them
+through its token bucket, and reports completion order, latency, throttling
+and how many TCP connections the pooled session opened.
+
+Usage:
+    python scripts/bench_otdb.py
+    python scripts/bench_otdb.py --interval 0.2 --client-interval 0.15 --latency 0.02
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from otdb_standin import make_server  # noqa: E402
+from quiz.otdb import OTDBClient  # noqa: E402
+
+SPECULATIVE_CATEGORIES = [15, 17, 18, 21, 22, 23]
+URGENT_CATEGORIES = [9, 27]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--interval", type=float, default=0.2,
+                        help="stand-in server's per-IP request interval (s)")
+    parser.add_argument("--client-interval", type=float, default=None,
+                        help="client token bucket interval (s); below --interval forces code 5 retries")
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    client_interval = args.interval * 1.1 if args.client_interval is None else args.client_interval
+
+    server = make_server(0, args.interval, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    client = OTDBClient(f"{base}/api.php", f"{base}/api_token.php", interval=client_interval)
+    client.start()
+
+    order = []
+    done = threading.Event()
+    expected = args.rounds * (len(SPECULATIVE_CATEGORIES) + len(URGENT_CATEGORIES))
+
+    def on_questions(cid, questions):
+        order.append((cid, len(questions)))
+        if len(order) == expected:
+            done.set()
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for cid in SPECULATIVE_CATEGORIES:
+            while not client.request(cid, on_questions, urgent=False):
+                time.sleep(0.001)  # previous fetch for this category still queued
+        # Urgent requests arrive after the speculative ones but must go first
+        for cid in URGENT_CATEGORIES:
+            while not client.request(cid, on_questions, urgent=True):
+                time.sleep(0.001)
+    done.wait(timeout=expected * client_interval * 10 + 10)
+    elapsed = time.perf_counter() - start
+    client.stop()
+    server.shutdown()
+
+    stats = client.stats
+    state = server.state
+    print(f"completed {len(order)}/{expected} fetches in {elapsed:.2f}s "
+          f"({len(order) / elapsed:.1f} req/s; bucket interval {client_interval:.2f}s)")
+    print(f"first completions: {[cid for cid, _ in order[:len(URGENT_CATEGORIES) + 1]]} "
+          f"(urgent: {URGENT_CATEGORIES})")
+    print(f"hits {stats['hits']}  misses {stats['misses']}  throttled {stats['throttled']}  "
+          f"retries {stats['retries']}  errors {stats['errors']}")
+    print(f"latency avg {stats['avg_ms']:.1f}ms  max {stats['max_ms']:.1f}ms  "
+          f"bucket waits {stats['bucket_waits']} ({stats['bucket_wait_s']:.2f}s)")
+    print(f"server: {state.served} questions served, {state.rate_limited} rate-limited, "
+          f"{state.connections} TCP connection(s)")
+
+
+if __name__ == "__main__":
+    main()
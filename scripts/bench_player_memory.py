@@ -0,0 +1,116 @@
+"""
+Benchmark: resident memory per million players.
+
+Compares the old per-instance @dataclass Player (with the ad-hoc
+_rank_changed/_was_comeback/_shield_used attributes attached during play)
+against the struct-of-arrays PlayerStore. Each variant runs in a fresh
+subprocess so RSS numbers don't bleed into each other.
+
+Usage:
+    python scripts/bench_player_memory.py
+    python scripts/bench_player_memory.py --count 2000000
+"""
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@dataclass
+class _LegacyPlayer:
+    """The pre-PlayerStore model, reproduced for the baseline."""
+    username: str
+    score: int = 0
+    streak: int = 0
+    best_streak: int = 0
+    rank: str = "Bronze"
+    games_played: int = 0
+    correct_answers: int = 0
+    wrong_answers: int = 0
+    wrong_streak: int = 0
+    participation_streak: int = 0
+    streak_shield: bool = False
+    last_seen: float = field(default_factory=time.time)
+
+
+def _rss_bytes() -> int:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        raise SystemExit("Need psutil (pip install psutil) to read RSS on this platform")
+
+
+def _build_legacy(count: int):
+    players = {}
+    for i in range(count):
+        name = f"viewer_{i:08d}"
+        p = _LegacyPlayer(username=name, score=i % 5000, streak=i % 7,
+                          games_played=i % 300, correct_answers=i % 150)
+        p._rank_changed = False
+        p._was_comeback = False
+        p._shield_used = False
+        players[name] = p
+    return players
+
+
+def _build_store(count: int):
+    from quiz.models import PlayerStore
+    store = PlayerStore(capacity=count)
+    for i in range(count):
+        store.add(f"viewer_{i:08d}", score=i % 5000, streak=i % 7,
+                  games_played=i % 300, correct_answers=i % 150)
+    return store
+
+
+def _measure(variant: str, count: int):
+    if variant == "store":
+        import numpy  # noqa: F401  (keep library load out of the delta)
+        import quiz.models  # noqa: F401
+    gc.collect()
+    before = _rss_bytes()
+    t0 = time.perf_counter()
+    keep = _build_legacy(count) if variant == "dataclass" else _build_store(count)
+    build_s = time.perf_counter() - t0
+    gc.collect()
+    after = _rss_bytes()
+    per_million = (after - before) / count * 1_000_000
+    print(f"{variant:>10}: {count:,} players, +{(after - before) / 2**20:8.1f} MiB "
+          f"({per_million / 2**20:7.1f} MiB per million, {(after - before) / count:6.1f} B/player), "
+          f"built in {build_s:.2f}s")
+    del keep
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--variant", choices=["dataclass", "store"],
+                        help=argparse.SUPPRESS)  # internal: run one variant in-process
+    args = parser.parse_args()
+
+    if args.variant:
+        _measure(args.variant, args.count)
+        return
+
+    for variant in ("dataclass", "store"):
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__),
+             "--variant", variant, "--count", str(args.count)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Micro-benchmark: serving questions with 100k of them cached.
+
+Compares the old in-memory list (pop(0), full reshuffle per fetched batch,
+seen-dict rebuilt on every purge) with the question bank (index lookup per
+pop) and its time-ordered seen-set (incremental expiry).
+
+Usage:
+    python scripts/bench_questions.py
+    python scripts/bench_questions.py --count 100000 --pops 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz.config import OTDB_BATCH_SIZE, OTDB_SEEN_EXPIRY  # noqa: E402
+from quiz.models import Question  # noqa: E402
+from quiz.question_bank import QuestionBank  # noqa: E402
+
+CATEGORIES = list(range(9, 33))
+
+
+def _questions(count: int) -> list[Question]:
+    return [
+        Question(f"Question {i}?", f"Right {i}", [f"Right {i}", "W1", "W2", "W3"], 0,
+                 "Bench", ("easy", "medium", "hard")[i % 3])
+        for i in range(count)
+    ]
+
+
+def bench_legacy(questions: list[Question], pops: int) -> tuple[float, float]:
+    """Old QuizLogic behaviour. Returns (us per pop, us per fetched batch)."""
+    cache = list(questions)
+    now = time.time()
+    # A full 4h window of seen entries, half of them about to expire
+    seen = {f"seen {i}": now - OTDB_SEEN_EXPIRY * (i % 2) for i in range(len(questions))}
+
+    start = time.perf_counter()
+    for _ in range(pops):
+        q = cache.pop(0)
+        seen[q.text] = time.time()
+    pop_s = (time.perf_counter() - start) / pops
+
+    batch = _questions(OTDB_BATCH_SIZE)
+    start = time.perf_counter()
+    rounds = 20
+    for _ in range(rounds):
+        t = time.time()
+        seen = {h: ts for h, ts in seen.items() if t - ts < OTDB_SEEN_EXPIRY}
+        fresh = [q for q in batch if q.text not in seen]
+        cache.extend(fresh)
+        random.shuffle(cache)
+    batch_s = (time.perf_counter() - start) / rounds
+    return pop_s * 1e6, batch_s * 1e6
+
+
+def bench_bank(questions: list[Question], pops: int) -> tuple[float, float, float]:
+    """Question bank. Returns (us per pop, us per banked batch, us per seen-set check)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = QuestionBank(os.path.join(tmp, "bank.db"))
+        per_cat = len(questions) // len(CATEGORIES)
+        for i, cid in enumerate(CATEGORIES):
+            bank.add(questions[i * per_cat:(i + 1) * per_cat], cid)
+
+        start = time.perf_counter()
+        for i in range(pops):
+            bank.take(CATEGORIES[i % len(CATEGORIES)])
+        pop_s = (time.perf_counter() - start) / pops
+
+        rounds = 20
+        start = time.perf_counter()
+        for r in range(rounds):
+            batch = [Question(f"New {r}-{i}?", "A", ["A", "B", "C", "D"], 0, "Bench", "easy")
+                     for i in range(OTDB_BATCH_SIZE)]
+            bank.add(batch, CATEGORIES[r % len(CATEGORIES)])
+        batch_s = (time.perf_counter() - start) / rounds
+
+        # Seen-set with a full window of entries: checks stay O(1)
+        now = time.time()
+        for i in range(len(questions)):
+            bank._seen[f"seen {i}"] = now
+        start = time.perf_counter()
+        checks = 10_000
+        for i in range(checks):
+            bank.is_seen(f"seen {i}")
+        seen_s = (time.perf_counter() - start) / checks
+        bank.close()
+    return pop_s * 1e6, batch_s * 1e6, seen_s * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--pops", type=int, default=2_000)
+    args = parser.parse_args()
+
+    questions = _questions(args.count)
+    legacy_pop, legacy_batch = bench_legacy(questions, args.pops)
+    bank_pop, bank_batch, seen_check = bench_bank(questions, args.pops)
+    print(f"{args.count:,} cached questions")
+    print(f"  list cache : pop {legacy_pop:9.1f}us | fetched batch (purge+shuffle) {legacy_batch:10.1f}us")
+    print(f"  bank       : pop {bank_pop:9.1f}us | banked batch {bank_batch:27.1f}us | "
+          f"seen check {seen_check:.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: round resolution throughput (answers/sec), scalar vs vectorized.
+
+Builds two identical databases, plays the same rounds through the per-player
+scoring loop and through the batch path, checks that scores, player columns,
+round results and events come out the same, then reports answers/sec.
+
+Usage:
+    python scripts/bench_resolve.py
+    python scripts/bench_resolve.py --answers 1000 10000 100000 --rounds 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quiz.otdb  # noqa: E402
+from quiz.db import QuizDatabase  # noqa: E402
+from quiz.logic import QuizLogic  # noqa: E402
+from quiz.models import Question  # noqa: E402
+from quiz.question_bank import QuestionBank  # noqa: E402
+
+quiz.otdb.requests = None  # keep the question fetcher offline
+
+# Columns compared between the two paths (last_seen is wall-clock, so skipped)
+_COLUMNS = ("score", "streak", "best_streak", "rank", "games_played",
+            "correct_answers", "wrong_answers", "wrong_streak", "streak_shield")
+
+
+def _make_logic(path: str, players: int, seed: int) -> QuizLogic:
+    db = QuizDatabase(path)
+    rng = random.Random(seed)
+    for i in range(players):
+        p = db.get_or_create_player(f"viewer{i}")
+        p.add_score(rng.randint(0, 6000))
+        p.streak = rng.choice((0, 0, 1, 2, 4, 9, 24))
+        p.wrong_streak = rng.choice((0, 0, 0, 1, 3))
+        p.streak_shield = rng.random() < 0.2
+        p.games_played = rng.randint(0, 120)
+        p.correct_answers = rng.randint(0, 3)
+        db.mark_dirty(p.username)
+    db.save_all()
+    return QuizLogic(db, QuestionBank(path + ".bank"))
+
+
+def _play_round(logic: QuizLogic, rng: random.Random, answers: int, players: int, batch: bool):
+    logic.current_question = Question("Q?", "A", ["A", "B", "C", "D"], 0, "Bench", "easy")
+    logic.question_start_time = 1000.0
+    logic.mini_event = rng.choice(("", "", "lightning"))
+    logic.is_double_points = rng.random() < 0.3
+    logic._clear_answers()
+    for name in rng.sample(range(players), answers):
+        logic._set_answer(f"viewer{name}", rng.randrange(4), 1000.0 + rng.uniform(0, 20))
+    logic.event_feed.clear()
+    logic.sound_queue.clear()
+
+    start = time.perf_counter()
+    if batch:
+        correct, wrong = logic._score_answers_batch(0)
+    else:
+        correct, wrong = logic._score_answers(0)
+    elapsed = time.perf_counter() - start
+    events = [(e.text, e.icon) for e in logic.event_feed]
+    return elapsed, (correct, wrong, events, list(logic.sound_queue))
+
+
+def _columns(logic: QuizLogic, players: int) -> list[tuple]:
+    db = logic.db
+    out = []
+    for i in range(players):
+        p = db.get_player(f"viewer{i}")
+        out.append(tuple(getattr(db.store, c)[p.row].item() for c in _COLUMNS))
+    return out
+
+
+def _top(logic: QuizLogic) -> list[tuple]:
+    return [(p.username, p.score) for p in logic.db.get_top_players(10)]
+
+
+def bench(answers: int, rounds: int):
+    players = answers * 2
+    with tempfile.TemporaryDirectory() as tmp:
+        scalar = _make_logic(os.path.join(tmp, "scalar.db"), players, answers)
+        batch = _make_logic(os.path.join(tmp, "batch.db"), players, answers)
+        totals = {False: 0.0, True: 0.0}
+        for r in range(rounds):
+            t_s, out_s = _play_round(scalar, random.Random(r), answers, players, batch=False)
+            t_b, out_b = _play_round(batch, random.Random(r), answers, players, batch=True)
+            if out_s != out_b:
+                raise SystemExit(f"round {r}: results differ between scalar and batch paths")
+            totals[False] += t_s
+            totals[True] += t_b
+        if _columns(scalar, players) != _columns(batch, players):
+            raise SystemExit("player columns differ between scalar and batch paths")
+        if _top(scalar) != _top(batch):
+            raise SystemExit("leaderboards differ between scalar and batch paths")
+        scalar.db.close()
+        batch.db.close()
+
+    n = answers * rounds
+    print(f"{answers:>8,} answers/round | scalar {n / totals[False]:>12,.0f} answers/s | "
+          f"batch {n / totals[True]:>12,.0f} answers/s | "
+          f"speedup {totals[False] / totals[True]:5.1f}x | identical")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answers", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    for answers in args.answers:
+        bench(answers, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
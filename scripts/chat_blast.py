@@ -0,0 +1,61 @@
+"""
+Load tool: blast chat lines at the game's TCP chat source.
+
+Start the game with `python -m quiz.game --chat-source tcp`, then:
+
+    python scripts/chat_blast.py --rate 2000 --seconds 60 --users 5000
+    python scripts/chat_blast.py --rate 0 --count 100000     # as fast as possible
+
+Messages are mostly answers ("1"-"4"), with some votes, commands and spam,
+from --users distinct viewers. Sent in IRC-like PRIVMSG lines.
+"""
+
+import argparse
+import random
+import socket
+import time
+
+_MESSAGES = ["1", "2", "3", "4"] * 8 + ["!vote 2", "B", "c!", "gg", "lol what", "reset", "!rank"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6667)
+    parser.add_argument("--rate", type=float, default=2000, help="messages per second (0 = unthrottled)")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--count", type=int, default=0, help="stop after this many messages (0 = use --seconds)")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sock = socket.create_connection((args.host, args.port))
+    tick = 0.01  # send in 10ms slices
+    per_tick = max(1, round(args.rate * tick)) if args.rate else 1000
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    next_tick = start
+    while True:
+        if args.count and sent >= args.count:
+            break
+        if not args.count and time.perf_counter() >= deadline:
+            break
+        n = per_tick if not args.count else min(per_tick, args.count - sent)
+        lines = [
+            f":viewer{rng.randrange(args.users)} PRIVMSG #quiz :{rng.choice(_MESSAGES)}\r\n"
+            for _ in range(n)
+        ]
+        sock.sendall("".join(lines).encode("utf-8"))
+        sent += n
+        if args.rate:
+            next_tick += tick
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
+    sock.close()
+    elapsed = time.perf_counter() - start
+    print(f"[Blast] Sent {sent} messages in {elapsed:.2f}s ({sent / elapsed:.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Local stand-in for the Open Trivia DB API, for offline testing.
+
+Serves /api.php and /api_token.php with OTDB's response format, including
+per-IP rate limiting (response_code 5), session tokens that run dry
+(response_code 4) and optional artificial latency. Keep-alive is on, so the
+client's pooled session can be exercised the same way as against OTDB.
+
+Usage:
+    python scripts/otdb_standin.py --port 8765 --interval 5
+    (then point OTDBClient at http://127.0.0.1:8765/api.php)
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_CATEGORIES = {
+    9: "General Knowledge", 15: "Entertainment: Video Games", 17: "Science & Nature",
+    18: "Science: Computers", 21: "Sports", 22: "Geography", 23: "History", 27: "Animals",
+}
+# Questions per category available to one token before it runs dry
+_POOL_SIZE = 200
+
+
+class StandinState:
+    def __init__(self, interval: float, latency: float):
+        self.interval = interval
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.last_request: dict[str, float] = {}  # client ip -> time of last accepted request
+        self.tokens: dict[str, dict] = {}  # token -> {category: questions served}
+        self.served = 0
+        self.rate_limited = 0
+        self.connections = 0
+
+
+def _question(category_id: int, n: int) -> dict:
+    name = _CATEGORIES.get(category_id, f"Category {category_id}")
+    return {
+        "type": "multiple",
+        "difficulty": ("easy", "medium", "hard")[n % 3],
+        "category": name,
+        "question": f"Stand-in question #{n} about {name} &amp; friends?",
+        "correct_answer": f"Right {n}",
+        "incorrect_answers": [f"Wrong {n}a", f"Wrong {n}b", f"Wrong {n}c"],
+    }
+
+
+def make_handler(state: StandinState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            with state.lock:
+                state.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, payload: dict):
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if state.latency:
+                time.sleep(state.latency)
+            if url.path.endswith("api_token.php"):
+                self._send(self._token(params))
+            elif url.path.endswith("api.php"):
+                self._send(self._questions(params))
+            else:
+                self.send_error(404)
+
+        def _token(self, params: dict) -> dict:
+            with state.lock:
+                if params.get("command") == "request":
+                    token = uuid.uuid4().hex
+                    state.tokens[token] = {}
+                    return {"response_code": 0, "token": token}
+                token = params.get("token", "")
+                if token not in state.tokens:
+                    return {"response_code": 3}
+                state.tokens[token] = {}
+                return {"response_code": 0, "token": token}
+
+        def _questions(self, params: dict) -> dict:
+            ip = self.client_address[0]
+            now = time.monotonic()
+            with state.lock:
+                last = state.last_request.get(ip)
+                if last is not None and now - last < state.interval:
+                    state.rate_limited += 1
+                    return {"response_code": 5, "results": []}
+                state.last_request[ip] = now
+
+                amount = min(50, int(params.get("amount", 10)))
+                category = int(params.get("category", 9))
+                token = params.get("token")
+                start = 0
+                if token:
+                    if token not in state.tokens:
+                        return {"response_code": 3, "results": []}
+                    start = state.tokens[token].get(category, 0)
+                    if start + amount > _POOL_SIZE:
+                        return {"response_code": 4, "results": []}
+                    state.tokens[token][category] = start + amount
+                state.served += amount
+            return {
+                "response_code": 0,
+                "results": [_question(category, start + i) for i in range(amount)],
+            }
+
+    return Handler
+
+
+def make_server(port: int = 0, interval: float = 5.0, latency: float = 0.0):
+    """Build (not start) a stand-in server; port 0 picks a free port."""
+    state = StandinState(interval, latency)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=5.0,
+                        help="minimum seconds between api.php requests per IP")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="artificial delay per request, in seconds")
+    args = parser.parse_args()
+    server = make_server(args.port, args.interval, args.latency)
+    print(f"[Standin] OTDB stand-in on http://127.0.0.1:{server.server_address[1]}/api.php")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Replay recorded chat against QuizLogic, as fast as possible, to benchmark
+and regression-test the game logic with production-shaped load.
+
+Messages are grouped into 60 FPS frames by their recorded arrival time and fed
+through process_messages + update, like MainGameController does, against a
+throwaway database. Reports per-frame cost (p50/p99/max) and the final top 5,
+which is deterministic for a given recording and seed.
+
+Usage:
+    python scripts/replay_logic.py data/chat_logs
+    python scripts/replay_logic.py chat-20250101-120000-001.jsonl.gz --seed 3
+    python scripts/replay_logic.py --synthesize data/synthetic_chat --messages 200000 --rate 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quiz.otdb  # noqa: E402
+from quiz.chat import normalize  # noqa: E402
+from quiz.chat_recorder import ChatRecorder, read_chat_log  # noqa: E402
+from quiz.config import FPS  # noqa: E402
+from quiz.db import QuizDatabase  # noqa: E402
+from quiz.logic import QuizLogic  # noqa: E402
+from quiz.models import ChatMessage, GameState  # noqa: E402
+from quiz.question_bank import QuestionBank  # noqa: E402
+
+quiz.otdb.requests = None  # keep the question fetcher offline
+
+
+def synthesize(directory: str, messages: int, rate: float, users: int, seed: int):
+    """Write a recording with bursty, heavy-tailed chat (a few loud viewers, many quiet ones)."""
+    rng = random.Random(seed)
+    recorder = ChatRecorder(directory, session=f"synthetic-{seed}")
+    recorder.start()
+    texts = ["1", "2", "3", "4"] * 10 + ["2!", "B", "!vote 3", "reset", "gg", "lol", "what"]
+    ts = 1_700_000_000.0
+    for _ in range(messages):
+        # Bursts: a tenth of the gaps are 10x shorter (everyone answering at once)
+        gap = rng.expovariate(rate) * (0.1 if rng.random() < 0.1 else 1.0)
+        ts += gap
+        user = f"viewer{int(rng.paretovariate(1.2)) % users}"
+        raw = rng.choice(texts)
+        recorder.record(user, raw, normalize(raw), ts)
+    recorder.stop()
+    print(f"[Replay] Wrote {messages} synthetic messages to {directory} ({recorder.files} file(s))")
+
+
+def replay(path: str, seed: int):
+    random.seed(seed)
+    frame = 1.0 / FPS
+    with tempfile.TemporaryDirectory() as tmp:
+        db = QuizDatabase(os.path.join(tmp, "replay.db"))
+        bank = QuestionBank(os.path.join(tmp, "bank.db"))
+        logic = QuizLogic(db, bank)
+
+        frame_ms = []
+        total = 0
+        batch: list[ChatMessage] = []
+        frame_end = None
+        prev_state = None
+
+        def run_frame():
+            nonlocal prev_state
+            start = time.perf_counter()
+            if batch:
+                logic.process_messages(batch)
+            logic.update(frame)
+            if logic.state != prev_state:
+                prev_state = logic.state
+                if prev_state in (GameState.REVEALING, GameState.LEADERBOARD):
+                    db.save_all()
+            frame_ms.append((time.perf_counter() - start) * 1000.0)
+            batch.clear()
+
+        wall = time.perf_counter()
+        for record in read_chat_log(path):
+            ts = record["ts"]
+            if frame_end is None:
+                frame_end = ts + frame
+            while ts >= frame_end:
+                run_frame()
+                frame_end += frame
+            batch.append(ChatMessage(record["user"], record.get("norm") or normalize(record["raw"]), ts))
+            total += 1
+        run_frame()
+        wall = time.perf_counter() - wall
+
+        db.save_all()
+        top = [(p.username, p.score) for p in db.get_top_players(5)]
+        db.close()
+        bank.close()
+
+    frame_ms.sort()
+    n = len(frame_ms)
+    print(f"[Replay] {total} messages over {n} frames ({n / FPS:.0f}s of game time) in {wall:.2f}s "
+          f"({total / wall:,.0f} msg/s)")
+    print(f"[Replay] frame cost p50 {frame_ms[n // 2]:.3f}ms | p99 {frame_ms[int(n * 0.99) - 1]:.3f}ms | "
+          f"max {frame_ms[-1]:.3f}ms")
+    print(f"[Replay] top 5: {top}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", help="recording file or directory")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--synthesize", metavar="DIR", help="write a synthetic recording into DIR instead")
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--rate", type=float, default=2000, help="synthetic: average messages/s")
+    parser.add_argument("--users", type=int, default=20_000, help="synthetic: distinct viewers")
+    args = parser.parse_args()
+    if args.synthesize:
+        synthesize(args.synthesize, args.messages, args.rate, args.users, args.seed)
+    elif args.path:
+        replay(args.path, args.seed)
+    else:
+        parser.error("give a recording to replay, or --synthesize DIR")
+
+
+if __name__ == "__main__":
+    main()